@@ -4,15 +4,27 @@ Provides RESTful API and MCP endpoints for external integrations.
 """
 
 import logging
-from fastapi import FastAPI, HTTPException, Header, Depends
+from fastapi import FastAPI, HTTPException, Header, Depends, Response, Request
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
 import asyncio
 
 from .council import run_full_council
-from .api_keys import validate_api_key, record_api_usage, get_api_stats
-from .deliberations import list_deliberations, get_deliberation, search_deliberations
+from .config import DIFFICULTY_TIERS, COUNCIL_MODES, COUNCIL_PROFILES
+from .profiles import resolve_profile
+from .result_cache import bypasses_cache, get_result_cache
+from .semantic_cache import get_semantic_cache
+from .search_providers import get_search_cache
+from .tts_cache import get_tts_cache
+from .shared_cache import shared_cache_stats
+from .singleflight import council_flight
+from .idempotency import council_requests, IdempotencyConflict, IdempotencyInProgress
+from .moa import run_mixture_of_agents
+from .difficulty import tier_latency_stats
+from .api_keys import validate_api_key, record_api_usage, get_api_stats, hash_api_key
+from .deliberations import list_deliberations, get_deliberation, search_deliberations, resolve_deliberation_dir
+from .http_cache import file_validators, is_not_modified, not_modified_response, json_response
 
 logger = logging.getLogger("llm_council.api")
 
@@ -37,9 +49,36 @@ api_app.add_middleware(
 class CouncilRequest(BaseModel):
     """Request to consult the council."""
     question: str
-    include_web_search: bool = True
+    include_web_search: Optional[bool] = None  # None = profile default, then the search router
     include_stage1: bool = False  # Return individual responses
     include_stage2: bool = False  # Return rankings
+    tier: Optional[str] = None  # Difficulty tier override (trivial, simple, moderate, complex)
+    debate_rounds: Optional[int] = None  # Maximum debate rounds after Stage 1 (0 disables)
+    mode: str = "council"  # "council" (3 stages) or "moa" (layered mixture-of-agents)
+    profile: Optional[str] = None  # Council profile (fast, balanced, deep)
+    # Per-request overrides of the profile (None = keep the profile's value)
+    models: Optional[List[str]] = None
+    chairman: Optional[str] = None
+    thinking_budget: Optional[int] = None
+    max_tokens: Optional[int] = None
+    stage1_deadline_s: Optional[float] = None
+    stage2_deadline_s: Optional[float] = None
+    stage3_timeout_s: Optional[float] = None
+    quorum: Optional[int] = None
+
+    def council_overrides(self) -> Dict[str, Any]:
+        """Profile overrides carried by this request."""
+        return {
+            "models": self.models,
+            "chairman": self.chairman,
+            "web_search": self.include_web_search,
+            "thinking_budget": self.thinking_budget,
+            "max_tokens": self.max_tokens,
+            "stage1_deadline_s": self.stage1_deadline_s,
+            "stage2_deadline_s": self.stage2_deadline_s,
+            "stage3_timeout_s": self.stage3_timeout_s,
+            "quorum": self.quorum,
+        }
 
 
 class CouncilResponse(BaseModel):
@@ -49,7 +88,7 @@ class CouncilResponse(BaseModel):
     models_participated: int
     web_search_used: bool
     deliberation_path: Optional[str] = None
-    stage1: Optional[List[Dict[str, str]]] = None
+    stage1: Optional[List[Dict[str, Any]]] = None
     stage2: Optional[List[Dict[str, Any]]] = None
     metadata: Optional[Dict[str, Any]] = None
 
@@ -61,11 +100,16 @@ class DeliberationSearch(BaseModel):
 
 
 # Dependency: Validate API Key
-async def validate_api_key_header(x_api_key: Optional[str] = Header(None)):
+async def validate_api_key_header(request: Request, x_api_key: Optional[str] = Header(None)):
     """
     Validate API key from header.
 
+    Conditional GETs (If-None-Match or If-Modified-Since) are recorded but do
+    not count toward the rate limit, so pollers revalidating unchanged
+    deliberations do not use it up.
+
     Args:
+        request: Incoming request (for its conditional headers)
         x_api_key: API key from X-API-Key header
 
     Raises:
@@ -79,8 +123,11 @@ async def validate_api_key_header(x_api_key: Optional[str] = Header(None)):
     if not key_data:
         raise HTTPException(status_code=401, detail="Invalid API key")
 
-    # Record usage
-    if not record_api_usage(x_api_key):
+    # Record usage (off the event loop: it writes the keys file and the shared rate counter)
+    conditional = request.method == "GET" and (
+        "if-none-match" in request.headers or "if-modified-since" in request.headers
+    )
+    if not await asyncio.to_thread(record_api_usage, x_api_key, not conditional):
         raise HTTPException(status_code=429, detail="Rate limit exceeded")
 
     return key_data
@@ -107,7 +154,11 @@ async def health():
 @api_app.post("/council/ask", response_model=CouncilResponse)
 async def ask_council(
     request: CouncilRequest,
-    api_key_data: dict = Depends(validate_api_key_header)
+    response: Response,
+    api_key_data: dict = Depends(validate_api_key_header),
+    x_api_key: Optional[str] = Header(None),
+    cache_control: Optional[str] = Header(None),
+    idempotency_key: Optional[str] = Header(None)
 ):
     """
     Consult the LLM Council with a question.
@@ -117,9 +168,20 @@ async def ask_council(
     - Stage 2: Peer rankings
     - Stage 3: Chairman synthesis
 
+    Identical questions are answered from the result cache, pointing at the
+    original deliberation; send "Cache-Control: no-cache" for a fresh run.
+
+    With an Idempotency-Key header, retries of the same request replay the
+    stored response (marked "Idempotent-Replayed: true") or wait on the
+    council already running for it instead of starting another.
+
     Args:
         request: The council request
+        response: Outgoing response (for the Idempotent-Replayed header)
         api_key_data: Validated API key data (injected)
+        x_api_key: API key header, scoping idempotency keys per client
+        cache_control: Cache-Control request header
+        idempotency_key: Idempotency-Key request header
 
     Returns:
         The council's answer and metadata
@@ -129,40 +191,108 @@ async def ask_council(
         curl -X POST https://api.llmcouncil.com/v1/council/ask \\
           -H "X-API-Key: llmc_xxxxx" \\
           -H "Content-Type: application/json" \\
+          -H "Idempotency-Key: 5f0c6e2a-article-42" \\
           -d '{
             "question": "What are the pros and cons of microservices?",
-            "include_stage1": true
+            "include_stage1": true,
+            "profile": "fast"
           }'
         ```
     """
     logger.info(f"API request from: {api_key_data.get('name')}")
     logger.info(f"Question: {request.question[:100]}...")
 
+    if request.tier and request.tier.lower() not in DIFFICULTY_TIERS:
+        raise HTTPException(status_code=400, detail=f"Unknown tier. Expected one of: {', '.join(DIFFICULTY_TIERS)}")
+    if request.mode not in COUNCIL_MODES:
+        raise HTTPException(status_code=400, detail=f"Unknown mode. Expected one of: {', '.join(COUNCIL_MODES)}")
+    if request.mode == "moa" and (request.tier or request.debate_rounds is not None):
+        raise HTTPException(status_code=400, detail="tier and debate_rounds do not apply to mode 'moa'")
+    try:
+        resolve_profile(request.profile, request.council_overrides())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    use_cache = not bypasses_cache(cache_control)
+    if not idempotency_key:
+        return await answer_council_request(request, use_cache)
+
+    try:
+        result, replayed = await council_requests.do(
+            hash_api_key(x_api_key),
+            idempotency_key,
+            request.model_dump(),
+            lambda: answer_council_request(request, use_cache)
+        )
+    except IdempotencyConflict as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except IdempotencyInProgress as e:
+        raise HTTPException(status_code=409, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+    if replayed:
+        response.headers["Idempotent-Replayed"] = "true"
+    return result
+
+
+async def answer_council_request(request: CouncilRequest, use_cache: bool) -> Dict[str, Any]:
+    """
+    Run the council for an API request and build its response body.
+
+    Args:
+        request: The validated council request
+        use_cache: Whether the result and semantic caches may answer it
+
+    Returns:
+        CouncilResponse fields as a JSON-serializable dict
+
+    Raises:
+        HTTPException: 500 when the deliberation fails
+    """
     try:
         # Run the council deliberation
-        stage1, stage2, stage3, metadata = await run_full_council(request.question)
+        if request.mode == "moa":
+            stage1, stage2, stage3, metadata = await run_mixture_of_agents(
+                request.question,
+                settings=resolve_profile(request.profile, request.council_overrides())
+            )
+        else:
+            stage1, stage2, stage3, metadata = await run_full_council(
+                request.question,
+                tier=request.tier,
+                debate_rounds=request.debate_rounds,
+                profile=request.profile,
+                overrides=request.council_overrides(),
+                use_cache=use_cache
+            )
 
         # Build response
-        response = CouncilResponse(
+        council_response = CouncilResponse(
             answer=stage3.get("response", ""),
             chairman=stage3.get("model", "unknown"),
             models_participated=len(stage1),
-            web_search_used=metadata.get("deliberation_path") is not None,
+            web_search_used=bool((metadata.get("web_search") or {}).get("used")),
             deliberation_path=metadata.get("deliberation_path"),
             metadata={
-                "aggregate_rankings": metadata.get("aggregate_rankings", [])
+                "aggregate_rankings": metadata.get("aggregate_rankings", []),
+                "difficulty": metadata.get("difficulty"),
+                "profile": metadata.get("profile"),
+                "web_search": metadata.get("web_search"),
+                "cache": metadata.get("cache"),
+                "timings": metadata.get("timings"),
+                "speculation": metadata.get("speculation"),
+                "debate": metadata.get("debate"),
+                "layers": metadata.get("layers")
             }
         )
 
         # Include optional data
         if request.include_stage1:
-            response.stage1 = stage1
+            council_response.stage1 = stage1
 
         if request.include_stage2:
-            response.stage2 = stage2
+            council_response.stage2 = stage2
 
-        logger.info(f"Council responded: {len(response.answer)} chars")
-        return response
+        logger.info(f"Council responded: {len(council_response.answer)} chars")
+        return council_response.model_dump()
 
     except Exception as e:
         logger.error(f"Error in council deliberation: {e}", exc_info=True)
@@ -197,13 +327,19 @@ async def get_deliberations(
 @api_app.get("/deliberations/{name}")
 async def get_deliberation_detail(
     name: str,
+    request: Request,
     api_key_data: dict = Depends(validate_api_key_header)
 ):
     """
     Get a specific deliberation by name.
 
+    Responses carry ETag and Last-Modified; pollers sending If-None-Match
+    get a bodyless 304 while the archive is unchanged. Large bodies are
+    gzip- or brotli-compressed when accepted.
+
     Args:
         name: Deliberation directory name
+        request: Incoming request (conditional and Accept-Encoding headers)
         api_key_data: Validated API key data
 
     Returns:
@@ -211,12 +347,17 @@ async def get_deliberation_detail(
     """
     logger.info(f"Getting deliberation {name}: {api_key_data.get('name')}")
 
+    delib_dir = resolve_deliberation_dir(name)
+    validators = file_validators([delib_dir]) if delib_dir else None
+    if validators is not None and is_not_modified(request, *validators):
+        return not_modified_response(*validators)
+
     delib = get_deliberation(name)
 
-    if not delib:
+    if not delib or validators is None:
         raise HTTPException(status_code=404, detail="Deliberation not found")
 
-    return delib
+    return json_response(request, delib, *validators)
 
 
 @api_app.post("/deliberations/search")
@@ -258,12 +399,21 @@ async def get_stats(api_key_data: dict = Depends(validate_api_key_header)):
     """
     stats = get_api_stats()
     deliberations = list_deliberations(limit=1000)
+    semantic_cache = await asyncio.to_thread(get_semantic_cache)
 
     return {
         "api": stats,
         "deliberations": {
-            "total": len(deliberations)
-        }
+            "total": len(deliberations),
+            "difficulty_tiers": tier_latency_stats(deliberations)
+        },
+        "result_cache": get_result_cache().stats(),
+        "semantic_cache": semantic_cache.stats(),
+        "coalescing": council_flight.stats(),
+        "idempotency": council_requests.stats(),
+        "search_cache": get_search_cache().stats(),
+        "tts_cache": get_tts_cache().stats(),
+        "shared_cache": shared_cache_stats()
     }
 
 
@@ -295,6 +445,16 @@ async def mcp_tools():
                             "type": "boolean",
                             "description": "Whether to include individual model responses (default: false)",
                             "default": False
+                        },
+                        "tier": {
+                            "type": "string",
+                            "enum": list(DIFFICULTY_TIERS),
+                            "description": "Override the automatic difficulty tier (council size, thinking budget, peer ranking)"
+                        },
+                        "profile": {
+                            "type": "string",
+                            "enum": list(COUNCIL_PROFILES),
+                            "description": "Council profile: fast (small council, no peer ranking), balanced (default) or deep (full council with debate)"
                         }
                     },
                     "required": ["question"]
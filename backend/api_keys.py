@@ -1,5 +1,6 @@
 """API key management for LLM Council API."""
 
+import time
 import secrets
 import hashlib
 import json
@@ -8,6 +9,9 @@ from datetime import datetime
 from pathlib import Path
 from typing import Optional, Dict, Any, List
 
+from .config import API_RATE_LIMIT
+from .shared_cache import get_shared_cache
+
 logger = logging.getLogger("llm_council.api_keys")
 
 # API keys storage
@@ -140,12 +144,17 @@ def validate_api_key(api_key: str) -> Optional[Dict[str, Any]]:
     return key_data
 
 
-def record_api_usage(api_key: str) -> bool:
+def record_api_usage(api_key: str, rate_limited: bool = True) -> bool:
     """
     Record usage of an API key and check rate limits.
 
+    With API_RATE_LIMIT on, the limit is checked first: a rejected request
+    is neither recorded nor counted against the window.
+
     Args:
         api_key: The API key
+        rate_limited: Whether the request counts toward the rate limit
+            (conditional GETs, usually answered 304, do not)
 
     Returns:
         True if within rate limit, False if limit exceeded
@@ -157,14 +166,20 @@ def record_api_usage(api_key: str) -> bool:
     if not key_data:
         return False
 
+    if API_RATE_LIMIT == "on" and rate_limited:
+        # Fixed-window rate limiting, counted in the shared cache so every worker sees the same count
+        rate_window = key_data.get("rate_window", 3600)
+        counter = f"{key_hash}:{int(time.time() // rate_window)}"
+        count = get_shared_cache().incr("rate_limit", counter, ttl_s=rate_window)
+        if count > key_data.get("rate_limit", 100):
+            get_shared_cache().incr("rate_limit", counter, amount=-1)
+            logger.warning(f"Rate limit exceeded for API key: {key_data.get('name')}")
+            return False
+
     # Update usage
     key_data["last_used"] = datetime.now().isoformat()
     key_data["request_count"] = key_data.get("request_count", 0) + 1
 
-    # Simple rate limiting (would use Redis in production)
-    # For now, just track total count
-    # TODO: Implement proper time-window based rate limiting
-
     keys[key_hash] = key_data
     save_api_keys(keys)
 
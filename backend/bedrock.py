@@ -1,6 +1,8 @@
 """Amazon Bedrock API client for making LLM requests."""
 
 import asyncio
+import json
+import time
 import logging
 import boto3
 from typing import List, Dict, Any, Optional
@@ -23,6 +25,7 @@ THINKING_MODELS = [
 
 # Default thinking budget (tokens)
 THINKING_BUDGET_TOKENS = 4000
+MIN_THINKING_BUDGET_TOKENS = 1024
 
 
 def _get_bedrock_client():
@@ -58,16 +61,49 @@ def _supports_thinking(model: str) -> bool:
     return False
 
 
+def _build_tool_config(json_schema: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build a Converse tool config that forces the model to answer through a single tool.
+
+    The tool's input schema is the requested JSON schema, so the tool call
+    arguments are the structured output.
+    """
+    return {
+        "tools": [{
+            "toolSpec": {
+                "name": json_schema.get("title", "structured_output"),
+                "description": json_schema.get("description", "Return the structured result."),
+                "inputSchema": {"json": json_schema}
+            }
+        }],
+        "toolChoice": {"tool": {"name": json_schema.get("title", "structured_output")}}
+    }
+
+
 def _sync_query_model(
     client,
     model: str,
     messages: List[Dict[str, str]],
-    enable_thinking: bool = True
+    enable_thinking: bool = True,
+    max_tokens: Optional[int] = None,
+    json_schema: Optional[Dict[str, Any]] = None,
+    thinking_budget: Optional[int] = None
 ) -> Optional[Dict[str, Any]]:
     """
     Synchronous model query (runs in thread pool).
-    Enables extended thinking for supported Claude models.
+    Enables extended thinking for supported Claude models, with thinking_budget
+    tokens (THINKING_BUDGET_TOKENS when None, disabled when 0).
+    When json_schema is given, structured output is requested via forced tool use
+    and the tool input is returned as JSON text in 'content'.
     """
+    if thinking_budget is None:
+        thinking_budget = THINKING_BUDGET_TOKENS
+    elif thinking_budget <= 0:
+        enable_thinking = False
+    else:
+        # Bedrock rejects thinking budgets below 1024 tokens
+        thinking_budget = max(MIN_THINKING_BUDGET_TOKENS, thinking_budget)
+
     try:
         # Log prompt size for debugging
         total_chars = sum(len(msg.get('content', '')) for msg in messages)
@@ -82,23 +118,29 @@ def _sync_query_model(
             "messages": bedrock_messages,
         }
 
+        if json_schema is not None:
+            # Forced tool use cannot be combined with extended thinking
+            request_params["toolConfig"] = _build_tool_config(json_schema)
+            request_params["inferenceConfig"] = {
+                "maxTokens": max_tokens or 8000
+            }
         # Enable thinking for supported models
-        if enable_thinking and _supports_thinking(model):
-            logger.info(f"Enabling extended thinking for {model} (budget: {THINKING_BUDGET_TOKENS} tokens)")
+        elif enable_thinking and _supports_thinking(model):
+            logger.info(f"Enabling extended thinking for {model} (budget: {thinking_budget} tokens)")
             request_params["additionalModelRequestFields"] = {
                 "thinking": {
                     "type": "enabled",
-                    "budget_tokens": THINKING_BUDGET_TOKENS
+                    "budget_tokens": thinking_budget
                 }
             }
             # Extended thinking requires higher max_tokens
             request_params["inferenceConfig"] = {
-                "maxTokens": 16000
+                "maxTokens": max(max_tokens or 16000, thinking_budget + 1)
             }
         else:
             # For non-thinking models (like Nova), ensure adequate max tokens
             request_params["inferenceConfig"] = {
-                "maxTokens": 8000
+                "maxTokens": max_tokens or 8000
             }
 
         response = client.converse(**request_params)
@@ -113,6 +155,9 @@ def _sync_query_model(
         for block in content_list:
             if 'text' in block:
                 content_text += block['text']
+            # Structured output arrives as the forced tool call's input
+            if 'toolUse' in block:
+                content_text = json.dumps(block['toolUse'].get('input', {}))
             # Capture thinking blocks if present
             if 'thinking' in block:
                 thinking_text += block.get('thinking', '')
@@ -120,17 +165,27 @@ def _sync_query_model(
         if thinking_text:
             logger.debug(f"Model {model} used extended thinking ({len(thinking_text)} chars)")
 
+        usage = response.get('usage', {})
         return {
             'content': content_text,
-            'reasoning_details': thinking_text if thinking_text else None
+            'reasoning_details': thinking_text if thinking_text else None,
+            'usage': {
+                'input_tokens': usage.get('inputTokens', 0),
+                'output_tokens': usage.get('outputTokens', 0)
+            }
         }
 
     except Exception as e:
         error_str = str(e)
+        # If the model does not support tool use, fall back to plain text output
+        if json_schema is not None:
+            logger.warning(f"Structured output not supported for {model}, retrying as plain text: {e}")
+            return _sync_query_model(client, model, messages, enable_thinking=False, max_tokens=max_tokens)
+
         # If thinking fails, retry without it
         if enable_thinking and ('thinking' in error_str.lower() or 'validation' in error_str.lower()):
             logger.warning(f"Extended thinking not supported for {model}, retrying without it")
-            return _sync_query_model(client, model, messages, enable_thinking=False)
+            return _sync_query_model(client, model, messages, enable_thinking=False, max_tokens=max_tokens)
 
         # Log detailed error information
         logger.error(f"Error querying Bedrock model {model}: {e}", exc_info=True)
@@ -145,7 +200,10 @@ def _sync_query_model(
 async def query_model(
     model: str,
     messages: List[Dict[str, str]],
-    timeout: float = 120.0
+    timeout: float = 120.0,
+    max_tokens: Optional[int] = None,
+    json_schema: Optional[Dict[str, Any]] = None,
+    thinking_budget: Optional[int] = None
 ) -> Optional[Dict[str, Any]]:
     """
     Query a single model via Amazon Bedrock Converse API.
@@ -154,20 +212,29 @@ async def query_model(
         model: Bedrock model identifier (e.g., "us.amazon.nova-pro-v1:0")
         messages: List of message dicts with 'role' and 'content'
         timeout: Request timeout in seconds (not used directly, Bedrock has its own)
+        max_tokens: Optional cap on output tokens
+        json_schema: Optional JSON schema to request structured output via tool use
+        thinking_budget: Optional extended thinking budget (0 disables thinking)
 
     Returns:
-        Response dict with 'content' and optional 'reasoning_details', or None if failed
+        Response dict with 'content', optional 'reasoning_details', 'usage' and 'latency_s', or None if failed
     """
     client = _get_bedrock_client()
     logger.debug(f"Querying Bedrock model: {model} with {len(messages)} messages")
 
     # Run synchronous boto3 call in thread pool
+    start = time.perf_counter()
     try:
         result = await asyncio.wait_for(
-            asyncio.to_thread(_sync_query_model, client, model, messages),
+            asyncio.to_thread(
+                _sync_query_model, client, model, messages,
+                max_tokens=max_tokens, json_schema=json_schema,
+                thinking_budget=thinking_budget
+            ),
             timeout=timeout
         )
         if result:
+            result['latency_s'] = round(time.perf_counter() - start, 3)
             logger.debug(f"Bedrock model {model} responded ({len(result.get('content', ''))} chars)")
         else:
             logger.warning(f"Bedrock model {model} returned None")
@@ -179,7 +246,10 @@ async def query_model(
 
 async def query_models_parallel(
     models: List[str],
-    messages: List[Dict[str, str]]
+    messages: List[Dict[str, str]],
+    max_tokens: Optional[int] = None,
+    json_schema: Optional[Dict[str, Any]] = None,
+    thinking_budget: Optional[int] = None
 ) -> Dict[str, Optional[Dict[str, Any]]]:
     """
     Query multiple models in parallel.
@@ -187,12 +257,21 @@ async def query_models_parallel(
     Args:
         models: List of Bedrock model identifiers
         messages: List of message dicts to send to each model
+        max_tokens: Optional cap on output tokens
+        json_schema: Optional JSON schema to request structured output
+        thinking_budget: Optional extended thinking budget (0 disables thinking)
 
     Returns:
         Dict mapping model identifier to response dict (or None if failed)
     """
     # Create tasks for all models
-    tasks = [query_model(model, messages) for model in models]
+    tasks = [
+        query_model(
+            model, messages, max_tokens=max_tokens, json_schema=json_schema,
+            thinking_budget=thinking_budget
+        )
+        for model in models
+    ]
 
     # Wait for all to complete
     responses = await asyncio.gather(*tasks)
@@ -0,0 +1,272 @@
+"""Chairman prompt compaction for LLM Council.
+
+Shrinks the Stage 3 input before it reaches the chairman:
+- "dedupe": drops near-duplicate sentences repeated across Stage 1 responses
+- "extractive": keeps the most representative Stage 1 sentences (local TF-IDF scoring)
+- "rankings": reduces Stage 2 critiques to parsed rankings plus short rationales
+
+Each mode works toward its own target token budget.
+"""
+
+import re
+import time
+import logging
+from typing import List, Dict, Any, Tuple
+
+import numpy as np
+
+from .similarity import tfidf_vectors, cosine_similarity_matrix
+
+logger = logging.getLogger("llm_council.compaction")
+
+# Sentence vectors are short, so a smaller hash space keeps the matrices light
+SENTENCE_FEATURES = 2 ** 13
+
+# Dedupe starts strict and relaxes until the Stage 1 text fits its budget
+DEDUPE_THRESHOLDS = (0.9, 0.8, 0.7, 0.6)
+
+# Longest rationale kept per response when reducing Stage 2 critiques
+RATIONALE_MAX_CHARS = 160
+
+SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+|\n+')
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (1 token ≈ 4 chars), matching the provider logs."""
+    return len(text) // 4
+
+
+def split_sentences(text: str) -> List[str]:
+    """
+    Split text into sentences and standalone lines (headings, bullets).
+
+    Args:
+        text: Text to split
+
+    Returns:
+        List of non-empty sentences
+    """
+    return [s.strip() for s in SENTENCE_SPLIT.split(text) if s and s.strip()]
+
+
+def _sentence_tokens(sentences_per_response: List[List[str]]) -> int:
+    """Estimated tokens of all sentences across responses."""
+    return sum(estimate_tokens(" ".join(sentences)) for sentences in sentences_per_response)
+
+
+def dedupe_sentences(
+    sentences_per_response: List[List[str]],
+    token_budget: int
+) -> List[List[str]]:
+    """
+    Remove near-duplicate sentences across responses.
+
+    The first occurrence of a sentence is kept and later ones whose cosine
+    similarity reaches the threshold are dropped. The threshold starts at 0.9
+    and is relaxed step by step until the text fits token_budget.
+
+    Args:
+        sentences_per_response: Sentences of each Stage 1 response
+        token_budget: Target token budget for all Stage 1 text
+
+    Returns:
+        Sentences of each response with duplicates removed
+    """
+    flat = [(i, s) for i, sentences in enumerate(sentences_per_response) for s in sentences]
+    if len(flat) < 2:
+        return sentences_per_response
+
+    similarity = cosine_similarity_matrix(
+        tfidf_vectors([s for _, s in flat], n_features=SENTENCE_FEATURES)
+    )
+    # Only compare against earlier sentences
+    earlier = np.tril(similarity, k=-1)
+
+    result = sentences_per_response
+    for threshold in DEDUPE_THRESHOLDS:
+        kept = np.ones(len(flat), dtype=bool)
+        for k in range(1, len(flat)):
+            if (earlier[k, :k][kept[:k]] >= threshold).any():
+                kept[k] = False
+
+        result = [[] for _ in sentences_per_response]
+        for (i, sentence), keep in zip(flat, kept):
+            if keep:
+                result[i].append(sentence)
+
+        if _sentence_tokens(result) <= token_budget:
+            break
+
+    return result
+
+
+def extract_key_sentences(
+    sentences_per_response: List[List[str]],
+    token_budget: int
+) -> List[List[str]]:
+    """
+    Keep the most representative sentences of each response within a token budget.
+
+    Sentences are scored by TF-IDF cosine similarity to the centroid of all
+    responses, so points the council converged on rank highest. Each response
+    gets an equal share of the budget and keeps its sentences in original order.
+
+    Args:
+        sentences_per_response: Sentences of each Stage 1 response
+        token_budget: Target token budget for all Stage 1 text
+
+    Returns:
+        Selected sentences of each response
+    """
+    flat = [s for sentences in sentences_per_response for s in sentences]
+    if not flat or _sentence_tokens(sentences_per_response) <= token_budget:
+        return sentences_per_response
+
+    vectors = tfidf_vectors(flat, n_features=SENTENCE_FEATURES)
+    centroid = vectors.mean(axis=0)
+    norm = np.linalg.norm(centroid)
+    scores = vectors @ (centroid / norm) if norm else np.zeros(len(flat))
+
+    share = token_budget // max(1, len(sentences_per_response))
+    result = []
+    offset = 0
+    for sentences in sentences_per_response:
+        own_scores = scores[offset:offset + len(sentences)]
+        offset += len(sentences)
+
+        chosen = set()
+        used = 0
+        for idx in np.argsort(-own_scores, kind="stable"):
+            cost = estimate_tokens(sentences[idx]) + 1
+            if used + cost > share and chosen:
+                continue
+            chosen.add(int(idx))
+            used += cost
+        result.append([s for k, s in enumerate(sentences) if k in chosen])
+
+    return result
+
+
+def _short_rationale(critique: str, label: str) -> str:
+    """First sentence of a critique that mentions the label, truncated."""
+    body = critique.split("FINAL RANKING:")[0]
+    pattern = re.compile(rf'{re.escape(label)}\b')
+    for sentence in split_sentences(body):
+        # Skip headings like "### Response A" that carry no judgement
+        if pattern.search(sentence) and len(pattern.sub("", sentence).strip(" #*:-")) >= 15:
+            if len(sentence) > RATIONALE_MAX_CHARS:
+                return sentence[:RATIONALE_MAX_CHARS - 3] + "..."
+            return sentence
+    return ""
+
+
+def compact_rankings(
+    stage2_results: List[Dict[str, Any]],
+    token_budget: int
+) -> str:
+    """
+    Reduce Stage 2 critiques to parsed rankings plus short rationales.
+
+    Uses the structured rationales from the fast ranking mode when present and
+    otherwise the first sentence of the critique that mentions each response.
+    If the budget is exceeded, rationales are dropped starting from the last judge.
+
+    Args:
+        stage2_results: Rankings from Stage 2
+        token_budget: Target token budget for the Stage 2 text
+
+    Returns:
+        Compact Stage 2 text for the chairman prompt
+    """
+    blocks = []
+    for result in stage2_results:
+        ranked = result.get('parsed_ranking', [])
+        rationales = result.get('rationales') or {
+            label: _short_rationale(result['ranking'], label) for label in ranked
+        }
+        header = f"Model: {result['model']}\nRanking: {' > '.join(ranked) or '(unparsed)'}"
+        lines = [f"- {label}: {rationales[label]}" for label in ranked if rationales.get(label)]
+        blocks.append((header, lines))
+
+    def render(with_rationales: int) -> str:
+        return "\n\n".join(
+            "\n".join([header] + (lines if k < with_rationales else []))
+            for k, (header, lines) in enumerate(blocks)
+        )
+
+    # Keep rationales for as many judges as the budget allows
+    for with_rationales in range(len(blocks), -1, -1):
+        text = render(with_rationales)
+        if estimate_tokens(text) <= token_budget:
+            return text
+    return text
+
+
+def compact_chairman_context(
+    stage1_results: List[Dict[str, Any]],
+    stage2_results: List[Dict[str, Any]],
+    modes: List[str],
+    budgets: Dict[str, int],
+    prefill_tokens_per_sec: float
+) -> Tuple[str, str, Dict[str, Any]]:
+    """
+    Build compacted Stage 1 and Stage 2 text for the chairman prompt.
+
+    Args:
+        stage1_results: Individual model responses from Stage 1
+        stage2_results: Rankings from Stage 2
+        modes: Enabled modes ("dedupe", "extractive", "rankings")
+        budgets: Target token budget per mode
+        prefill_tokens_per_sec: Chairman input throughput used to estimate time saved
+
+    Returns:
+        Tuple of (stage1 text, stage2 text, compaction stats)
+    """
+    start = time.perf_counter()
+
+    original_stage1 = "\n\n".join(
+        f"Model: {result['model']}\nResponse: {result['response']}" for result in stage1_results
+    )
+    original_stage2 = "\n\n".join(
+        f"Model: {result['model']}\nRanking: {result['ranking']}" for result in stage2_results
+    )
+
+    sentences = [split_sentences(result['response']) for result in stage1_results]
+    if "dedupe" in modes:
+        sentences = dedupe_sentences(sentences, budgets["dedupe"])
+    if "extractive" in modes:
+        sentences = extract_key_sentences(sentences, budgets["extractive"])
+
+    if "dedupe" in modes or "extractive" in modes:
+        stage1_text = "\n\n".join(
+            f"Model: {result['model']}\nResponse: {' '.join(kept)}"
+            for result, kept in zip(stage1_results, sentences)
+        )
+    else:
+        stage1_text = original_stage1
+
+    if "rankings" in modes and stage2_results:
+        stage2_text = compact_rankings(stage2_results, budgets["rankings"])
+    else:
+        stage2_text = original_stage2
+
+    elapsed = time.perf_counter() - start
+    original_tokens = estimate_tokens(original_stage1) + estimate_tokens(original_stage2)
+    compacted_tokens = estimate_tokens(stage1_text) + estimate_tokens(stage2_text)
+    tokens_saved = original_tokens - compacted_tokens
+
+    stats = {
+        "modes": modes,
+        "budgets": {mode: budgets[mode] for mode in modes if mode in budgets},
+        "original_tokens": original_tokens,
+        "compacted_tokens": compacted_tokens,
+        "compaction_ratio": round(compacted_tokens / original_tokens, 3) if original_tokens else 1.0,
+        "compaction_ms": round(elapsed * 1000, 2),
+        "estimated_time_saved_s": round(tokens_saved / prefill_tokens_per_sec - elapsed, 2)
+    }
+    logger.info(
+        f"Compaction: {original_tokens} -> {compacted_tokens} tokens "
+        f"({stats['compaction_ratio']:.0%}) in {stats['compaction_ms']} ms"
+    )
+
+    return stage1_text, stage2_text, stats
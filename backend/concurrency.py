@@ -0,0 +1,111 @@
+"""Bounded-concurrency model queries for LLM Council.
+
+query_models_parallel sends the same messages to every model at once and
+waits for all of them. The helpers here send per-model messages while capping
+how many requests are in flight, so iterative modes (debate rounds) do not
+burst past provider rate limits, and stop waiting at a deadline once a quorum
+has answered, so one slow model cannot stall a layered run.
+"""
+
+import asyncio
+import logging
+from typing import List, Dict, Any, Optional, Tuple
+
+from .config import API_PROVIDER
+
+logger = logging.getLogger("llm_council.concurrency")
+
+# Dynamic import based on provider
+if API_PROVIDER == "bedrock":
+    from .bedrock import query_model
+else:
+    from .openrouter import query_model
+
+
+async def query_models_bounded(
+    requests: List[Tuple[str, List[Dict[str, str]]]],
+    limit: int,
+    **query_kwargs
+) -> List[Optional[Dict[str, Any]]]:
+    """
+    Query models with per-model messages, at most `limit` at a time.
+
+    Args:
+        requests: (model, messages) pairs
+        limit: Maximum concurrent requests
+        **query_kwargs: Extra arguments for query_model (timeout, max_tokens, ...)
+
+    Returns:
+        Response dicts (or None if failed), in request order
+    """
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def bounded(model: str, messages: List[Dict[str, str]]) -> Optional[Dict[str, Any]]:
+        async with semaphore:
+            try:
+                return await query_model(model, messages, **query_kwargs)
+            except Exception as e:
+                logger.error(f"Bounded query to {model} failed: {e}", exc_info=True)
+                return None
+
+    logger.debug(f"Querying {len(requests)} models with concurrency limit {limit}")
+    return await asyncio.gather(*(bounded(model, messages) for model, messages in requests))
+
+
+async def query_models_with_quorum(
+    models: List[str],
+    messages: List[Dict[str, str]],
+    deadline_s: float,
+    quorum: int,
+    **query_kwargs
+) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+    """
+    Query models in parallel, returning at the deadline once a quorum has answered.
+
+    Every model is queried at once. The call returns when all models have
+    answered, or when deadline_s has passed and at least `quorum` have
+    answered; stragglers are then cancelled. If the quorum is not met by the
+    deadline it keeps waiting until it is (or every model has finished).
+
+    Args:
+        models: Model identifiers
+        messages: Messages sent to every model
+        deadline_s: Seconds after which a met quorum ends the wait
+        quorum: Minimum successful responses before the deadline can end the wait
+        **query_kwargs: Extra arguments for query_model
+
+    Returns:
+        Tuple of (successful responses by model, models cancelled at the deadline)
+    """
+    quorum = max(1, min(quorum, len(models)))
+    tasks = {asyncio.create_task(query_model(model, messages, **query_kwargs)): model for model in models}
+    responses: Dict[str, Dict[str, Any]] = {}
+    pending = set(tasks)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + deadline_s
+
+    while pending:
+        remaining = deadline - loop.time()
+        if remaining <= 0 and len(responses) >= quorum:
+            break
+        done, pending = await asyncio.wait(
+            pending,
+            timeout=remaining if remaining > 0 else None,
+            return_when=asyncio.FIRST_COMPLETED
+        )
+        for task in done:
+            try:
+                result = task.result()
+            except Exception as e:
+                logger.error(f"Query to {tasks[task]} failed: {e}", exc_info=True)
+                continue
+            if result is not None:
+                responses[tasks[task]] = result
+
+    for task in pending:
+        task.cancel()
+    cancelled = [tasks[task] for task in pending]
+    if cancelled:
+        logger.info(f"Deadline of {deadline_s}s reached with {len(responses)}/{len(models)} responses, cancelled {cancelled}")
+
+    return responses, cancelled
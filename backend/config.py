@@ -45,6 +45,11 @@ SERPAPI_API_KEY = os.getenv("SERPAPI_API_KEY")
 # Enable web search if ANY provider has a key
 ENABLE_WEB_SEARCH = any([TAVILY_API_KEY, SERPER_API_KEY, BRAVE_API_KEY, SERPAPI_API_KEY])
 
+# Web search routing: "auto" asks a local classifier whether the question needs fresh
+# information and skips the search when it does not; "always" searches every question
+WEB_SEARCH_ROUTING = os.getenv("WEB_SEARCH_ROUTING", "auto").lower()
+WEB_SEARCH_THRESHOLD = float(os.getenv("WEB_SEARCH_THRESHOLD", "0.5"))  # Search probability needed to search
+
 # OpenRouter configuration
 OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
 OPENROUTER_API_URL = "https://openrouter.ai/api/v1/chat/completions"
@@ -84,5 +89,260 @@ else:
     CHAIRMAN_MODEL = OPENROUTER_CHAIRMAN_MODEL
     TITLE_MODEL = OPENROUTER_TITLE_MODEL
 
+# Dedicated ranking panels: cheaper models that judge Stage 1 answers instead of
+# the answering models themselves (used by STAGE2_JUDGE_STRATEGY=panel)
+OPENROUTER_RANKING_PANEL = [
+    "google/gemini-2.5-flash",
+    "openai/gpt-5-mini",
+    "anthropic/claude-haiku-4.5",
+]
+BEDROCK_RANKING_PANEL = [
+    "us.amazon.nova-lite-v1:0",
+    "us.anthropic.claude-haiku-4-5-20251001-v1:0",
+    "mistral.mistral-small-2402-v1:0",
+]
+RANKING_PANEL_MODELS = BEDROCK_RANKING_PANEL if API_PROVIDER == "bedrock" else OPENROUTER_RANKING_PANEL
+
+# Candidate pool for bandit council selection (COUNCIL_SELECTION): the council
+# members plus alternatives that can take their seat
+OPENROUTER_CANDIDATE_MODELS = OPENROUTER_COUNCIL_MODELS + [
+    "deepseek/deepseek-r1",
+    "mistralai/mistral-large",
+    "openai/gpt-5-mini",
+]
+BEDROCK_CANDIDATE_MODELS = BEDROCK_COUNCIL_MODELS + [
+    "us.anthropic.claude-sonnet-4-5-20250929-v1:0",
+    "us.meta.llama4-maverick-17b-instruct-v1:0",
+    "us.amazon.nova-pro-v1:0",
+]
+CANDIDATE_MODELS = BEDROCK_CANDIDATE_MODELS if API_PROVIDER == "bedrock" else OPENROUTER_CANDIDATE_MODELS
+
 # Data directory for conversation storage
 DATA_DIR = "data/conversations"
+
+# Stage 1 consensus early exit
+# When every pair of Stage 1 answers is at least this similar (hashed TF-IDF cosine),
+# Stage 2 is skipped. "chairman" still runs the synthesis, "answer" returns the most
+# representative Stage 1 response directly, "off" disables the check.
+CONSENSUS_EARLY_EXIT = os.getenv("CONSENSUS_EARLY_EXIT", "chairman").lower()
+CONSENSUS_THRESHOLD = float(os.getenv("CONSENSUS_THRESHOLD", "0.85"))
+
+# Stage 2 ranking mode
+# "full": each model writes a critique of every response followed by a FINAL RANKING block.
+# "fast": each model returns a compact JSON ranking with one-line rationales through the
+# provider's structured output / tool use, capped at STAGE2_FAST_MAX_TOKENS.
+STAGE2_RANKING_MODE = os.getenv("STAGE2_RANKING_MODE", "full").lower()
+STAGE2_FAST_MAX_TOKENS = int(os.getenv("STAGE2_FAST_MAX_TOKENS", "600"))
+
+# Stage 2 judge sampling
+# "all": every council member ranks every response (N x N)
+# "single": only STAGE2_JUDGE_MODEL ranks
+# "random_k": STAGE2_JUDGE_K council members are sampled per deliberation
+# "panel": RANKING_PANEL_MODELS rank instead of the answering models
+STAGE2_JUDGE_STRATEGY = os.getenv("STAGE2_JUDGE_STRATEGY", "all").lower()
+STAGE2_JUDGE_MODEL = os.getenv("STAGE2_JUDGE_MODEL", CHAIRMAN_MODEL)
+STAGE2_JUDGE_K = int(os.getenv("STAGE2_JUDGE_K", "2"))
+
+# Prior reliability weight per judge model (default 1.0). The aggregate ranking
+# multiplies this by each judge's agreement with the other judges.
+JUDGE_RELIABILITY = {}
+
+# Sharded Stage 2 for large councils
+# Responses are split into groups of STAGE2_SHARD_SIZE (2 = pairwise matches), each
+# response lands in STAGE2_SHARD_ROUNDS groups, and the groups are ranked in parallel.
+# "auto" shards once the council has STAGE2_SHARD_MIN_RESPONSES responses; "on"/"off" force it.
+STAGE2_SHARDING = os.getenv("STAGE2_SHARDING", "auto").lower()
+STAGE2_SHARD_MIN_RESPONSES = int(os.getenv("STAGE2_SHARD_MIN_RESPONSES", "8"))
+STAGE2_SHARD_SIZE = int(os.getenv("STAGE2_SHARD_SIZE", "4"))
+STAGE2_SHARD_ROUNDS = int(os.getenv("STAGE2_SHARD_ROUNDS", "3"))
+
+# Stage 2 aggregation method: "average" (mean rank), "borda", "kemeny" (local-search
+# approximation) or "bradley_terry". Sharded rankings always use Bradley-Terry.
+AGGREGATION_METHOD = os.getenv("AGGREGATION_METHOD", "average").lower()
+
+# Chairman prompt compaction (comma-separated, empty disables)
+# "dedupe": drop near-duplicate sentences across Stage 1 responses
+# "extractive": keep the most representative Stage 1 sentences
+# "rankings": reduce Stage 2 critiques to parsed rankings plus short rationales
+CHAIRMAN_COMPACTION = [
+    mode.strip() for mode in os.getenv("CHAIRMAN_COMPACTION", "").lower().split(",") if mode.strip()
+]
+# Target token budget per compaction mode
+CHAIRMAN_COMPACTION_BUDGETS = {
+    "dedupe": int(os.getenv("COMPACTION_DEDUPE_TOKENS", "8000")),
+    "extractive": int(os.getenv("COMPACTION_EXTRACTIVE_TOKENS", "4000")),
+    "rankings": int(os.getenv("COMPACTION_RANKINGS_TOKENS", "1000")),
+}
+# Approximate chairman input throughput, used to report the time saved by compaction
+CHAIRMAN_PREFILL_TOKENS_PER_SEC = float(os.getenv("CHAIRMAN_PREFILL_TOKENS_PER_SEC", "2000"))
+
+# Conversation memory: a rolling summary of older turns plus the most recent turns
+# verbatim, bounded by MEMORY_TOKEN_BUDGET (estimated tokens) for Stage 1 history
+MEMORY_RECENT_TURNS = int(os.getenv("MEMORY_RECENT_TURNS", "2"))
+MEMORY_TOKEN_BUDGET = int(os.getenv("MEMORY_TOKEN_BUDGET", "4000"))
+MEMORY_SUMMARY_WORDS = int(os.getenv("MEMORY_SUMMARY_WORDS", "250"))
+
+# Bandit council selection
+# "off": always use COUNCIL_MODELS. "thompson" / "ucb": pick COUNCIL_SELECTION_SIZE members
+# from CANDIDATE_MODELS per deliberation, learning from archived aggregate rankings and
+# latencies. The reward is ranking quality / latency ** SELECTION_LATENCY_WEIGHT.
+COUNCIL_SELECTION = os.getenv("COUNCIL_SELECTION", "off").lower()
+COUNCIL_SELECTION_SIZE = int(os.getenv("COUNCIL_SELECTION_SIZE", str(len(COUNCIL_MODELS))))
+SELECTION_LATENCY_WEIGHT = float(os.getenv("SELECTION_LATENCY_WEIGHT", "0.5"))
+SELECTION_UCB_C = float(os.getenv("SELECTION_UCB_C", "1.0"))
+
+# Difficulty-aware council sizing (opt-in)
+# "on": a local classifier maps each question to a tier that sets how many council
+# members answer (None = all), their thinking budget (None = provider default, 0 = off)
+# and whether Stage 2 runs. "off": every question uses the "complex" tier.
+# Requests can override the tier either way.
+DIFFICULTY_ROUTING = os.getenv("DIFFICULTY_ROUTING", "off").lower()
+
+# Multi-round debate: after Stage 1 members read each other's answers and revise, for up
+# to DEBATE_MAX_ROUNDS rounds on "complex" questions (0 disables; requests can override).
+# Rounds stop once the mean pairwise similarity reaches DEBATE_CONVERGENCE_THRESHOLD or
+# improves by less than DEBATE_MIN_GAIN. At most DEBATE_CONCURRENCY requests run at once.
+DEBATE_MAX_ROUNDS = int(os.getenv("DEBATE_MAX_ROUNDS", "0"))
+DEBATE_CONVERGENCE_THRESHOLD = float(os.getenv("DEBATE_CONVERGENCE_THRESHOLD", "0.8"))
+DEBATE_MIN_GAIN = float(os.getenv("DEBATE_MIN_GAIN", "0.02"))
+DEBATE_CONCURRENCY = int(os.getenv("DEBATE_CONCURRENCY", "4"))
+
+DIFFICULTY_TIERS = {
+    "trivial": {"council_size": 1, "thinking_budget": 0, "stage2": False, "debate_rounds": 0},
+    "simple": {"council_size": 2, "thinking_budget": 0, "stage2": False, "debate_rounds": 0},
+    "moderate": {"council_size": 3, "thinking_budget": 2000, "stage2": True, "debate_rounds": 0},
+    "complex": {"council_size": None, "thinking_budget": None, "stage2": True, "debate_rounds": DEBATE_MAX_ROUNDS},
+}
+
+# Speculative chairman synthesis
+# "on": the chairman drafts from the Stage 1 answers while Stage 2 rankings are collected.
+# The draft is kept unchanged when it agrees with the aggregate ranking (Kendall tau between
+# the draft's reliance on each response and the ranking >= SPECULATIVE_MIN_AGREEMENT);
+# otherwise a short reconciliation call revises it.
+SPECULATIVE_CHAIRMAN = os.getenv("SPECULATIVE_CHAIRMAN", "off").lower()
+SPECULATIVE_MIN_AGREEMENT = float(os.getenv("SPECULATIVE_MIN_AGREEMENT", "0.0"))
+
+# Execution modes: the 3-stage council or layered mixture-of-agents
+COUNCIL_MODES = ("council", "moa")
+
+# Mixture-of-agents mode
+# MOA_LAYERS lists models per layer: layers separated by ";" and models by ",". Each
+# layer receives the previous layer's outputs as references and the chairman aggregates
+# the last layer. Empty uses MOA_NUM_LAYERS layers of the council models. A layer stops
+# waiting after MOA_LAYER_DEADLINE_S once MOA_LAYER_QUORUM models have answered.
+MOA_LAYERS = [
+    [model.strip() for model in layer.split(",") if model.strip()]
+    for layer in os.getenv("MOA_LAYERS", "").split(";") if layer.strip()
+] or [list(COUNCIL_MODELS) for _ in range(int(os.getenv("MOA_NUM_LAYERS", "2")))]
+MOA_LAYER_DEADLINE_S = float(os.getenv("MOA_LAYER_DEADLINE_S", "90"))
+MOA_LAYER_QUORUM = int(os.getenv("MOA_LAYER_QUORUM", "2"))
+
+# Exact-match result cache: identical questions (same models, chairman, history and
+# search context) reuse the archived deliberation instead of re-running the council.
+# Entries live in an in-memory LRU and on disk; RESULT_CACHE_TTL_S applies to profiles
+# without their own cache_ttl_s. Send "Cache-Control: no-cache" to bypass a lookup.
+RESULT_CACHE = os.getenv("RESULT_CACHE", "on").lower()
+RESULT_CACHE_DIR = os.getenv("RESULT_CACHE_DIR", "data/result_cache")
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "256"))
+RESULT_CACHE_TTL_S = float(os.getenv("RESULT_CACHE_TTL_S", "21600"))
+
+# Semantic answer cache: a paraphrase of a recent standalone question (cosine similarity
+# of local hashed question embeddings >= SEMANTIC_CACHE_THRESHOLD, and no conflicting
+# names or numbers) is answered from the archived deliberation. Freshness follows the
+# profile's cache_ttl_s (RESULT_CACHE_TTL_S by default)
+SEMANTIC_CACHE = os.getenv("SEMANTIC_CACHE", "off").lower()
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.75"))
+SEMANTIC_CACHE_MAX_ENTRIES = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "5000"))
+
+# Named council profiles, selectable per request (COUNCIL_PROFILE sets the default)
+# Unset fields fall back to the global settings above and the difficulty tier:
+#   models / council_size, chairman, web_search, thinking_budget (0 = off), max_tokens
+#   (Stage 1 answer cap), ranking_mode, stage2, tier, debate_rounds, stage1_deadline_s /
+#   stage2_deadline_s (stop waiting once `quorum` models answered), stage3_timeout_s,
+#   cache_ttl_s (result cache lifetime, 0 = do not cache), semantic_threshold
+DEFAULT_COUNCIL_PROFILE = os.getenv("COUNCIL_PROFILE", "balanced").lower()
+COUNCIL_PROFILES = {
+    "fast": {
+        "council_size": 2,
+        "chairman": TITLE_MODEL,
+        "thinking_budget": 0,
+        "max_tokens": 2000,
+        "ranking_mode": "fast",
+        "stage2": False,
+        "stage1_deadline_s": 45.0,
+        "stage3_timeout_s": 60.0,
+        "quorum": 1,
+        "cache_ttl_s": 3600,
+    },
+    "balanced": {},
+    "deep": {
+        "tier": "complex",
+        "thinking_budget": 8000,
+        "debate_rounds": 2,
+        "stage3_timeout_s": 300.0,
+        "cache_ttl_s": 86400,
+        "semantic_threshold": 0.85,
+    },
+}
+
+# Conversation titles: local (keyphrase extraction only), llm (TITLE_MODEL call, the
+# previous behaviour) or hybrid (local title at once, upgraded by TITLE_MODEL in the background)
+TITLE_GENERATION = os.getenv("TITLE_GENERATION", "hybrid").lower()
+TITLE_MAX_WORDS = int(os.getenv("TITLE_MAX_WORDS", "5"))
+TITLE_CACHE_SIZE = int(os.getenv("TITLE_CACHE_SIZE", "1024"))  # 0 disables the cache
+
+# Idempotency-Key support on /api/v1/council/ask: finished responses are kept for
+# IDEMPOTENCY_TTL_S so retries with the same key replay them instead of re-running the council
+IDEMPOTENCY_DIR = os.getenv("IDEMPOTENCY_DIR", "data/idempotency")
+IDEMPOTENCY_TTL_S = float(os.getenv("IDEMPOTENCY_TTL_S", "86400"))
+IDEMPOTENCY_MAX_ENTRIES = int(os.getenv("IDEMPOTENCY_MAX_ENTRIES", "256"))
+# Running jobs refresh their in-progress marker this often, so long councils keep their key
+IDEMPOTENCY_HEARTBEAT_S = float(os.getenv("IDEMPOTENCY_HEARTBEAT_S", "30"))
+
+# Stage memoization (on or off): Stage 2 and Stage 3 outputs keyed by a hash of their
+# inputs, so a stored answer's synthesis or rankings can be regenerated from its Stage 1
+STAGE_MEMO = os.getenv("STAGE_MEMO", "on").lower()
+STAGE_MEMO_DIR = os.getenv("STAGE_MEMO_DIR", "data/stage_memo")
+STAGE_MEMO_MAX_ENTRIES = int(os.getenv("STAGE_MEMO_MAX_ENTRIES", "256"))
+STAGE_MEMO_TTL_S = float(os.getenv("STAGE_MEMO_TTL_S", "2592000"))
+
+# Web search result cache (on or off), keyed by the normalized query. Lifetimes depend on
+# freshness: news-style queries (recency cues, dates), default, and evergreen questions
+SEARCH_CACHE = os.getenv("SEARCH_CACHE", "on").lower()
+SEARCH_CACHE_DIR = os.getenv("SEARCH_CACHE_DIR", "data/search_cache")
+SEARCH_CACHE_MAX_ENTRIES = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "512"))
+SEARCH_CACHE_NEWS_TTL_S = float(os.getenv("SEARCH_CACHE_NEWS_TTL_S", "900"))
+SEARCH_CACHE_TTL_S = float(os.getenv("SEARCH_CACHE_TTL_S", "21600"))
+SEARCH_CACHE_EVERGREEN_TTL_S = float(os.getenv("SEARCH_CACHE_EVERGREEN_TTL_S", "604800"))
+
+# Speech audio cache for the speak endpoint (on or off): files addressed by a hash of
+# text, voice, engine and format, evicted least recently played beyond TTS_CACHE_MAX_MB
+TTS_CACHE = os.getenv("TTS_CACHE", "on").lower()
+TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", "data/tts_cache")
+TTS_CACHE_MAX_MB = float(os.getenv("TTS_CACHE_MAX_MB", "500"))
+POLLY_ENGINE = os.getenv("POLLY_ENGINE", "neural").lower()
+
+# Speculative speech synthesis (on or off): web UI answers are synthesized in the background
+# when Stage 3 completes, on TTS_PREFETCH_WORKERS low-priority threads separate from the
+# council's, so play starts at once. Answers over TTS_PREFETCH_MAX_CHARS are skipped and at
+# most TTS_PREFETCH_QUEUE jobs wait at a time
+TTS_PREFETCH = os.getenv("TTS_PREFETCH", "off").lower()
+TTS_PREFETCH_VOICE = os.getenv("TTS_PREFETCH_VOICE", "Matthew")
+TTS_PREFETCH_MAX_CHARS = int(os.getenv("TTS_PREFETCH_MAX_CHARS", "12000"))
+TTS_PREFETCH_WORKERS = int(os.getenv("TTS_PREFETCH_WORKERS", "1"))
+TTS_PREFETCH_QUEUE = int(os.getenv("TTS_PREFETCH_QUEUE", "4"))
+
+# Shared cache backing the result, search, idempotency and stage caches and API rate limits:
+# sqlite (one WAL database shared by all workers on the host), memory (per process) or
+# files (the result caches keep one JSON file per entry; rate limits are per process)
+SHARED_CACHE_BACKEND = os.getenv("SHARED_CACHE_BACKEND", "sqlite").lower()
+SHARED_CACHE_PATH = os.getenv("SHARED_CACHE_PATH", "data/cache.sqlite3")
+SHARED_CACHE_MAX_MB = float(os.getenv("SHARED_CACHE_MAX_MB", "1024"))
+
+# Enforce each API key's rate_limit requests per rate_window seconds (off or on)
+API_RATE_LIMIT = os.getenv("API_RATE_LIMIT", "off").lower()
+
+# Compress conversation and deliberation JSON (on or off) when the client accepts gzip or
+# brotli (brotli needs the optional `brotli` package) and the body is at least this large
+HTTP_COMPRESSION = os.getenv("HTTP_COMPRESSION", "on").lower()
+HTTP_COMPRESSION_MIN_BYTES = int(os.getenv("HTTP_COMPRESSION_MIN_BYTES", "1024"))
@@ -1,16 +1,50 @@
 """3-stage LLM Council orchestration."""
 
+import re
+import copy
+import json
+import time
+import random
+import asyncio
 import logging
-from typing import List, Dict, Any, Tuple, Optional
+from typing import List, Dict, Any, Tuple, Optional, AsyncIterator
+
+import numpy as np
+
 from .config import (
-    COUNCIL_MODELS, CHAIRMAN_MODEL, TITLE_MODEL, API_PROVIDER, ENABLE_WEB_SEARCH,
-    TAVILY_API_KEY, SERPER_API_KEY, BRAVE_API_KEY, SERPAPI_API_KEY
+    COUNCIL_MODELS, CHAIRMAN_MODEL, TITLE_MODEL, API_PROVIDER,
+    TAVILY_API_KEY, SERPER_API_KEY, BRAVE_API_KEY, SERPAPI_API_KEY,
+    CONSENSUS_EARLY_EXIT, CONSENSUS_THRESHOLD,
+    STAGE2_RANKING_MODE, STAGE2_FAST_MAX_TOKENS,
+    STAGE2_JUDGE_STRATEGY, STAGE2_JUDGE_MODEL, STAGE2_JUDGE_K,
+    RANKING_PANEL_MODELS, JUDGE_RELIABILITY,
+    STAGE2_SHARDING, STAGE2_SHARD_MIN_RESPONSES, STAGE2_SHARD_SIZE, STAGE2_SHARD_ROUNDS,
+    AGGREGATION_METHOD,
+    CHAIRMAN_COMPACTION, CHAIRMAN_COMPACTION_BUDGETS, CHAIRMAN_PREFILL_TOKENS_PER_SEC,
+    SPECULATIVE_CHAIRMAN, SPECULATIVE_MIN_AGREEMENT
 )
 from .search_providers import (
     search_with_fallback, format_search_results,
     SearchProvider, SearchProviderConfig
 )
 from .deliberations import save_deliberation
+from .similarity import text_similarity_matrix, summarize_similarity, tfidf_vectors
+from .compaction import compact_chairman_context
+from .selection import select_council_models, record_deliberation
+from .difficulty import plan_council, size_council
+from .debate import run_debate
+from .concurrency import query_models_with_quorum
+from .profiles import resolve_profile
+from .search_routing import decide_web_search
+from .result_cache import council_cache_key, council_request_key, cache_ttl, lookup_result, store_result
+from .singleflight import council_flight
+from .semantic_cache import lookup_similar, remember_deliberation
+from .tts_cache import schedule_speech_prefetch
+from .stage_memo import stage2_input_hash, stage3_input_hash, recall_stage, memoize_stage
+from .ranking import (
+    make_label, build_shards, assign_judges, rankings_to_positions,
+    aggregate_positions, average_ranks, expected_ranks, judge_agreement
+)
 
 logger = logging.getLogger("llm_council.council")
 
@@ -21,19 +55,22 @@ else:
     from .openrouter import query_models_parallel, query_model
 
 
-async def perform_web_search(query: str) -> Optional[str]:
+async def perform_web_search(query: str, enabled: Optional[bool] = None) -> Optional[str]:
     """
     Perform web search with automatic fallback between providers.
 
     Args:
         query: The user's question
+        enabled: Per-request switch (None = let decide_web_search route the question)
 
     Returns:
-        Formatted search results string, or None if search failed/disabled
+        Formatted search results string, or None if search failed, disabled or not needed
     """
-    logger.info(f"[SEARCH] perform_web_search called with ENABLE_WEB_SEARCH={ENABLE_WEB_SEARCH}")
+    if enabled is None:
+        enabled = decide_web_search(query)["search"]
+    logger.info(f"[SEARCH] perform_web_search called with enabled={enabled}")
 
-    if not ENABLE_WEB_SEARCH:
+    if not enabled:
         logger.debug("Web search disabled")
         return None
 
@@ -68,13 +105,13 @@ async def perform_web_search(query: str) -> Optional[str]:
     return None
 
 
-async def stage1_collect_responses(
+def build_stage1_messages(
     user_query: str,
     conversation_history: List[Dict[str, str]] = None,
     web_context: Optional[str] = None
-) -> List[Dict[str, Any]]:
+) -> List[Dict[str, str]]:
     """
-    Stage 1: Collect individual responses from all council models.
+    Build the Stage 1 messages: optional history plus the question with web context.
 
     Args:
         user_query: The user's question
@@ -82,7 +119,7 @@ async def stage1_collect_responses(
         web_context: Optional web search results to include as context
 
     Returns:
-        List of dicts with 'model' and 'response' keys
+        List of message dicts with role and content
     """
     # Build the user message with optional web context
     if web_context:
@@ -107,56 +144,298 @@ Please use the web search results above to provide accurate, current information
         messages = [{"role": "user", "content": enhanced_query}]
         logger.info("Stage 1: Starting fresh (no conversation history)")
 
-    logger.debug(f"Stage 1: Querying {len(COUNCIL_MODELS)} models")
+    return messages
+
+
+async def stage1_collect_responses(
+    user_query: str,
+    conversation_history: List[Dict[str, str]] = None,
+    web_context: Optional[str] = None,
+    models: Optional[List[str]] = None,
+    thinking_budget: Optional[int] = None,
+    max_tokens: Optional[int] = None,
+    deadline_s: Optional[float] = None,
+    quorum: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Stage 1: Collect individual responses from all council models.
+
+    Args:
+        user_query: The user's question
+        conversation_history: Optional list of previous messages for multi-turn context
+        web_context: Optional web search results to include as context
+        models: Council members to query (defaults to COUNCIL_MODELS)
+        thinking_budget: Optional thinking budget (None = provider default, 0 = off)
+        max_tokens: Optional cap on answer length (None = provider default)
+        deadline_s: Optional deadline after which a met quorum ends the stage
+        quorum: Minimum answers before the deadline can end the stage (defaults to all)
+
+    Returns:
+        List of dicts with 'model', 'response' and 'latency_s' keys
+    """
+    models = models or COUNCIL_MODELS
+
+    messages = build_stage1_messages(user_query, conversation_history, web_context)
+
+    logger.debug(f"Stage 1: Querying {len(models)} models")
+
+    query_kwargs = {"thinking_budget": thinking_budget}
+    if max_tokens:
+        query_kwargs["max_tokens"] = max_tokens
 
     # Query all models in parallel
-    responses = await query_models_parallel(COUNCIL_MODELS, messages)
+    if deadline_s:
+        responses, _ = await query_models_with_quorum(
+            models, messages, deadline_s, quorum or len(models), **query_kwargs
+        )
+    else:
+        responses = await query_models_parallel(models, messages, **query_kwargs)
 
     # Format results
     stage1_results = []
-    for model, response in responses.items():
+    for model in models:
+        response = responses.get(model)
         if response is not None:  # Only include successful responses
             stage1_results.append({
                 "model": model,
-                "response": response.get('content', '')
+                "response": response.get('content', ''),
+                "latency_s": response.get('latency_s')
             })
         else:
             logger.warning(f"Stage 1: Model {model} failed to respond")
 
-    logger.info(f"Stage 1 complete: {len(stage1_results)}/{len(COUNCIL_MODELS)} models responded")
+    logger.info(f"Stage 1 complete: {len(stage1_results)}/{len(models)} models responded")
     return stage1_results
 
 
-async def stage2_collect_rankings(
-    user_query: str,
-    stage1_results: List[Dict[str, Any]]
-) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+def check_stage1_consensus(stage1_results: List[Dict[str, Any]]) -> Dict[str, Any]:
     """
-    Stage 2: Each model ranks the anonymized responses.
+    Measure agreement between Stage 1 responses to decide whether Stage 2 can be skipped.
+
+    Uses a local hashed n-gram TF-IDF cosine matrix, so no model calls are made.
 
     Args:
-        user_query: The original user query
         stage1_results: Results from Stage 1
 
     Returns:
-        Tuple of (rankings list, label_to_model mapping)
+        Dict describing the decision ('skip_stage2', 'action') and its scores
     """
-    # Create anonymized labels for responses (Response A, Response B, etc.)
-    labels = [chr(65 + i) for i in range(len(stage1_results))]  # A, B, C, ...
-
-    # Create mapping from label to model name
-    label_to_model = {
-        f"Response {label}": result['model']
-        for label, result in zip(labels, stage1_results)
+    models = [result['model'] for result in stage1_results]
+    decision = {
+        "mode": CONSENSUS_EARLY_EXIT,
+        "threshold": CONSENSUS_THRESHOLD,
+        "models": models,
+        "skip_stage2": False,
+        "action": "stage2"
     }
 
-    # Build the ranking prompt
-    responses_text = "\n\n".join([
-        f"Response {label}:\n{result['response']}"
-        for label, result in zip(labels, stage1_results)
-    ])
+    if CONSENSUS_EARLY_EXIT == "off" or len(stage1_results) < 2:
+        return decision
+
+    matrix = text_similarity_matrix([result['response'] for result in stage1_results])
+    summary = summarize_similarity(matrix)
+
+    decision.update({
+        "scores": [[round(float(v), 4) for v in row] for row in matrix],
+        "mean_similarity": round(summary["mean"], 4),
+        "min_similarity": round(summary["min"], 4),
+        "central_model": models[summary["central_index"]]
+    })
+
+    # Every pair must agree, not just the average
+    if summary["min"] >= CONSENSUS_THRESHOLD:
+        decision["skip_stage2"] = True
+        decision["action"] = "answer" if CONSENSUS_EARLY_EXIT == "answer" else "chairman"
+        logger.info(
+            f"Consensus: min similarity {summary['min']:.3f} >= {CONSENSUS_THRESHOLD}, "
+            f"skipping Stage 2 ({decision['action']})"
+        )
+    else:
+        logger.info(
+            f"Consensus: min similarity {summary['min']:.3f} < {CONSENSUS_THRESHOLD}, running Stage 2"
+        )
+
+    return decision
 
-    ranking_prompt = f"""You are evaluating different responses to the following question:
+
+def select_consensus_answer(
+    stage1_results: List[Dict[str, Any]],
+    consensus: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    Return the most representative Stage 1 response as the final answer.
+
+    Args:
+        stage1_results: Results from Stage 1
+        consensus: Decision returned by check_stage1_consensus
+
+    Returns:
+        Dict with 'model' and 'response' keys
+    """
+    central_model = consensus.get("central_model")
+    for result in stage1_results:
+        if result['model'] == central_model:
+            return {"model": result['model'], "response": result['response']}
+    return {"model": stage1_results[0]['model'], "response": stage1_results[0]['response']}
+
+
+# JSON schema for the fast structured ranking mode
+STAGE2_RANKING_SCHEMA = {
+    "title": "submit_ranking",
+    "description": "Submit the ranking of the anonymized responses from best to worst.",
+    "type": "object",
+    "properties": {
+        "ranking": {
+            "type": "array",
+            "description": "Every response, ordered from best to worst",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "label": {
+                        "type": "string",
+                        "description": "Response label, e.g. 'Response A'"
+                    },
+                    "rationale": {
+                        "type": "string",
+                        "description": "One short sentence explaining the placement"
+                    }
+                },
+                "required": ["label", "rationale"],
+                "additionalProperties": False
+            }
+        }
+    },
+    "required": ["ranking"],
+    "additionalProperties": False
+}
+
+
+def build_fast_ranking_prompt(user_query: str, responses_text: str) -> str:
+    """
+    Build the compact Stage 2 prompt used by the fast structured ranking mode.
+
+    Args:
+        user_query: The original user query
+        responses_text: The anonymized responses
+
+    Returns:
+        Prompt asking for a JSON ranking with one-line rationales
+    """
+    return f"""You are evaluating different responses to the following question:
+
+Question: {user_query}
+
+Here are the responses from different models (anonymized):
+
+{responses_text}
+
+Rank every response from best to worst on accuracy and insight.
+Reply ONLY with JSON in exactly this shape, with one short sentence of rationale per response:
+
+{{"ranking": [{{"label": "Response C", "rationale": "..."}}, {{"label": "Response A", "rationale": "..."}}]}}"""
+
+
+def parse_structured_ranking(
+    ranking_text: str,
+    valid_labels: List[str]
+) -> Optional[Tuple[List[str], Dict[str, str]]]:
+    """
+    Parse a JSON ranking produced by the fast structured ranking mode.
+
+    Args:
+        ranking_text: The model output (JSON, possibly wrapped in a code fence)
+        valid_labels: Labels that may appear in the ranking
+
+    Returns:
+        Tuple of (ranked labels, label -> rationale), or None if the output is malformed
+    """
+    start = ranking_text.find("{")
+    end = ranking_text.rfind("}")
+    if start == -1 or end <= start:
+        return None
+
+    try:
+        data = json.loads(ranking_text[start:end + 1])
+    except json.JSONDecodeError:
+        return None
+
+    entries = data.get("ranking") if isinstance(data, dict) else None
+    if not isinstance(entries, list):
+        return None
+
+    ranked = []
+    rationales = {}
+    for entry in entries:
+        if isinstance(entry, dict):
+            label = str(entry.get("label", "")).strip()
+            rationale = str(entry.get("rationale", "")).strip()
+        else:
+            label, rationale = str(entry).strip(), ""
+        if label in valid_labels and label not in ranked:
+            ranked.append(label)
+            rationales[label] = rationale
+
+    if not ranked:
+        return None
+    return ranked, rationales
+
+
+def format_structured_ranking(ranked: List[str], rationales: Dict[str, str]) -> str:
+    """
+    Render a structured ranking in the same text format as a full evaluation.
+
+    Keeps the FINAL RANKING block so the ranking text stays readable by
+    parse_ranking_from_text, the UI and the chairman.
+    """
+    lines = [
+        f"{label}: {rationales[label]}" if rationales.get(label) else label
+        for label in ranked
+    ]
+    lines.append("")
+    lines.append("FINAL RANKING:")
+    lines.extend(f"{i}. {label}" for i, label in enumerate(ranked, start=1))
+    return "\n".join(lines)
+
+
+def select_judges(strategy: Optional[str] = None, council_models: Optional[List[str]] = None) -> List[str]:
+    """
+    Choose which models rank the Stage 1 responses.
+
+    Args:
+        strategy: "all", "single", "random_k" or "panel" (defaults to STAGE2_JUDGE_STRATEGY)
+        council_models: Council members of this deliberation (defaults to COUNCIL_MODELS)
+
+    Returns:
+        List of judge model identifiers
+    """
+    strategy = strategy or STAGE2_JUDGE_STRATEGY
+    council_models = council_models or COUNCIL_MODELS
+
+    if strategy == "single":
+        return [STAGE2_JUDGE_MODEL]
+    if strategy == "random_k":
+        k = max(1, min(STAGE2_JUDGE_K, len(council_models)))
+        return random.sample(council_models, k)
+    if strategy == "panel":
+        return list(RANKING_PANEL_MODELS)
+    if strategy != "all":
+        logger.warning(f"Unknown judge strategy '{strategy}', using all council models")
+
+    return list(council_models)
+
+
+def build_ranking_prompt(user_query: str, responses_text: str) -> str:
+    """
+    Build the full Stage 2 prompt: a critique of every response plus a FINAL RANKING block.
+
+    Args:
+        user_query: The original user query
+        responses_text: The anonymized responses
+
+    Returns:
+        The ranking prompt
+    """
+    return f"""You are evaluating different responses to the following question:
 
 Question: {user_query}
 
@@ -187,36 +466,210 @@ FINAL RANKING:
 
 Now provide your evaluation and ranking:"""
 
-    messages = [{"role": "user", "content": ranking_prompt}]
 
-    logger.info(f"Stage 2: Collecting rankings for {len(stage1_results)} responses")
+def _stage2_request(user_query: str, responses_text: str, ranking_mode: str) -> Tuple[List[Dict[str, str]], Dict[str, Any]]:
+    """Build the Stage 2 messages and extra query arguments for a ranking mode."""
+    if ranking_mode == "fast":
+        messages = [{"role": "user", "content": build_fast_ranking_prompt(user_query, responses_text)}]
+        return messages, {"max_tokens": STAGE2_FAST_MAX_TOKENS, "json_schema": STAGE2_RANKING_SCHEMA}
+
+    return [{"role": "user", "content": build_ranking_prompt(user_query, responses_text)}], {}
+
+
+def _format_stage2_result(
+    model: str,
+    full_text: str,
+    valid_labels: List[str],
+    ranking_mode: str
+) -> Dict[str, Any]:
+    """Parse one judge's output into a Stage 2 result dict."""
+    if ranking_mode == "fast":
+        structured = parse_structured_ranking(full_text, valid_labels)
+        if structured is not None:
+            parsed, rationales = structured
+            return {
+                "model": model,
+                "ranking": format_structured_ranking(parsed, rationales),
+                "parsed_ranking": parsed,
+                "rationales": rationales
+            }
+        logger.warning(f"Stage 2: {model} returned malformed JSON ranking, using text parser")
+
+    return {
+        "model": model,
+        "ranking": full_text,
+        "parsed_ranking": parse_ranking_from_text(full_text)
+    }
+
+
+def use_sharded_ranking(n_responses: int) -> bool:
+    """
+    Decide whether Stage 2 should be split into shards.
+
+    Args:
+        n_responses: Number of Stage 1 responses
+
+    Returns:
+        True when STAGE2_SHARDING is "on", or "auto" and the council is large
+    """
+    if STAGE2_SHARDING == "on":
+        return n_responses > 2
+    if STAGE2_SHARDING == "auto":
+        return n_responses >= STAGE2_SHARD_MIN_RESPONSES
+    return False
+
+
+async def stage2_collect_sharded_rankings(
+    user_query: str,
+    stage1_results: List[Dict[str, Any]],
+    label_to_model: Dict[str, str],
+    ranking_mode: str,
+    judges: List[str]
+) -> List[Dict[str, Any]]:
+    """
+    Stage 2 for large councils: judges rank small groups of responses in parallel.
+
+    Each prompt only holds STAGE2_SHARD_SIZE responses, so prompt size and
+    per-call latency stay flat as the council grows. The partial rankings are
+    combined by calculate_aggregate_rankings with a Bradley-Terry fit.
+
+    Args:
+        user_query: The original user query
+        stage1_results: Results from Stage 1
+        label_to_model: Mapping from anonymous labels to model names
+        ranking_mode: "full" or "fast"
+        judges: Models that rank the shards
+
+    Returns:
+        List of Stage 2 results, one per shard, each with a 'shard' label list
+    """
+    all_labels = list(label_to_model)
+    response_by_label = {
+        label: result['response'] for label, result in zip(all_labels, stage1_results)
+    }
+
+    shards = [
+        [all_labels[i] for i in group]
+        for group in build_shards(len(all_labels), STAGE2_SHARD_SIZE, STAGE2_SHARD_ROUNDS)
+    ]
+    shard_judges = assign_judges(shards, judges, label_to_model)
+
+    logger.info(
+        f"Stage 2: Sharded ranking of {len(all_labels)} responses into {len(shards)} groups "
+        f"of ~{STAGE2_SHARD_SIZE} across {len(set(shard_judges))} judges"
+    )
+
+    tasks = []
+    for shard, judge in zip(shards, shard_judges):
+        responses_text = "\n\n".join(
+            f"{label}:\n{response_by_label[label]}" for label in shard
+        )
+        messages, query_kwargs = _stage2_request(user_query, responses_text, ranking_mode)
+        tasks.append(query_model(judge, messages, **query_kwargs))
+
+    responses = await asyncio.gather(*tasks)
+
+    stage2_results = []
+    for shard, judge, response in zip(shards, shard_judges, responses):
+        if response is None:
+            logger.warning(f"Stage 2: {judge} failed to rank shard {shard}")
+            continue
+        result = _format_stage2_result(judge, response.get('content', ''), shard, ranking_mode)
+        result["parsed_ranking"] = [label for label in result["parsed_ranking"] if label in shard]
+        result["shard"] = shard
+        stage2_results.append(result)
+
+    logger.info(f"Stage 2 complete: {len(stage2_results)}/{len(shards)} shard rankings collected")
+    return stage2_results
+
+
+async def stage2_collect_rankings(
+    user_query: str,
+    stage1_results: List[Dict[str, Any]],
+    ranking_mode: Optional[str] = None,
+    judges: Optional[List[str]] = None,
+    deadline_s: Optional[float] = None,
+    quorum: Optional[int] = None
+) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+    """
+    Stage 2: Judge models rank the anonymized responses.
+
+    Large councils are ranked in parallel shards (see use_sharded_ranking).
+
+    Args:
+        user_query: The original user query
+        stage1_results: Results from Stage 1
+        ranking_mode: "full" for free-text critiques or "fast" for compact JSON
+            rankings (defaults to STAGE2_RANKING_MODE)
+        judges: Models that rank the responses (defaults to select_judges())
+        deadline_s: Optional deadline after which a met quorum of judges ends the stage
+            (not applied to sharded ranking, where every shard needs a judge)
+        quorum: Minimum rankings before the deadline can end the stage (defaults to all)
+
+    Returns:
+        Tuple of (rankings list, label_to_model mapping)
+    """
+    ranking_mode = ranking_mode or STAGE2_RANKING_MODE
+    judges = judges or select_judges()
+
+    # Create anonymized labels for responses (Response A, ..., Response Z, Response AA, ...)
+    labels = [make_label(i) for i in range(len(stage1_results))]
+
+    # Create mapping from label to model name
+    label_to_model = {
+        f"Response {label}": result['model']
+        for label, result in zip(labels, stage1_results)
+    }
+
+    if use_sharded_ranking(len(stage1_results)):
+        stage2_results = await stage2_collect_sharded_rankings(
+            user_query, stage1_results, label_to_model, ranking_mode, judges
+        )
+        return stage2_results, label_to_model
 
-    # Get rankings from all council models in parallel
-    responses = await query_models_parallel(COUNCIL_MODELS, messages)
+    # Build the ranking prompt
+    responses_text = "\n\n".join([
+        f"Response {label}:\n{result['response']}"
+        for label, result in zip(labels, stage1_results)
+    ])
+
+    messages, query_kwargs = _stage2_request(user_query, responses_text, ranking_mode)
+
+    logger.info(
+        f"Stage 2: Collecting {ranking_mode} rankings for {len(stage1_results)} responses "
+        f"from {len(judges)} judges"
+    )
+
+    # Get rankings from all judges in parallel
+    if deadline_s:
+        responses, _ = await query_models_with_quorum(
+            judges, messages, deadline_s, quorum or len(judges), **query_kwargs
+        )
+    else:
+        responses = await query_models_parallel(judges, messages, **query_kwargs)
 
     # Format results
     stage2_results = []
-    for model, response in responses.items():
+    for model in judges:
+        response = responses.get(model)
         if response is not None:
-            full_text = response.get('content', '')
-            parsed = parse_ranking_from_text(full_text)
-            stage2_results.append({
-                "model": model,
-                "ranking": full_text,
-                "parsed_ranking": parsed
-            })
-            logger.debug(f"Stage 2: {model} ranked: {parsed}")
+            result = _format_stage2_result(model, response.get('content', ''), list(label_to_model), ranking_mode)
+            stage2_results.append(result)
+            logger.debug(f"Stage 2: {model} ranked: {result['parsed_ranking']}")
         else:
             logger.warning(f"Stage 2: Model {model} failed to provide ranking")
 
-    logger.info(f"Stage 2 complete: {len(stage2_results)}/{len(COUNCIL_MODELS)} rankings collected")
+    logger.info(f"Stage 2 complete: {len(stage2_results)}/{len(judges)} rankings collected")
     return stage2_results, label_to_model
 
 
 async def stage3_synthesize_final(
     user_query: str,
     stage1_results: List[Dict[str, Any]],
-    stage2_results: List[Dict[str, Any]]
+    stage2_results: List[Dict[str, Any]],
+    compaction_modes: Optional[List[str]] = None,
+    chairman: Optional[str] = None,
+    timeout: float = 180.0
 ) -> Dict[str, Any]:
     """
     Stage 3: Chairman synthesizes final response.
@@ -225,20 +678,38 @@ async def stage3_synthesize_final(
         user_query: The original user query
         stage1_results: Individual model responses from Stage 1
         stage2_results: Rankings from Stage 2
+        compaction_modes: Chairman input compaction modes (defaults to CHAIRMAN_COMPACTION)
+        chairman: Chairman model (defaults to CHAIRMAN_MODEL)
+        timeout: Chairman request timeout in seconds
 
     Returns:
-        Dict with 'model' and 'response' keys
+        Dict with 'model' and 'response' keys, plus 'compaction' stats when enabled
     """
-    # Build comprehensive context for chairman
-    stage1_text = "\n\n".join([
-        f"Model: {result['model']}\nResponse: {result['response']}"
-        for result in stage1_results
-    ])
+    compaction_modes = CHAIRMAN_COMPACTION if compaction_modes is None else compaction_modes
+    chairman = chairman or CHAIRMAN_MODEL
+    compaction = None
 
-    stage2_text = "\n\n".join([
-        f"Model: {result['model']}\nRanking: {result['ranking']}"
-        for result in stage2_results
-    ])
+    # Build comprehensive context for chairman
+    if compaction_modes:
+        stage1_text, stage2_text, compaction = compact_chairman_context(
+            stage1_results,
+            stage2_results,
+            compaction_modes,
+            CHAIRMAN_COMPACTION_BUDGETS,
+            CHAIRMAN_PREFILL_TOKENS_PER_SEC
+        )
+    else:
+        stage1_text = "\n\n".join([
+            f"Model: {result['model']}\nResponse: {result['response']}"
+            for result in stage1_results
+        ])
+        stage2_text = "\n\n".join([
+            f"Model: {result['model']}\nRanking: {result['ranking']}"
+            for result in stage2_results
+        ])
+
+    if not stage2_results:
+        stage2_text = "(Skipped - no peer rankings were collected for this question.)"
 
     chairman_prompt = f"""You are the Chairman of an LLM Council. Multiple AI models have provided responses to a user's question, and then ranked each other's responses.
 
@@ -260,118 +731,405 @@ Provide a clear, well-reasoned final answer that represents the council's collec
     messages = [{"role": "user", "content": chairman_prompt}]
 
     prompt_length = len(chairman_prompt)
-    logger.info(f"Stage 3: Chairman ({CHAIRMAN_MODEL}) synthesizing final response")
+    logger.info(f"Stage 3: Chairman ({chairman}) synthesizing final response")
     logger.info(f"Stage 3: Chairman prompt is {prompt_length} characters (~{prompt_length // 4} tokens)")
 
     # Query the chairman model with extended timeout for large context
     # Chairman needs more time to process all Stage 1 + Stage 2 content
-    timeout = 180.0  # 3 minutes instead of default 2 minutes
+    # (3 minutes by default instead of the 2-minute query default)
     logger.debug(f"Stage 3: Using timeout of {timeout}s for Chairman synthesis")
 
     try:
-        response = await query_model(CHAIRMAN_MODEL, messages, timeout=timeout)
+        response = await query_model(chairman, messages, timeout=timeout)
     except Exception as e:
         logger.error(f"Stage 3: Exception querying Chairman: {e}", exc_info=True)
         response = None
 
     if response is None:
         # Fallback if chairman fails
-        logger.error(f"Stage 3: Chairman model {CHAIRMAN_MODEL} failed to respond!")
+        logger.error(f"Stage 3: Chairman model {chairman} failed to respond!")
         logger.error(f"Stage 3: This could be due to:")
         logger.error(f"  - Timeout (prompt was {prompt_length} chars)")
         logger.error(f"  - Model not available in region")
         logger.error(f"  - AWS quota/throttling limits")
         logger.error(f"  - Context window exceeded")
-        return {
-            "model": CHAIRMAN_MODEL,
+        result = {
+            "model": chairman,
             "response": "Error: Unable to generate final synthesis."
         }
+    else:
+        content = response.get('content', '')
+        logger.info(f"Stage 3 complete: Chairman synthesized {len(content)} chars")
+        result = {
+            "model": chairman,
+            "response": content
+        }
+
+    if compaction:
+        result["compaction"] = compaction
+    return result
+
+
+def draft_ranking_agreement(
+    draft: str,
+    stage1_results: List[Dict[str, Any]],
+    aggregate_rankings: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Measure whether a speculative chairman draft agrees with the peer ranking.
+
+    The draft's reliance on each Stage 1 response is its TF-IDF cosine
+    similarity to that response. Agreement is the Kendall tau between that
+    reliance order and the aggregate ranking order.
+
+    Args:
+        draft: The chairman's draft written before Stage 2 finished
+        stage1_results: Results from Stage 1
+        aggregate_rankings: Aggregate ranking from Stage 2 (best first)
+
+    Returns:
+        Dict with 'agreement' (-1..1), 'draft_top_model' (response the draft
+        relies on most), 'council_top_model' and 'contradicted'
+    """
+    ranked_models = [entry['model'] for entry in aggregate_rankings]
+    results = [r for r in stage1_results if r['model'] in ranked_models]
+    if len(results) < 2:
+        return {"agreement": 1.0, "draft_top_model": None, "council_top_model": None, "contradicted": False}
+
+    vectors = tfidf_vectors([draft] + [r['response'] for r in results])
+    reliance = vectors[1:] @ vectors[0]
+    council_rank = np.array([ranked_models.index(r['model']) for r in results])
+
+    # Kendall tau between "relied on more" and "ranked better" (lower rank index)
+    reliance_sign = np.sign(reliance[:, None] - reliance[None, :])
+    rank_sign = np.sign(council_rank[None, :] - council_rank[:, None])
+    pairs = np.triu(np.ones_like(reliance_sign, dtype=bool), k=1)
+    agreement = float((reliance_sign * rank_sign)[pairs].mean())
+
+    draft_top = results[int(reliance.argmax())]['model']
+    draft_bottom = results[int(reliance.argmin())]['model']
+    council_top = ranked_models[0]
+
+    # The draft ignoring the council's favourite is a contradiction whatever tau says
+    contradicted = agreement < SPECULATIVE_MIN_AGREEMENT or (len(results) > 2 and draft_bottom == council_top)
 
-    content = response.get('content', '')
-    logger.info(f"Stage 3 complete: Chairman synthesized {len(content)} chars")
     return {
-        "model": CHAIRMAN_MODEL,
-        "response": content
+        "agreement": round(agreement, 3),
+        "draft_top_model": draft_top,
+        "council_top_model": council_top,
+        "contradicted": contradicted
     }
 
 
+async def reconcile_chairman_draft(
+    user_query: str,
+    draft_result: Dict[str, Any],
+    stage1_results: List[Dict[str, Any]],
+    aggregate_rankings: List[Dict[str, Any]],
+    timeout: float = 180.0
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Accept a speculative chairman draft or revise it to match the peer ranking.
+
+    Args:
+        user_query: The original user query
+        draft_result: Stage 3 result drafted from Stage 1 alone
+        stage1_results: Results from Stage 1
+        aggregate_rankings: Aggregate ranking from Stage 2 (best first)
+        timeout: Chairman request timeout in seconds
+
+    Returns:
+        Tuple of (final Stage 3 result, speculation report)
+    """
+    draft = draft_result.get('response', '')
+    check = draft_ranking_agreement(draft, stage1_results, aggregate_rankings)
+    report = {"accepted_unchanged": True, **check}
+
+    if not check["contradicted"] or not aggregate_rankings:
+        logger.info(f"Stage 3: Speculative draft accepted unchanged (agreement {check['agreement']})")
+        return draft_result, report
+
+    ranking_lines = "\n".join(
+        f"{i}. {entry['model']} (average rank {entry['average_rank']})"
+        for i, entry in enumerate(aggregate_rankings, start=1)
+    )
+    top_response = next(
+        (r['response'] for r in stage1_results if r['model'] == check["council_top_model"]), ""
+    )
+
+    reconcile_prompt = f"""You are the Chairman of an LLM Council. You drafted a final answer before the council finished ranking each other's responses. The peer ranking is now in and does not match the responses your draft relied on.
+
+Original Question: {user_query}
+
+Your Draft:
+{draft}
+
+Peer Ranking (best first):
+{ranking_lines}
+
+Your draft relied most on {check['draft_top_model']}. The council ranked {check['council_top_model']} highest. Its response was:
+{top_response[:6000]}
+
+Revise the draft so that it reflects the strongest-ranked responses. Keep everything in the draft that is still correct. Reply with the complete revised final answer only:"""
+
+    logger.info(
+        f"Stage 3: Reconciling speculative draft (agreement {check['agreement']}, "
+        f"council top {check['council_top_model']})"
+    )
+    try:
+        response = await query_model(
+            draft_result.get('model') or CHAIRMAN_MODEL,
+            [{"role": "user", "content": reconcile_prompt}],
+            timeout=timeout
+        )
+    except Exception as e:
+        logger.error(f"Stage 3: Exception reconciling draft: {e}", exc_info=True)
+        response = None
+
+    if response is None or not response.get('content'):
+        logger.warning("Stage 3: Reconciliation failed, keeping the speculative draft")
+        report["reconcile_failed"] = True
+        return draft_result, report
+
+    report["accepted_unchanged"] = False
+    result = dict(draft_result)
+    result["response"] = response['content']
+    return result, report
+
+
+async def _timed(coro) -> Tuple[Any, float]:
+    """Await a coroutine and return (result, elapsed seconds)."""
+    start = time.perf_counter()
+    result = await coro
+    return result, time.perf_counter() - start
+
+
+def start_speculative_draft(
+    user_query: str,
+    stage1_results: List[Dict[str, Any]],
+    consensus: Dict[str, Any],
+    chairman: Optional[str] = None,
+    timeout: float = 180.0
+) -> Optional[asyncio.Task]:
+    """
+    Start the chairman drafting from Stage 1 so it overlaps Stage 2.
+
+    Args:
+        user_query: The original user query
+        stage1_results: Results from Stage 1
+        consensus: Decision returned by check_stage1_consensus
+        chairman: Chairman model (defaults to CHAIRMAN_MODEL)
+        timeout: Chairman request timeout in seconds
+
+    Returns:
+        The draft task, or None when speculation is off or no synthesis is needed
+    """
+    if SPECULATIVE_CHAIRMAN != "on" or consensus["action"] == "answer":
+        return None
+    logger.info("Stage 3: Chairman drafting speculatively while Stage 2 runs")
+    return asyncio.create_task(_timed(
+        stage3_synthesize_final(user_query, stage1_results, [], chairman=chairman, timeout=timeout)
+    ))
+
+
+def cancel_speculative_draft(draft_task: Optional[asyncio.Task]):
+    """
+    Abandon a speculative draft that was not awaited.
+
+    Called once Stage 3 is over, or when Stage 2 raised or the stream was
+    closed first; a draft that already finished is left alone.
+
+    Args:
+        draft_task: Task returned by start_speculative_draft, or None
+    """
+    if draft_task is not None and not draft_task.done():
+        logger.info("Stage 3: Cancelling the unused speculative draft")
+        draft_task.cancel()
+
+
+async def finish_speculative_draft(
+    user_query: str,
+    draft_task: asyncio.Task,
+    stage1_results: List[Dict[str, Any]],
+    aggregate_rankings: List[Dict[str, Any]],
+    stage2_s: float,
+    timeout: float = 180.0
+) -> Dict[str, Any]:
+    """
+    Wait for the speculative draft and reconcile it with the Stage 2 ranking.
+
+    Args:
+        user_query: The original user query
+        draft_task: Task returned by start_speculative_draft
+        stage1_results: Results from Stage 1
+        aggregate_rankings: Aggregate ranking from Stage 2 (best first)
+        stage2_s: Stage 2 duration in seconds
+        timeout: Timeout for a reconciliation call
+
+    Returns:
+        Final Stage 3 result with a 'speculation' report (accepted_unchanged,
+        timings and the estimated saving versus running the chairman after Stage 2)
+    """
+    start = time.perf_counter()
+    draft_result, draft_s = await draft_task
+    stage3_result, speculation = await reconcile_chairman_draft(
+        user_query, draft_result, stage1_results, aggregate_rankings, timeout=timeout
+    )
+    after_stage2_s = time.perf_counter() - start
+
+    speculation.update({
+        "draft_s": round(draft_s, 2),
+        "stage2_s": round(stage2_s, 2),
+        "after_stage2_s": round(after_stage2_s, 2),
+        # Sequential baseline: the same chairman call would only start after Stage 2
+        "estimated_time_saved_s": round(draft_s - after_stage2_s, 2)
+    })
+    stage3_result["speculation"] = speculation
+    return stage3_result
+
+
+# Precompiled ranking parser patterns. Labels may be multi-letter (Response AA)
+# so councils can exceed 26 members.
+FINAL_RANKING_MARKER = "FINAL RANKING:"
+RANKING_LABEL_PATTERN = re.compile(r'(?P<numbered>\d+\.\s*)?(?P<label>Response [A-Z]+)\b')
+
+
 def parse_ranking_from_text(ranking_text: str) -> List[str]:
     """
     Parse the FINAL RANKING section from the model's response.
 
+    Scans the ranking section once, preferring numbered entries ("1. Response A")
+    and falling back to every label mention in order. Repeated labels keep
+    their first position.
+
     Args:
         ranking_text: The full text response from the model
 
     Returns:
         List of response labels in ranked order
     """
-    import re
+    # Look for "FINAL RANKING:" section, otherwise scan the whole text
+    marker = ranking_text.find(FINAL_RANKING_MARKER)
+    section = ranking_text[marker + len(FINAL_RANKING_MARKER):] if marker != -1 else ranking_text
 
-    # Look for "FINAL RANKING:" section
-    if "FINAL RANKING:" in ranking_text:
-        # Extract everything after "FINAL RANKING:"
-        parts = ranking_text.split("FINAL RANKING:")
-        if len(parts) >= 2:
-            ranking_section = parts[1]
-            # Try to extract numbered list format (e.g., "1. Response A")
-            # This pattern looks for: number, period, optional space, "Response X"
-            numbered_matches = re.findall(r'\d+\.\s*Response [A-Z]', ranking_section)
-            if numbered_matches:
-                # Extract just the "Response X" part
-                return [re.search(r'Response [A-Z]', m).group() for m in numbered_matches]
+    numbered = []
+    mentioned = []
+    for match in RANKING_LABEL_PATTERN.finditer(section):
+        label = match.group("label")
+        mentioned.append(label)
+        if marker != -1 and match.group("numbered"):
+            numbered.append(label)
 
-            # Fallback: Extract all "Response X" patterns in order
-            matches = re.findall(r'Response [A-Z]', ranking_section)
-            return matches
+    return list(dict.fromkeys(numbered or mentioned))
 
-    # Fallback: try to find any "Response X" patterns in order
-    matches = re.findall(r'Response [A-Z]', ranking_text)
-    return matches
+
+def _ranking_positions(
+    stage2_results: List[Dict[str, Any]],
+    label_to_model: Dict[str, str]
+) -> np.ndarray:
+    """Positions array (judges x responses) from the already parsed Stage 2 rankings."""
+    rankings = [
+        ranking.get('parsed_ranking') or parse_ranking_from_text(ranking['ranking'])
+        for ranking in stage2_results
+    ]
+    return rankings_to_positions(rankings, list(label_to_model))
 
 
-def calculate_aggregate_rankings(
+def judge_reliability_weights(
     stage2_results: List[Dict[str, Any]],
     label_to_model: Dict[str, str]
+) -> Dict[str, float]:
+    """
+    Estimate how much to trust each judge's ranking.
+
+    A judge's weight is its prior from JUDGE_RELIABILITY (default 1.0) times its
+    agreement with the consensus of the other judges, measured as the fraction of
+    response pairs it orders the same way. With fewer than three judges there is
+    no independent consensus, so only the prior is used.
+
+    Args:
+        stage2_results: Rankings from each judge
+        label_to_model: Mapping from anonymous labels to model names
+
+    Returns:
+        Dict mapping judge model to weight
+    """
+    priors = np.array([JUDGE_RELIABILITY.get(ranking['model'], 1.0) for ranking in stage2_results])
+
+    # Judges of different shards saw different responses, so only priors apply
+    if any(ranking.get("shard") for ranking in stage2_results):
+        return {ranking['model']: float(prior) for ranking, prior in zip(stage2_results, priors)}
+
+    agreement = judge_agreement(_ranking_positions(stage2_results, label_to_model), priors)
+
+    # Keep a floor so one contrarian judge is down-weighted, not silenced
+    weights = priors * np.maximum(agreement, 0.1)
+    return {
+        ranking['model']: round(float(weight), 4)
+        for ranking, weight in zip(stage2_results, weights)
+    }
+
+
+def calculate_aggregate_rankings(
+    stage2_results: List[Dict[str, Any]],
+    label_to_model: Dict[str, str],
+    judge_weights: Optional[Dict[str, float]] = None,
+    method: Optional[str] = None
 ) -> List[Dict[str, Any]]:
     """
     Calculate aggregate rankings across all models.
 
+    Works on the 'parsed_ranking' of each result as an integer position array.
+    Each judge is weighted by its reliability, so the average rank is a weighted
+    mean (identical to the plain mean when all weights are equal). Sharded
+    rankings cover different subsets and are always combined with Bradley-Terry.
+
     Args:
         stage2_results: Rankings from each model
         label_to_model: Mapping from anonymous labels to model names
+        judge_weights: Optional judge -> weight mapping (computed with
+            judge_reliability_weights when omitted)
+        method: "average", "borda", "kemeny" or "bradley_terry"
+            (defaults to AGGREGATION_METHOD)
 
     Returns:
         List of dicts with model name and average rank, sorted best to worst
     """
-    from collections import defaultdict
+    if not stage2_results or not label_to_model:
+        return []
 
-    # Track positions for each model
-    model_positions = defaultdict(list)
+    if judge_weights is None:
+        judge_weights = judge_reliability_weights(stage2_results, label_to_model)
 
-    for ranking in stage2_results:
-        ranking_text = ranking['ranking']
+    method = method or AGGREGATION_METHOD
+    if any(ranking.get("shard") for ranking in stage2_results):
+        method = "bradley_terry"
 
-        # Parse the ranking from the structured format
-        parsed_ranking = parse_ranking_from_text(ranking_text)
+    labels = list(label_to_model)
+    positions = _ranking_positions(stage2_results, label_to_model)
+    weights = np.array([judge_weights.get(ranking['model'], 1.0) for ranking in stage2_results])
 
-        for position, label in enumerate(parsed_ranking, start=1):
-            if label in label_to_model:
-                model_name = label_to_model[label]
-                model_positions[model_name].append(position)
+    order, scores = aggregate_positions(positions, method, weights)
+    counts = (positions >= 0).sum(axis=0)
 
-    # Calculate average position for each model
-    aggregate = []
-    for model, positions in model_positions.items():
-        if positions:
-            avg_rank = sum(positions) / len(positions)
-            aggregate.append({
-                "model": model,
-                "average_rank": round(avg_rank, 2),
-                "rankings_count": len(positions)
-            })
+    # Bradley-Terry strengths map to an expected rank; other methods report the mean rank
+    if method == "bradley_terry":
+        ranks = expected_ranks(scores)
+    else:
+        ranks = average_ranks(positions, weights)
 
-    # Sort by average rank (lower is better)
-    aggregate.sort(key=lambda x: x['average_rank'])
+    aggregate = []
+    for i in order:
+        if counts[i] == 0:
+            continue
+        entry = {
+            "model": label_to_model[labels[i]],
+            "average_rank": round(float(ranks[i]), 2),
+            "rankings_count": int(counts[i])
+        }
+        if method in ("borda", "bradley_terry"):
+            entry["score"] = round(float(scores[i]), 4)
+        aggregate.append(entry)
 
     return aggregate
 
@@ -415,9 +1173,169 @@ Title:"""
     return title
 
 
+def plan_deliberation(user_query: str, settings: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    Combine the difficulty plan with resolved profile settings.
+
+    Explicit profile models win over the profile's council_size, which wins
+    over the tier's size; the profile's thinking budget, Stage 2 switch and
+    debate rounds win over the tier's when set.
+
+    Args:
+        user_query: The user's question
+        settings: Settings from resolve_profile()
+
+    Returns:
+        Tuple of (difficulty plan, council models)
+
+    Raises:
+        ValueError: If the settings name an unknown tier
+    """
+    difficulty = plan_council(user_query, settings.get("tier"))
+    for key in ("council_size", "thinking_budget", "stage2", "debate_rounds"):
+        if settings.get(key) is not None:
+            difficulty[key] = settings[key]
+
+    if settings.get("models"):
+        council_models = list(settings["models"])
+    else:
+        council_models = size_council(select_council_models(), difficulty)
+    return difficulty, council_models
+
+
+def memoize_deliberation_stages(
+    user_query: str,
+    stage1_results: List[Dict[str, Any]],
+    stage2_results: List[Dict[str, Any]],
+    stage3_result: Dict[str, Any],
+    metadata: Dict[str, Any]
+):
+    """
+    Memoize a deliberation's Stage 2 and Stage 3 outputs by input hash.
+
+    Skipped stages and failed syntheses are not memoized.
+
+    Args:
+        user_query: The user's question
+        stage1_results: Stage 1 answers, in council order
+        stage2_results: Rankings from Stage 2
+        stage3_result: Final result
+        metadata: Deliberation metadata with the Stage 2 label mapping and aggregates
+    """
+    if stage2_results:
+        memoize_stage(stage2_input_hash(user_query, stage1_results), {
+            "stage2": stage2_results,
+            "label_to_model": metadata.get("label_to_model", {}),
+            "aggregate_rankings": metadata.get("aggregate_rankings", []),
+            "judge_weights": metadata.get("judge_weights", {})
+        })
+    if stage3_result.get("model") != "error" and not stage3_result.get("response", "").startswith("Error:"):
+        memoize_stage(
+            stage3_input_hash(user_query, stage1_results, stage2_results, stage3_result["model"]), stage3_result
+        )
+
+
+async def regenerate_council_stages(
+    user_query: str,
+    stage1_results: List[Dict[str, Any]],
+    stage2_results: List[Dict[str, Any]],
+    rerank: bool = False,
+    profile: Optional[str] = None
+) -> Tuple[List, Dict, Dict]:
+    """
+    Re-run Stage 3, or Stages 2 and 3, of a stored deliberation.
+
+    Stage 1 is taken as given, so no web search or Stage 1 calls are made;
+    regenerating the synthesis alone is a single chairman call.
+
+    Args:
+        user_query: The question the stored answer responded to
+        stage1_results: The stored Stage 1 answers, in council order
+        stage2_results: The stored rankings (ignored when rerank is True)
+        rerank: Also collect fresh Stage 2 rankings
+        profile: Council profile for the chairman, ranking mode and timeouts
+
+    Returns:
+        Tuple of (stage2_results, stage3_result, metadata)
+
+    Raises:
+        ValueError: If there are no Stage 1 answers or the profile is unknown
+    """
+    if not stage1_results:
+        raise ValueError("No Stage 1 answers to regenerate from")
+
+    settings = resolve_profile(profile)
+    chairman = settings["chairman"] or CHAIRMAN_MODEL
+    stage3_timeout = settings["stage3_timeout_s"] or 180.0
+    stage2_hash = stage2_input_hash(user_query, stage1_results)
+    timings = {}
+
+    if rerank:
+        stage_start = time.perf_counter()
+        stage2_results, label_to_model = await stage2_collect_rankings(
+            user_query, stage1_results,
+            ranking_mode=settings["ranking_mode"],
+            judges=select_judges(council_models=[result["model"] for result in stage1_results]),
+            deadline_s=settings["stage2_deadline_s"],
+            quorum=settings["quorum"]
+        )
+        judge_weights = judge_reliability_weights(stage2_results, label_to_model)
+        aggregate_rankings = calculate_aggregate_rankings(stage2_results, label_to_model, judge_weights)
+        timings["stage2_s"] = round(time.perf_counter() - stage_start, 2)
+        stage2_source = "rerun"
+    else:
+        memo = await asyncio.to_thread(recall_stage, stage2_hash)
+        if memo is not None and memo["stage2"] == stage2_results:
+            label_to_model = memo["label_to_model"]
+            aggregate_rankings = memo["aggregate_rankings"]
+            judge_weights = memo["judge_weights"]
+            stage2_source = "memo"
+        else:
+            # Not memoized (older message or expired): rebuild the Stage 2 details from the rankings
+            label_to_model = {
+                f"Response {make_label(i)}": result["model"] for i, result in enumerate(stage1_results)
+            }
+            judge_weights = judge_reliability_weights(stage2_results, label_to_model) if stage2_results else {}
+            aggregate_rankings = (
+                calculate_aggregate_rankings(stage2_results, label_to_model, judge_weights) if stage2_results else []
+            )
+            stage2_source = "stored"
+
+    stage_start = time.perf_counter()
+    stage3_result = await stage3_synthesize_final(
+        user_query, stage1_results, stage2_results, chairman=chairman, timeout=stage3_timeout
+    )
+    timings["stage3_s"] = round(time.perf_counter() - stage_start, 2)
+    logger.info(f"Regenerated {'Stages 2-3' if rerank else 'Stage 3'} ({stage2_source} rankings): {timings}")
+
+    metadata = {
+        "label_to_model": label_to_model,
+        "aggregate_rankings": aggregate_rankings,
+        "judge_weights": judge_weights,
+        "profile": settings,
+        "timings": timings,
+        "regenerated": {
+            "from_stage": 2 if rerank else 3,
+            "stage2_source": stage2_source,
+            "stage2_input_hash": stage2_hash,
+            "stage3_input_hash": stage3_input_hash(user_query, stage1_results, stage2_results, chairman)
+        }
+    }
+    await asyncio.to_thread(
+        memoize_deliberation_stages, user_query, stage1_results, stage2_results, stage3_result, metadata
+    )
+    return stage2_results, stage3_result, metadata
+
+
 async def run_full_council(
     user_query: str,
-    conversation_history: List[Dict[str, str]] = None
+    conversation_history: List[Dict[str, str]] = None,
+    tier: Optional[str] = None,
+    debate_rounds: Optional[int] = None,
+    profile: Optional[str] = None,
+    overrides: Optional[Dict[str, Any]] = None,
+    use_cache: bool = True,
+    prefetch_audio: bool = False
 ) -> Tuple[List, List, Dict, Dict]:
     """
     Run the complete 3-stage council process.
@@ -425,46 +1343,263 @@ async def run_full_council(
     Args:
         user_query: The user's question
         conversation_history: Optional list of previous messages for multi-turn context
+        tier: Optional difficulty tier override (see plan_council)
+        debate_rounds: Optional maximum debate rounds after Stage 1 (defaults to the tier's)
+        profile: Council profile name (defaults to DEFAULT_COUNCIL_PROFILE)
+        overrides: Per-request settings that take precedence over the profile
+            (see PROFILE_FIELDS)
+        use_cache: Serve an identical (or, for standalone questions, similar) earlier
+            deliberation from the result caches (False forces a fresh run, which
+            then refreshes them)
+        prefetch_audio: The answer is likely to be played; synthesize its speech
+            in the background when TTS_PREFETCH is on
 
     Returns:
-        Tuple of (stage1_results, stage2_results, stage3_result, metadata)
+        Tuple of (stage1_results, stage2_results, stage3_result, metadata);
+        callers that attached to an identical in-flight deliberation get a
+        copy with metadata['singleflight']
+
+    Raises:
+        ValueError: If the profile, a setting, a model or the tier is unknown
+    """
+    settings = resolve_profile(profile, {**(overrides or {}), "tier": tier, "debate_rounds": debate_rounds})
+
+    # Identical concurrent requests share one in-flight deliberation
+    request_key = council_request_key(user_query, conversation_history, settings, use_cache)
+    result, leader = await council_flight.do(
+        request_key, lambda: _deliberate(user_query, conversation_history, settings, use_cache)
+    )
+    if prefetch_audio:
+        schedule_speech_prefetch(result[2].get("response", ""))
+    if leader:
+        return result
+
+    stage1_results, stage2_results, stage3_result, metadata = copy.deepcopy(result)
+    metadata["singleflight"] = {"coalesced": True, "key": request_key}
+    return stage1_results, stage2_results, stage3_result, metadata
+
+
+async def _deliberate(
+    user_query: str,
+    conversation_history: Optional[List[Dict[str, str]]],
+    settings: Dict[str, Any],
+    use_cache: bool
+) -> Tuple[List, List, Dict, Dict]:
+    """Run one council deliberation with resolved settings (see run_full_council)."""
+    result = None
+    async for event in council_events(user_query, conversation_history, settings, use_cache):
+        if event["type"] == "council_complete":
+            result = event["result"]
+    return result
+
+
+def _completed_events(result: Tuple[List, List, Dict, Dict]) -> List[Dict[str, Any]]:
+    """Stage events for a deliberation that is already complete (a cache hit)."""
+    stage1_results, stage2_results, stage3_result, metadata = result
+    return [
+        {"type": "stage1_complete", "data": stage1_results},
+        {"type": "stage2_complete", "data": stage2_results, "metadata": metadata},
+        {"type": "stage3_complete", "data": stage3_result},
+        {"type": "council_complete", "result": result}
+    ]
+
+
+async def council_events(
+    user_query: str,
+    conversation_history: Optional[List[Dict[str, str]]],
+    settings: Dict[str, Any],
+    use_cache: bool = True
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Run one council deliberation with resolved settings, yielding stage events.
+
+    This is the single stage sequence behind run_full_council and the
+    streaming endpoint. Events have a 'type' of "stage1_start",
+    "stage1_complete", the debate events of run_debate, "stage2_start",
+    "stage2_complete", "stage3_start", "stage3_complete" and, last,
+    "council_complete" whose 'result' is the (stage1_results, stage2_results,
+    stage3_result, metadata) tuple. Answers served from the result caches
+    yield only the *_complete events.
+
+    Args:
+        user_query: The user's question
+        conversation_history: Optional list of previous messages for multi-turn context
+        settings: Settings from resolve_profile()
+        use_cache: Serve an identical (or similar) earlier deliberation from the result caches
+
+    Yields:
+        Stage event dicts
     """
     logger.info(f"=== Council session starting ===")
     logger.info(f"Query: {user_query[:100]}{'...' if len(user_query) > 100 else ''}")
-    logger.info(f"Provider: {API_PROVIDER}, Models: {len(COUNCIL_MODELS)}, Chairman: {CHAIRMAN_MODEL}")
+    start = time.perf_counter()
+    timings = {}
+
+    # Size the council, thinking budget and Stage 2 to the profile and the question's difficulty
+    difficulty, council_models = plan_deliberation(user_query, settings)
+    chairman = settings["chairman"] or CHAIRMAN_MODEL
+    stage3_timeout = settings["stage3_timeout_s"] or 180.0
+    logger.info(
+        f"Provider: {API_PROVIDER}, Profile: {settings['profile']}, "
+        f"Models: {len(council_models)}, Chairman: {chairman}"
+    )
 
-    # Perform web search for real-time information
-    web_context = await perform_web_search(user_query)
+    # Answer a paraphrase of a recent standalone question from the archive
+    if use_cache and not conversation_history:
+        cached = await asyncio.to_thread(lookup_similar, user_query, settings)
+        if cached is not None:
+            for event in _completed_events(cached):
+                yield event
+            return
+
+    # Perform web search for real-time information, unless the question does not need it
+    search_decision = decide_web_search(user_query, settings["web_search"])
+    web_context = await perform_web_search(user_query, search_decision["search"])
+    search_decision["used"] = web_context is not None
+
+    # Serve an identical earlier deliberation from the result cache
+    cache_key = council_cache_key(
+        user_query, council_models, chairman, conversation_history, web_context, settings
+    )
+    cache_ttl_s = cache_ttl(settings)
+    if use_cache:
+        cached = await asyncio.to_thread(lookup_result, cache_key, cache_ttl_s)
+        if cached is not None:
+            for event in _completed_events(cached):
+                yield event
+            return
 
     # Stage 1: Collect individual responses (with history and web context)
-    stage1_results = await stage1_collect_responses(user_query, conversation_history, web_context)
+    yield {"type": "stage1_start"}
+    stage_start = time.perf_counter()
+    stage1_results = await stage1_collect_responses(
+        user_query, conversation_history, web_context,
+        models=council_models,
+        thinking_budget=difficulty["thinking_budget"],
+        max_tokens=settings["max_tokens"],
+        deadline_s=settings["stage1_deadline_s"],
+        quorum=settings["quorum"]
+    )
+    timings["stage1_s"] = round(time.perf_counter() - stage_start, 2)
+    yield {"type": "stage1_complete", "data": stage1_results}
 
     # If no models responded successfully, return error
     if not stage1_results:
         logger.error("All models failed to respond in Stage 1!")
-        return [], [], {
+        stage3_result = {
             "model": "error",
             "response": "All models failed to respond. Please try again."
-        }, {}
-
-    # Stage 2: Collect rankings
-    stage2_results, label_to_model = await stage2_collect_rankings(user_query, stage1_results)
-
-    # Calculate aggregate rankings
-    aggregate_rankings = calculate_aggregate_rankings(stage2_results, label_to_model)
-
-    # Stage 3: Synthesize final answer
-    stage3_result = await stage3_synthesize_final(
-        user_query,
-        stage1_results,
-        stage2_results
+        }
+        yield {"type": "stage2_complete", "data": [], "metadata": {}}
+        yield {"type": "stage3_complete", "data": stage3_result}
+        yield {"type": "council_complete", "result": ([], [], stage3_result, {})}
+        return
+
+    # Optional debate: members revise after reading each other until they converge
+    debate = None
+    if difficulty["debate_rounds"] > 0:
+        stage_start = time.perf_counter()
+        async for event in run_debate(
+            user_query, stage1_results, difficulty["debate_rounds"],
+            thinking_budget=difficulty["thinking_budget"], max_tokens=settings["max_tokens"],
+            base_messages=build_stage1_messages(user_query, conversation_history, web_context)
+        ):
+            if event["type"] == "debate_complete":
+                stage1_results, debate = event["data"], event["debate"]
+            yield event
+        timings["debate_s"] = round(time.perf_counter() - stage_start, 2)
+
+    # Skip Stage 2 when the Stage 1 answers already agree or the tier does not need it
+    consensus = check_stage1_consensus(stage1_results)
+
+    judge_weights = {}
+    draft_task = None
+    try:
+        if consensus["skip_stage2"] or not difficulty["stage2"]:
+            logger.info(
+                f"Skipping Stage 2 (tier {difficulty['tier']}, min similarity {consensus.get('min_similarity')})"
+            )
+            stage2_results, label_to_model, aggregate_rankings = [], {}, []
+        else:
+            # Let the chairman draft from Stage 1 while Stage 2 runs
+            draft_task = start_speculative_draft(
+                user_query, stage1_results, consensus, chairman=chairman, timeout=stage3_timeout
+            )
+
+            # Stage 2: Collect rankings
+            yield {"type": "stage2_start"}
+            stage_start = time.perf_counter()
+            stage2_results, label_to_model = await stage2_collect_rankings(
+                user_query, stage1_results,
+                ranking_mode=settings["ranking_mode"],
+                judges=select_judges(council_models=council_models),
+                deadline_s=settings["stage2_deadline_s"],
+                quorum=settings["quorum"]
+            )
+
+            # Calculate aggregate rankings, weighted by judge reliability
+            judge_weights = judge_reliability_weights(stage2_results, label_to_model)
+            aggregate_rankings = calculate_aggregate_rankings(stage2_results, label_to_model, judge_weights)
+            timings["stage2_s"] = round(time.perf_counter() - stage_start, 2)
+
+        metadata = {
+            "label_to_model": label_to_model,
+            "aggregate_rankings": aggregate_rankings,
+            "judge_weights": judge_weights,
+            "consensus": consensus,
+            "difficulty": difficulty,
+            "profile": settings,
+            "web_search": search_decision
+        }
+        yield {"type": "stage2_complete", "data": stage2_results, "metadata": dict(metadata)}
+
+        yield {"type": "stage3_start"}
+        stage_start = time.perf_counter()
+        if consensus["action"] == "answer":
+            stage3_result = select_consensus_answer(stage1_results, consensus)
+        elif draft_task is not None:
+            stage3_result = await finish_speculative_draft(
+                user_query, draft_task, stage1_results, aggregate_rankings, timings["stage2_s"],
+                timeout=stage3_timeout
+            )
+        else:
+            # Stage 3: Synthesize final answer
+            stage3_result = await stage3_synthesize_final(
+                user_query,
+                stage1_results,
+                stage2_results,
+                chairman=chairman,
+                timeout=stage3_timeout
+            )
+    finally:
+        # A draft still pending here will never be used (Stage 2 failed or the stream was closed)
+        cancel_speculative_draft(draft_task)
+
+    timings["stage3_s"] = round(time.perf_counter() - stage_start, 2)
+    timings["total_s"] = round(time.perf_counter() - start, 2)
+    logger.info(f"Council timings ({difficulty['tier']} tier): {timings}")
+    yield {"type": "stage3_complete", "data": stage3_result}
+
+    # Complete the metadata
+    metadata.update({
+        "model_latency": {result["model"]: result.get("latency_s") for result in stage1_results},
+        "history_messages": len(conversation_history or []),
+        "timings": timings
+    })
+    if stage3_result.get("compaction"):
+        metadata["compaction"] = stage3_result["compaction"]
+    if stage3_result.get("speculation"):
+        metadata["speculation"] = stage3_result["speculation"]
+    if debate:
+        metadata["debate"] = debate
+
+    # Keep Stage 2 and Stage 3 so the answer can be regenerated from its Stage 1
+    await asyncio.to_thread(
+        memoize_deliberation_stages, user_query, stage1_results, stage2_results, stage3_result, metadata
     )
 
-    # Prepare metadata
-    metadata = {
-        "label_to_model": label_to_model,
-        "aggregate_rankings": aggregate_rankings
-    }
+    # Let the council selection policy learn from this deliberation
+    record_deliberation(metadata)
 
     # Save deliberation to archive
     try:
@@ -481,5 +1616,11 @@ async def run_full_council(
     except Exception as e:
         logger.error(f"Failed to save deliberation: {e}", exc_info=True)
 
+    await asyncio.to_thread(
+        store_result, cache_key, cache_ttl_s, stage1_results, stage2_results, stage3_result, metadata
+    )
+    if not conversation_history:
+        await asyncio.to_thread(remember_deliberation, user_query, metadata)
+
     logger.info(f"=== Council session complete ===")
-    return stage1_results, stage2_results, stage3_result, metadata
+    yield {"type": "council_complete", "result": (stage1_results, stage2_results, stage3_result, metadata)}
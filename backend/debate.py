@@ -0,0 +1,206 @@
+"""Multi-round debate mode for LLM Council.
+
+After Stage 1, each council member sees the other members' answers and
+revises its own, for up to DEBATE_MAX_ROUNDS rounds. Rounds stop as soon as
+the answers converge (mean pairwise TF-IDF similarity reaches the threshold)
+or stop getting closer, and members whose answer already sits close to the
+rest are carried forward without a model call, so extra rounds only pay for
+the members that still disagree.
+"""
+
+import time
+import logging
+from typing import List, Dict, Any, AsyncIterator, Optional
+
+import numpy as np
+
+from .config import (
+    DEBATE_MAX_ROUNDS, DEBATE_CONVERGENCE_THRESHOLD, DEBATE_MIN_GAIN, DEBATE_CONCURRENCY
+)
+from .concurrency import query_models_bounded
+from .similarity import text_similarity_matrix, summarize_similarity
+
+logger = logging.getLogger("llm_council.debate")
+
+# Longest excerpt of each peer answer shown in a revision prompt
+PEER_ANSWER_MAX_CHARS = 6000
+
+# Hard cap on rounds, whatever a request asks for
+DEBATE_ROUND_LIMIT = 5
+
+
+def build_revision_prompt(user_query: str, own_answer: str, peer_answers: List[str], round_number: int) -> str:
+    """
+    Build the prompt asking a member to revise its answer after reading its peers.
+
+    Args:
+        user_query: The question as sent in Stage 1 (with any web context)
+        own_answer: The member's current answer
+        peer_answers: The other members' current answers (anonymized)
+        round_number: 1-based debate round
+
+    Returns:
+        Prompt text
+    """
+    peers = "\n\n".join(
+        f"Council member {i}:\n{answer[:PEER_ANSWER_MAX_CHARS]}"
+        for i, answer in enumerate(peer_answers, start=1)
+    )
+    return f"""You are a member of an LLM Council debating a question (round {round_number}).
+
+Question: {user_query}
+
+Your current answer:
+{own_answer}
+
+Answers from the other council members:
+{peers}
+
+Consider the other answers carefully. Correct any mistakes in your answer, adopt points you find convincing, and keep your position where you still believe it is right. Reply with your complete revised answer only:"""
+
+
+def build_revision_messages(
+    base_messages: List[Dict[str, str]],
+    own_answer: str,
+    peer_answers: List[str],
+    round_number: int
+) -> List[Dict[str, str]]:
+    """
+    Replace the final user message with the revision prompt.
+
+    The prompt quotes the Stage 1 question as sent (with any web context), so
+    revisions see the same history and search results as the first answers.
+
+    Args:
+        base_messages: Stage 1 messages (history plus question)
+        own_answer: The member's current answer
+        peer_answers: The other members' current answers (anonymized)
+        round_number: 1-based debate round
+
+    Returns:
+        Messages for the revision call
+    """
+    prompt = build_revision_prompt(base_messages[-1]['content'], own_answer, peer_answers, round_number)
+    return base_messages[:-1] + [{"role": "user", "content": prompt}]
+
+
+def _similarity_report(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Pairwise similarity matrix and its summary for the current answers."""
+    matrix = text_similarity_matrix([r['response'] for r in results])
+    summary = summarize_similarity(matrix)
+    return {"matrix": matrix, "mean": round(summary["mean"], 3), "min": round(summary["min"], 3)}
+
+
+async def run_debate(
+    user_query: str,
+    stage1_results: List[Dict[str, Any]],
+    max_rounds: Optional[int] = None,
+    threshold: float = DEBATE_CONVERGENCE_THRESHOLD,
+    concurrency: int = DEBATE_CONCURRENCY,
+    thinking_budget: Optional[int] = None,
+    max_tokens: Optional[int] = None,
+    base_messages: Optional[List[Dict[str, str]]] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Run debate rounds, yielding progress events.
+
+    Events have a 'type' of "debate_round_start", "debate_round_complete" or,
+    last, "debate_complete" whose 'data' holds the final answers (same shape
+    as Stage 1 results) and whose 'debate' holds the report.
+
+    Args:
+        user_query: The original user query
+        stage1_results: Results from Stage 1
+        max_rounds: Maximum revision rounds (defaults to DEBATE_MAX_ROUNDS, capped at DEBATE_ROUND_LIMIT)
+        threshold: Mean pairwise similarity at which answers count as converged
+        concurrency: Maximum concurrent model requests
+        thinking_budget: Thinking budget for revisions, as in Stage 1 (None = provider default)
+        max_tokens: Optional cap on revised answer length, as in Stage 1
+        base_messages: Stage 1 messages (history and web context); defaults to the bare question
+
+    Yields:
+        Progress event dicts
+    """
+    max_rounds = min(DEBATE_MAX_ROUNDS if max_rounds is None else max_rounds, DEBATE_ROUND_LIMIT)
+    base_messages = base_messages or [{"role": "user", "content": user_query}]
+    results = [dict(r) for r in stage1_results]
+    similarity = _similarity_report(results)
+    rounds = []
+    stop_reason = "max_rounds"
+
+    query_kwargs = {"thinking_budget": thinking_budget}
+    if max_tokens:
+        query_kwargs["max_tokens"] = max_tokens
+
+    for round_number in range(1, max_rounds + 1):
+        if len(results) < 2:
+            stop_reason = "single_member"
+            break
+        if similarity["mean"] >= threshold:
+            stop_reason = "converged"
+            break
+
+        # Members already close to their peers on average keep their answer without a call
+        matrix = similarity["matrix"]
+        peer_mean = (matrix.sum(axis=1) - np.diag(matrix)) / (len(results) - 1)
+        revising = [i for i in range(len(results)) if peer_mean[i] < threshold]
+
+        yield {"type": "debate_round_start", "round": round_number, "revising": [results[i]['model'] for i in revising]}
+        start = time.perf_counter()
+
+        requests = []
+        for i in revising:
+            peers = [r['response'] for k, r in enumerate(results) if k != i]
+            messages = build_revision_messages(base_messages, results[i]['response'], peers, round_number)
+            requests.append((results[i]['model'], messages))
+
+        responses = await query_models_bounded(requests, concurrency, **query_kwargs)
+
+        revised = 0
+        for i, response in zip(revising, responses):
+            if response is not None and response.get('content'):
+                results[i] = {
+                    **results[i],
+                    "response": response['content'],
+                    "round": round_number,
+                    "revision_latency_s": response.get('latency_s')
+                }
+                revised += 1
+            else:
+                logger.warning(f"Debate: {results[i]['model']} failed to revise in round {round_number}")
+
+        previous_mean = similarity["mean"]
+        similarity = _similarity_report(results)
+        round_report = {
+            "round": round_number,
+            "revised": revised,
+            "skipped": len(results) - len(revising),
+            "mean_similarity": similarity["mean"],
+            "min_similarity": similarity["min"],
+            "duration_s": round(time.perf_counter() - start, 2)
+        }
+        rounds.append(round_report)
+        logger.info(
+            f"Debate round {round_number}: {revised} revised, mean similarity "
+            f"{previous_mean} -> {similarity['mean']}"
+        )
+        yield {"type": "debate_round_complete", "data": results, **round_report}
+
+        if similarity["mean"] >= threshold:
+            stop_reason = "converged"
+            break
+        if similarity["mean"] - previous_mean < DEBATE_MIN_GAIN:
+            # Answers are no longer moving toward each other; more rounds would not help
+            stop_reason = "stalled"
+            break
+
+    report = {
+        "rounds": rounds,
+        "rounds_run": len(rounds),
+        "max_rounds": max_rounds,
+        "stop_reason": stop_reason,
+        "threshold": threshold,
+        "final_mean_similarity": similarity["mean"]
+    }
+    logger.info(f"Debate complete: {len(rounds)}/{max_rounds} rounds ({stop_reason})")
+    yield {"type": "debate_complete", "data": results, "debate": report}
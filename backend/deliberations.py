@@ -8,7 +8,7 @@ import json
 import logging
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 import re
 
 logger = logging.getLogger("llm_council.deliberations")
@@ -101,6 +101,10 @@ def save_deliberation(
         "aggregate_rankings": metadata.get("aggregate_rankings", [])
     }
 
+    # Keep any additional council metadata (e.g. the consensus check)
+    for key, value in metadata.items():
+        metadata_content.setdefault(key, value)
+
     with open(delib_dir / "metadata.json", "w", encoding="utf-8") as f:
         json.dump(metadata_content, f, indent=2, ensure_ascii=False)
 
@@ -223,23 +227,36 @@ def list_deliberations(limit: Optional[int] = None) -> List[Dict[str, Any]]:
     return deliberations
 
 
-def get_deliberation(name_or_path: str) -> Optional[Dict[str, Any]]:
+def resolve_deliberation_dir(name_or_path: str) -> Optional[Path]:
     """
-    Get a specific deliberation by name or path.
+    Find a deliberation directory by name or path.
 
     Args:
         name_or_path: Directory name or full path
 
     Returns:
-        Dict with all deliberation data, or None if not found
+        The directory, or None if it does not exist
     """
     # Try as direct path first
     delib_dir = Path(name_or_path)
     if not delib_dir.exists():
         # Try as name within deliberations directory
         delib_dir = DELIBERATIONS_DIR / name_or_path
+    return delib_dir if delib_dir.exists() else None
 
-    if not delib_dir.exists():
+
+def get_deliberation(name_or_path: str) -> Optional[Dict[str, Any]]:
+    """
+    Get a specific deliberation by name or path.
+
+    Args:
+        name_or_path: Directory name or full path
+
+    Returns:
+        Dict with all deliberation data, or None if not found
+    """
+    delib_dir = resolve_deliberation_dir(name_or_path)
+    if delib_dir is None:
         logger.warning(f"Deliberation not found: {name_or_path}")
         return None
 
@@ -285,6 +302,88 @@ def get_deliberation(name_or_path: str) -> Optional[Dict[str, Any]]:
         return None
 
 
+def read_question(delib_dir: Path) -> Optional[str]:
+    """
+    Read the full question text of an archived deliberation.
+
+    Args:
+        delib_dir: Deliberation directory
+
+    Returns:
+        The question, or None if it cannot be read
+    """
+    try:
+        with open(delib_dir / "question.md", "r", encoding="utf-8") as f:
+            content = f.read()
+    except OSError:
+        return None
+
+    _, marker, question = content.partition("**Question:**\n\n")
+    if not marker:
+        return None
+    # Drop the web search context appended after the question
+    question = question.split("\n---\n\n**Web Search Context Provided:**", 1)[0]
+    return question.rstrip("\n")
+
+
+def load_deliberation_result(name_or_path: str) -> Optional[Tuple[List, List, Dict, Dict]]:
+    """
+    Rebuild a council result from an archived deliberation.
+
+    Args:
+        name_or_path: Directory name or full path
+
+    Returns:
+        Tuple of (stage1_results, stage2_results, stage3_result, metadata) in the
+        shapes run_full_council returns, or None if the archive is incomplete
+    """
+    delib_dir = Path(name_or_path)
+    if not delib_dir.exists():
+        delib_dir = DELIBERATIONS_DIR / name_or_path
+
+    try:
+        with open(delib_dir / "metadata.json", "r", encoding="utf-8") as f:
+            metadata = json.load(f)
+
+        stage1_results = []
+        for response_file in sorted((delib_dir / "stage1").glob("*.md")):
+            with open(response_file, "r", encoding="utf-8") as f:
+                heading, _, body = f.read().partition("\n\n**Stage 1 Response**\n\n")
+            stage1_results.append({
+                "model": heading.lstrip("# ").strip(),
+                "response": body.rstrip("\n"),
+                "latency_s": (metadata.get("model_latency") or {}).get(heading.lstrip("# ").strip())
+            })
+        # Restore the council's response order (Response A, B, ...)
+        label_to_model = metadata.get("label_to_model") or {}
+        order = list(label_to_model.values()) if label_to_model else list(metadata.get("model_latency") or {})
+        stage1_results.sort(key=lambda r: order.index(r["model"]) if r["model"] in order else len(order))
+
+        stage2_results = []
+        rankings_file = delib_dir / "stage2" / "rankings.json"
+        if rankings_file.exists():
+            with open(rankings_file, "r", encoding="utf-8") as f:
+                for ranking in json.load(f):
+                    stage2_results.append({
+                        "model": ranking["model"],
+                        "ranking": ranking["full_evaluation"],
+                        "parsed_ranking": ranking["ranking"]
+                    })
+
+        with open(delib_dir / "stage3" / "final-answer.md", "r", encoding="utf-8") as f:
+            _, _, answer = f.read().partition("---\n\n")
+        stage3_result = {"model": metadata.get("chairman", "unknown"), "response": answer.rstrip("\n")}
+    except (OSError, KeyError, json.JSONDecodeError) as e:
+        logger.error(f"Cannot rebuild deliberation {name_or_path}: {e}")
+        return None
+
+    if not stage1_results:
+        return None
+
+    metadata["deliberation_path"] = str(delib_dir)
+    return stage1_results, stage2_results, stage3_result, metadata
+
+
 def search_deliberations(query: str, limit: int = 10) -> List[Dict[str, Any]]:
     """
     Search deliberations by question content.
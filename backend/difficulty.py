@@ -0,0 +1,179 @@
+"""Difficulty-aware council sizing for LLM Council.
+
+A local heuristic classifier (no model calls, well under a millisecond) maps
+each question to a difficulty tier. The tier decides how many council members
+answer, their thinking budget and whether Stage 2 peer ranking runs, so a
+question like "what's 2+2" does not pay for a full deliberation.
+"""
+
+import re
+import time
+import logging
+from typing import List, Dict, Any, Optional
+
+from .config import DIFFICULTY_ROUTING, DIFFICULTY_TIERS
+
+logger = logging.getLogger("llm_council.difficulty")
+
+# Tiers from cheapest to most thorough
+TIER_ORDER = ("trivial", "simple", "moderate", "complex")
+
+ARITHMETIC_PATTERN = re.compile(
+    r"^\s*(what(?:'s| is)\s+|calculate\s+|compute\s+)?[\d\s.,+\-*/x×÷^()%=]+\??\s*$",
+    re.IGNORECASE
+)
+LOOKUP_PATTERN = re.compile(
+    r"^\s*(what(?:'s| is)|who(?:'s| is| was)|when (?:is|was|did)|where (?:is|are)|"
+    r"define|definition of|how many|how much|convert|translate|spell)\b",
+    re.IGNORECASE
+)
+# Short lookups only: a second clause ("... and how does it ...") makes it a real question
+LOOKUP_MAX_WORDS = 8
+MULTI_CLAUSE_PATTERN = re.compile(r"\b(?:and|or|but)\s+(?:how|why|what|when|where|which|who|does|do|is|are|can|should)\b", re.IGNORECASE)
+COMPLEX_PATTERN = re.compile(
+    r"\b(compare|comparison|trade-?offs?|pros and cons|strateg\w*|design|architect\w*|"
+    r"should (?:i|we)|evaluate|analy[sz]\w*|recommend\w*|plan\w*|why|implications?|"
+    r"best way|optimi[sz]\w*|versus|vs\.?|risks?|explain how|step by step)\b",
+    re.IGNORECASE
+)
+CODE_PATTERN = re.compile(r"```|\bdef |\bclass |\bfunction\b|Traceback|\bSELECT\b.+\bFROM\b")
+
+
+def classify_difficulty(question: str) -> Dict[str, Any]:
+    """
+    Classify a question into a difficulty tier with cheap lexical signals.
+
+    Args:
+        question: The user's question
+
+    Returns:
+        Dict with 'tier', 'score', the contributing 'signals' and 'classify_ms'
+    """
+    start = time.perf_counter()
+    words = len(question.split())
+    signals = {"words": words}
+
+    if ARITHMETIC_PATTERN.match(question) and any(ch.isdigit() for ch in question):
+        signals["arithmetic"] = True
+        tier, score = "trivial", -2
+    else:
+        score = 0
+        if MULTI_CLAUSE_PATTERN.search(question):
+            signals["multi_clause"] = True
+            score += 1
+        elif LOOKUP_PATTERN.match(question) and words <= LOOKUP_MAX_WORDS:
+            signals["lookup"] = True
+            score -= 1
+
+        complex_cues = {m.group(0).lower() for m in COMPLEX_PATTERN.finditer(question)}
+        if complex_cues:
+            signals["complex_cues"] = sorted(complex_cues)
+            score += min(3, len(complex_cues))
+
+        if CODE_PATTERN.search(question):
+            signals["code"] = True
+            score += 1
+
+        parts = question.count("?") + len(re.findall(r"^\s*(?:[-*•]|\d+[.)])\s", question, re.MULTILINE))
+        if parts > 1:
+            signals["parts"] = parts
+            score += 1
+
+        if words > 120:
+            score += 2
+        elif words > 40:
+            score += 1
+
+        if score <= -1 and words <= 12:
+            tier = "trivial"
+        elif score <= 0:
+            tier = "simple"
+        elif score <= 2:
+            tier = "moderate"
+        else:
+            tier = "complex"
+
+    return {
+        "tier": tier,
+        "score": score,
+        "signals": signals,
+        "classify_ms": round((time.perf_counter() - start) * 1000, 3)
+    }
+
+
+def plan_council(question: str, tier: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Decide the council configuration for a question.
+
+    Args:
+        question: The user's question
+        tier: Optional tier override ("trivial", "simple", "moderate", "complex")
+
+    Returns:
+        Dict with 'tier', 'source' ("override", "classifier" or "default"),
+        'council_size' (None = full council), 'thinking_budget' (None = provider
+        default, 0 = off), 'stage2' and the classifier output when it ran
+
+    Raises:
+        ValueError: If the tier override is unknown
+    """
+    if tier is not None:
+        tier = tier.lower()
+        if tier not in DIFFICULTY_TIERS:
+            raise ValueError(f"Unknown difficulty tier '{tier}', expected one of {list(DIFFICULTY_TIERS)}")
+        plan = {"tier": tier, "source": "override"}
+    elif DIFFICULTY_ROUTING == "on":
+        classification = classify_difficulty(question)
+        plan = {"source": "classifier", **classification}
+    else:
+        plan = {"tier": "complex", "source": "default"}
+
+    plan.update(DIFFICULTY_TIERS[plan["tier"]])
+    logger.info(
+        f"Difficulty: tier={plan['tier']} ({plan['source']}), council_size={plan['council_size'] or 'all'}, "
+        f"thinking_budget={plan['thinking_budget']}, stage2={plan['stage2']}"
+    )
+    return plan
+
+
+def size_council(models: List[str], plan: Dict[str, Any]) -> List[str]:
+    """
+    Trim the council to the tier's size, keeping the highest-priority members.
+
+    Args:
+        models: Council members in priority order
+        plan: Plan from plan_council()
+
+    Returns:
+        The members that answer this question
+    """
+    size = plan.get("council_size")
+    if not size:
+        return list(models)
+    return list(models[:max(1, size)])
+
+
+def tier_latency_stats(deliberations: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Average end-to-end latency per difficulty tier over archived deliberations.
+
+    Args:
+        deliberations: Archived deliberation metadata
+
+    Returns:
+        Dict mapping tier to deliberation count and mean total seconds
+    """
+    totals: Dict[str, List[float]] = {}
+    for metadata in deliberations:
+        tier = (metadata.get("difficulty") or {}).get("tier")
+        total_s = (metadata.get("timings") or {}).get("total_s")
+        if tier and total_s is not None:
+            totals.setdefault(tier, []).append(total_s)
+
+    return {
+        tier: {
+            "deliberations": len(totals[tier]),
+            "mean_total_s": round(sum(totals[tier]) / len(totals[tier]), 2)
+        }
+        for tier in TIER_ORDER if tier in totals
+    }
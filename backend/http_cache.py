@@ -0,0 +1,142 @@
+"""Conditional GET and compression for large JSON reads.
+
+Conversations and archived deliberations carry every Stage 1 answer and
+Stage 2 critique, and the frontend and API pollers fetch them repeatedly.
+Validators come from the storage state (file modification times and sizes),
+so an unchanged resource is answered with a bodyless 304 before it is even
+loaded; changed ones are sent brotli- or gzip-compressed when the client
+accepts it and the body is large enough to be worth it.
+
+Brotli is used when the optional `brotli` package is installed.
+"""
+
+import gzip
+import json
+import hashlib
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Iterable, Optional, Tuple
+
+from fastapi import Request, Response
+
+from .config import HTTP_COMPRESSION, HTTP_COMPRESSION_MIN_BYTES
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Clients may cache but must revalidate every time
+CACHE_CONTROL = "private, no-cache"
+
+
+def file_validators(paths: Iterable[Path]) -> Optional[Tuple[str, float]]:
+    """
+    ETag and Last-Modified time for a resource stored in files.
+
+    Args:
+        paths: Files (or directories, walked recursively) holding the resource
+
+    Returns:
+        Tuple of (weak ETag, newest modification time), or None if nothing exists
+    """
+    stats = []
+    for path in paths:
+        if path.is_dir():
+            stats.extend((str(f), f.stat()) for f in sorted(path.rglob("*")) if f.is_file())
+        elif path.exists():
+            stats.append((str(path), path.stat()))
+    if not stats:
+        return None
+
+    state = "|".join(f"{name}:{stat.st_mtime_ns}:{stat.st_size}" for name, stat in stats)
+    etag = 'W/"' + hashlib.sha256(state.encode("utf-8")).hexdigest()[:24] + '"'
+    return etag, max(stat.st_mtime for _, stat in stats)
+
+
+def _strip_weak(etag: str) -> str:
+    return etag.strip()[2:] if etag.strip().startswith("W/") else etag.strip()
+
+
+def is_not_modified(request: Request, etag: str, last_modified: float) -> bool:
+    """
+    Whether the client's cached copy is current.
+
+    If-None-Match takes precedence; If-Modified-Since is only consulted without it.
+
+    Args:
+        request: Incoming request
+        etag: Current ETag
+        last_modified: Current modification time (Unix seconds)
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        return _strip_weak(etag) in {_strip_weak(tag) for tag in if_none_match.split(",")}
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            # HTTP dates have one-second resolution
+            return int(last_modified) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def _accepted_encoding(request: Request) -> Optional[str]:
+    """Best supported encoding the client accepts (q=0 excluded)."""
+    accepted = {}
+    for part in request.headers.get("accept-encoding", "").split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        if coding:
+            accepted[coding.lower()] = quality
+    for coding in (["br"] if brotli is not None else []) + ["gzip"]:
+        if accepted.get(coding, accepted.get("*", 0.0)) > 0:
+            return coding
+    return None
+
+
+def not_modified_response(etag: str, last_modified: float) -> Response:
+    """Bodyless 304 carrying the current validators."""
+    return Response(status_code=304, headers={
+        "ETag": etag,
+        "Last-Modified": formatdate(last_modified, usegmt=True),
+        "Cache-Control": CACHE_CONTROL
+    })
+
+
+def json_response(request: Request, payload: Any, etag: str, last_modified: float) -> Response:
+    """
+    JSON response with validators, compressed when negotiated and worthwhile.
+
+    Args:
+        request: Incoming request (for Accept-Encoding)
+        payload: JSON-serializable body
+        etag: ETag from file_validators()
+        last_modified: Modification time from file_validators()
+
+    Returns:
+        The response
+    """
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(last_modified, usegmt=True),
+        "Cache-Control": CACHE_CONTROL,
+        "Vary": "Accept-Encoding"
+    }
+
+    encoding = _accepted_encoding(request) if HTTP_COMPRESSION == "on" else None
+    if encoding and len(body) >= HTTP_COMPRESSION_MIN_BYTES:
+        body = brotli.compress(body, quality=5) if encoding == "br" else gzip.compress(body, compresslevel=6)
+        headers["Content-Encoding"] = encoding
+
+    return Response(content=body, media_type="application/json", headers=headers)
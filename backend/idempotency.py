@@ -0,0 +1,184 @@
+"""Idempotency-Key support for the external API.
+
+Clients that time out and retry (the RSS analyzer, MCP hosts) would start a
+second council for the same question. A request carrying an Idempotency-Key
+header records an in-progress marker under that key, scoped to the caller's
+API key; the finished response replaces the marker for IDEMPOTENCY_TTL_S.
+A retry with the same key replays the stored response, or waits on the job
+still running in this process. Reusing a key for a different request body is
+rejected.
+
+While a job runs it refreshes its marker every IDEMPOTENCY_HEARTBEAT_S, so
+a council of any length keeps its key; only a marker left unrefreshed (the
+worker crashed) can be taken over by a retry.
+"""
+
+import time
+import asyncio
+import hashlib
+import logging
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+from .config import IDEMPOTENCY_DIR, IDEMPOTENCY_TTL_S, IDEMPOTENCY_MAX_ENTRIES, IDEMPOTENCY_HEARTBEAT_S
+from .result_cache import ResultCache, fingerprint
+
+logger = logging.getLogger("llm_council.idempotency")
+
+# An in-progress marker with no job in this process (another worker, or a
+# crash) is honoured for this long after its last refresh before a retry may
+# take the key over
+IN_PROGRESS_STALE_S = 3 * IDEMPOTENCY_HEARTBEAT_S
+
+
+class IdempotencyConflict(Exception):
+    """The key was used before with a different request body."""
+
+
+class IdempotencyInProgress(Exception):
+    """The key's job is running elsewhere; the client should retry later."""
+
+    def __init__(self, retry_after: int):
+        super().__init__("A request with this Idempotency-Key is still in progress")
+        self.retry_after = retry_after
+
+
+class IdempotencyStore:
+    """Records keyed requests and joins or replays them on retry."""
+
+    def __init__(self, directory: str = IDEMPOTENCY_DIR, ttl_s: float = IDEMPOTENCY_TTL_S):
+        # No memory tier: another worker may complete a key this process saw in progress
+        self.records = ResultCache(directory=directory, max_entries=IDEMPOTENCY_MAX_ENTRIES, memory=False)
+        self.ttl_s = ttl_s
+        self.running: Dict[str, asyncio.Task] = {}
+        self.started = 0
+        self.replayed = 0
+        self.joined = 0
+        self.conflicts = 0
+
+    async def _heartbeat(self, key: str, marker: Dict[str, Any], stop: asyncio.Event):
+        """
+        Refresh the in-progress marker so other workers keep treating the key as live.
+
+        Runs until stop is set. It is stopped rather than cancelled: cancelling
+        would not stop a write already in its thread, and that stale marker
+        could land after the job's final write.
+        """
+        while True:
+            try:
+                await asyncio.wait_for(stop.wait(), IDEMPOTENCY_HEARTBEAT_S)
+                return
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await asyncio.to_thread(self.records.put, key, marker, self.ttl_s)
+            except Exception as e:
+                logger.warning(f"Idempotent request {key[:12]}: heartbeat failed: {e}")
+
+    def _run(
+        self,
+        key: str,
+        marker: Dict[str, Any],
+        factory: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> asyncio.Task:
+        async def job():
+            stop = asyncio.Event()
+            heartbeat = asyncio.create_task(self._heartbeat(key, marker, stop))
+            try:
+                response = await factory()
+            except BaseException:
+                stop.set()
+                await heartbeat
+                # Failed (or cancelled) work is not remembered; a retry starts over
+                await asyncio.to_thread(self.records.invalidate, key)
+                raise
+            stop.set()
+            await heartbeat
+            await asyncio.to_thread(
+                self.records.put, key, {"status": "complete", "request": marker["request"], "response": response}, self.ttl_s
+            )
+            return response
+
+        task = asyncio.create_task(job())
+        self.running[key] = task
+        task.add_done_callback(lambda done, key=key: self._finished(key, done))
+        self.started += 1
+        return task
+
+    def _finished(self, key: str, task: asyncio.Task):
+        if self.running.get(key) is task:
+            del self.running[key]
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Idempotent request {key[:12]} failed: {task.exception()}")
+
+    async def do(
+        self,
+        scope: str,
+        idempotency_key: str,
+        request: Dict[str, Any],
+        factory: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Tuple[Dict[str, Any], bool]:
+        """
+        Run factory() at most once per (scope, idempotency_key) within the retention window.
+
+        Args:
+            scope: Caller identity (the API key hash), so keys cannot collide across clients
+            idempotency_key: Client-supplied Idempotency-Key header
+            request: JSON-serializable request body, compared on retries
+            factory: Produces the JSON-serializable response; only called for new keys
+
+        Returns:
+            Tuple of (response, True if it was replayed or joined rather than started)
+
+        Raises:
+            IdempotencyConflict: The key was used with a different request body
+            IdempotencyInProgress: The key's job is running in another process
+            Whatever factory() raised, in every caller waiting on it
+        """
+        key = hashlib.sha256(f"{scope}:{idempotency_key}".encode("utf-8")).hexdigest()
+        request_hash = fingerprint(request)
+
+        entry = await asyncio.to_thread(self.records.get, key, self.ttl_s)
+        if entry is not None and entry["result"]["request"] != request_hash:
+            self.conflicts += 1
+            raise IdempotencyConflict("Idempotency-Key was already used with a different request body")
+
+        task = self.running.get(key)
+        if task is not None:
+            self.joined += 1
+            logger.info(f"Idempotent request {key[:12]} joined the running job")
+        elif entry is not None and entry["result"]["status"] == "complete":
+            self.replayed += 1
+            logger.info(f"Idempotent request {key[:12]} replayed")
+            return entry["result"]["response"], True
+        elif entry is not None and time.time() - entry["created_at"] < IN_PROGRESS_STALE_S:
+            raise IdempotencyInProgress(int(IN_PROGRESS_STALE_S - (time.time() - entry["created_at"])) + 1)
+        else:
+            marker = {"status": "in_progress", "request": request_hash}
+            if entry is None:
+                # Claim the key atomically; another worker may have claimed it since the lookup
+                _, created = await asyncio.to_thread(self.records.get_or_put, key, marker, self.ttl_s)
+                if not created:
+                    return await self.do(scope, idempotency_key, request, factory)
+            else:
+                # Take over a stale marker
+                await asyncio.to_thread(self.records.put, key, marker, self.ttl_s)
+            task = self._run(key, marker, factory)
+            # Shield so a client disconnect does not cancel the job a retry will join
+            return await asyncio.shield(task), False
+
+        return await asyncio.shield(task), True
+
+    def stats(self) -> Dict[str, Any]:
+        """Started, replayed, joined and conflicting requests since startup."""
+        return {
+            "retention_s": self.ttl_s,
+            "in_progress": len(self.running),
+            "started": self.started,
+            "replayed": self.replayed,
+            "joined": self.joined,
+            "conflicts": self.conflicts
+        }
+
+
+# Keyed /council/ask requests
+council_requests = IdempotencyStore()
@@ -1,12 +1,13 @@
 """FastAPI backend for LLM Council."""
 
 import logging
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Header, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import StreamingResponse, FileResponse
 from pydantic import BaseModel
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 import uuid
+from pathlib import Path
 import json
 import asyncio
 
@@ -19,8 +20,16 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 from . import storage
-from .council import run_full_council, generate_conversation_title, stage1_collect_responses, stage2_collect_rankings, stage3_synthesize_final, calculate_aggregate_rankings, perform_web_search
+from .council import run_full_council, council_events, regenerate_council_stages
+from .profiles import resolve_profile
+from .result_cache import bypasses_cache
+from .titles import title_conversation, upgrade_title, schedule_title_upgrade
+from .moa import run_mixture_of_agents, mixture_of_agents_events
 from .polly import synthesize_speech
+from .tts_cache import cached_speech, schedule_speech_prefetch
+from .memory import build_memory_context, schedule_memory_update
+from .config import MEMORY_RECENT_TURNS, DIFFICULTY_TIERS, COUNCIL_MODES, TITLE_GENERATION, TTS_CACHE, POLLY_ENGINE
+from .http_cache import file_validators, is_not_modified, not_modified_response, json_response
 from .api import api_app
 
 app = FastAPI(title="LLM Council Web UI")
@@ -47,6 +56,20 @@ class CreateConversationRequest(BaseModel):
 class SendMessageRequest(BaseModel):
     """Request to send a message in a conversation."""
     content: str
+    tier: Optional[str] = None  # Difficulty tier override (trivial, simple, moderate, complex)
+    debate_rounds: Optional[int] = None  # Maximum debate rounds after Stage 1 (0 disables)
+    mode: str = "council"  # "council" (3 stages) or "moa" (layered mixture-of-agents)
+    profile: Optional[str] = None  # Council profile (fast, balanced, deep)
+
+
+def resolve_request_settings(request: SendMessageRequest) -> Dict[str, Any]:
+    """Resolve the request's council profile, turning bad input into a 400."""
+    if request.mode == "moa" and (request.tier or request.debate_rounds is not None):
+        raise HTTPException(status_code=400, detail="tier and debate_rounds do not apply to mode 'moa'")
+    try:
+        return resolve_profile(request.profile, {"tier": request.tier, "debate_rounds": request.debate_rounds})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 class ConversationMetadata(BaseModel):
@@ -57,37 +80,21 @@ class ConversationMetadata(BaseModel):
     message_count: int
 
 
-def build_conversation_context(conversation: dict, max_turns: int = 3) -> List[Dict[str, str]]:
+def build_conversation_context(conversation: dict, max_turns: int = MEMORY_RECENT_TURNS) -> List[Dict[str, str]]:
     """
     Build message history from previous turns for multi-turn context.
 
+    Older turns are represented by the conversation's rolling summary and the
+    most recent ones are included verbatim, within MEMORY_TOKEN_BUDGET.
+
     Args:
         conversation: The conversation dict with messages
-        max_turns: Maximum number of previous turns to include
+        max_turns: Number of most recent turns to include verbatim
 
     Returns:
         List of message dicts with role and content
     """
-    context = []
-    messages = conversation.get("messages", [])
-
-    # Get last N turns (user + assistant pairs)
-    # Each turn = 2 messages, so get last max_turns * 2 messages
-    recent_messages = messages[-(max_turns * 2):]
-
-    for msg in recent_messages:
-        if msg["role"] == "user":
-            context.append({"role": "user", "content": msg["content"]})
-        elif msg["role"] == "assistant" and msg.get("stage3"):
-            # Include the final council response as assistant context
-            stage3_response = msg["stage3"].get("response", "")
-            if stage3_response:
-                context.append({
-                    "role": "assistant",
-                    "content": stage3_response
-                })
-
-    return context
+    return build_memory_context(conversation, recent_turns=max_turns)
 
 
 class Conversation(BaseModel):
@@ -119,44 +126,78 @@ async def create_conversation(request: CreateConversationRequest):
 
 
 @app.get("/api/conversations/{conversation_id}", response_model=Conversation)
-async def get_conversation(conversation_id: str):
-    """Get a specific conversation with all its messages."""
+async def get_conversation(conversation_id: str, request: Request):
+    """
+    Get a specific conversation with all its messages.
+    Sends ETag and Last-Modified, answers a matching If-None-Match (or
+    If-Modified-Since) with 304, and compresses large bodies.
+    """
+    validators = file_validators([Path(storage.get_conversation_path(conversation_id))])
+    if validators is not None and is_not_modified(request, *validators):
+        return not_modified_response(*validators)
+
     conversation = storage.get_conversation(conversation_id)
     if conversation is None:
         raise HTTPException(status_code=404, detail="Conversation not found")
-    return conversation
+    return json_response(request, Conversation(**conversation).model_dump(), *validators)
 
 
 @app.post("/api/conversations/{conversation_id}/message")
-async def send_message(conversation_id: str, request: SendMessageRequest):
+async def send_message(
+    conversation_id: str,
+    request: SendMessageRequest,
+    cache_control: Optional[str] = Header(None)
+):
     """
     Send a message and run the 3-stage council process.
     Returns the complete response with all stages.
+    A "Cache-Control: no-cache" header skips the result cache lookup.
     """
     # Check if conversation exists
     conversation = storage.get_conversation(conversation_id)
     if conversation is None:
         raise HTTPException(status_code=404, detail="Conversation not found")
 
+    if request.tier and request.tier.lower() not in DIFFICULTY_TIERS:
+        raise HTTPException(status_code=400, detail=f"Unknown tier. Expected one of: {', '.join(DIFFICULTY_TIERS)}")
+    if request.mode not in COUNCIL_MODES:
+        raise HTTPException(status_code=400, detail=f"Unknown mode. Expected one of: {', '.join(COUNCIL_MODES)}")
+    settings = resolve_request_settings(request)
+
     # Check if this is the first message
     is_first_message = len(conversation["messages"]) == 0
 
     # Build conversation context from previous turns (before adding new message)
-    conversation_history = build_conversation_context(conversation, max_turns=3)
+    conversation_history = build_conversation_context(conversation)
 
     # Add user message
     storage.add_user_message(conversation_id, request.content)
 
-    # If this is the first message, generate a title
+    # If this is the first message, title it locally and refine the title in the background
     if is_first_message:
-        title = await generate_conversation_title(request.content)
-        storage.update_conversation_title(conversation_id, title)
-
-    # Run the 3-stage council process with conversation history
-    stage1_results, stage2_results, stage3_result, metadata = await run_full_council(
-        request.content,
-        conversation_history=conversation_history if conversation_history else None
-    )
+        await title_conversation(conversation_id, request.content)
+        schedule_title_upgrade(conversation_id, request.content)
+
+    # Run the council process with conversation history
+    if request.mode == "moa":
+        stage1_results, stage2_results, stage3_result, metadata = await run_mixture_of_agents(
+            request.content,
+            conversation_history=conversation_history if conversation_history else None,
+            settings=settings
+        )
+    else:
+        stage1_results, stage2_results, stage3_result, metadata = await run_full_council(
+            request.content,
+            conversation_history=conversation_history if conversation_history else None,
+            tier=request.tier,
+            debate_rounds=request.debate_rounds,
+            profile=request.profile,
+            use_cache=not bypasses_cache(cache_control),
+            prefetch_audio=True
+        )
+
+    if request.mode == "moa":
+        schedule_speech_prefetch(stage3_result.get("response", ""))
 
     # Add assistant message with all stages
     storage.add_assistant_message(
@@ -166,6 +207,9 @@ async def send_message(conversation_id: str, request: SendMessageRequest):
         stage3_result
     )
 
+    # Fold older turns into the rolling summary in the background
+    schedule_memory_update(conversation_id)
+
     # Return the complete response with metadata
     return {
         "stage1": stage1_results,
@@ -176,21 +220,33 @@ async def send_message(conversation_id: str, request: SendMessageRequest):
 
 
 @app.post("/api/conversations/{conversation_id}/message/stream")
-async def send_message_stream(conversation_id: str, request: SendMessageRequest):
+async def send_message_stream(
+    conversation_id: str,
+    request: SendMessageRequest,
+    cache_control: Optional[str] = Header(None)
+):
     """
     Send a message and stream the 3-stage council process.
     Returns Server-Sent Events as each stage completes.
+    A "Cache-Control: no-cache" header skips the result cache lookup.
     """
     # Check if conversation exists
     conversation = storage.get_conversation(conversation_id)
     if conversation is None:
         raise HTTPException(status_code=404, detail="Conversation not found")
 
+    if request.tier and request.tier.lower() not in DIFFICULTY_TIERS:
+        raise HTTPException(status_code=400, detail=f"Unknown tier. Expected one of: {', '.join(DIFFICULTY_TIERS)}")
+    if request.mode not in COUNCIL_MODES:
+        raise HTTPException(status_code=400, detail=f"Unknown mode. Expected one of: {', '.join(COUNCIL_MODES)}")
+    settings = resolve_request_settings(request)
+    use_cache = not bypasses_cache(cache_control)
+
     # Check if this is the first message
     is_first_message = len(conversation["messages"]) == 0
 
     # Build conversation context from previous turns (before adding new message)
-    conversation_history = build_conversation_context(conversation, max_turns=3)
+    conversation_history = build_conversation_context(conversation)
 
     async def event_generator():
         try:
@@ -199,50 +255,42 @@ async def send_message_stream(conversation_id: str, request: SendMessageRequest)
             # Add user message
             storage.add_user_message(conversation_id, request.content)
 
-            # Start title generation in parallel (don't await yet)
+            # Title the conversation at once; a model title (llm or hybrid mode) runs in parallel
             title_task = None
             if is_first_message:
-                title_task = asyncio.create_task(generate_conversation_title(request.content))
-
-            # Perform web search for real-time information
-            logger.info("Stream: Performing web search...")
-            web_context = await perform_web_search(request.content)
-            if web_context:
-                logger.info(f"Stream: Web search returned {len(web_context)} chars")
+                if TITLE_GENERATION == "llm":
+                    title_task = asyncio.create_task(title_conversation(conversation_id, request.content))
+                else:
+                    title = await title_conversation(conversation_id, request.content)
+                    yield f"data: {json.dumps({'type': 'title_complete', 'data': {'title': title}})}\n\n"
+                    if TITLE_GENERATION == "hybrid":
+                        title_task = asyncio.create_task(upgrade_title(conversation_id, request.content))
+
+            # Both modes yield the same stage events; the last one carries the full result
+            if request.mode == "moa":
+                # Mixture-of-agents: layers stand in for Stage 1, the aggregator for Stage 3
+                events = mixture_of_agents_events(
+                    request.content, conversation_history if conversation_history else None, settings=settings
+                )
             else:
-                logger.info("Stream: Web search returned None")
-
-            # Stage 1: Collect responses (with conversation history and web context)
-            logger.info("Stream: Starting Stage 1...")
-            yield f"data: {json.dumps({'type': 'stage1_start'})}\n\n"
-            stage1_results = await stage1_collect_responses(
-                request.content,
-                conversation_history if conversation_history else None,
-                web_context
-            )
-            logger.info(f"Stream: Stage 1 complete - {len(stage1_results)} models responded")
-            yield f"data: {json.dumps({'type': 'stage1_complete', 'data': stage1_results})}\n\n"
-
-            # Stage 2: Collect rankings
-            logger.info("Stream: Starting Stage 2...")
-            yield f"data: {json.dumps({'type': 'stage2_start'})}\n\n"
-            stage2_results, label_to_model = await stage2_collect_rankings(request.content, stage1_results)
-            aggregate_rankings = calculate_aggregate_rankings(stage2_results, label_to_model)
-            logger.info(f"Stream: Stage 2 complete - {len(stage2_results)} rankings collected")
-            yield f"data: {json.dumps({'type': 'stage2_complete', 'data': stage2_results, 'metadata': {'label_to_model': label_to_model, 'aggregate_rankings': aggregate_rankings}})}\n\n"
-
-            # Stage 3: Synthesize final answer
-            logger.info("Stream: Starting Stage 3...")
-            yield f"data: {json.dumps({'type': 'stage3_start'})}\n\n"
-            stage3_result = await stage3_synthesize_final(request.content, stage1_results, stage2_results)
-            logger.info(f"Stream: Stage 3 complete - Chairman: {stage3_result.get('model', 'unknown')}")
-            yield f"data: {json.dumps({'type': 'stage3_complete', 'data': stage3_result})}\n\n"
-
-            # Wait for title generation if it was started
+                events = council_events(
+                    request.content, conversation_history if conversation_history else None, settings, use_cache
+                )
+            async for event in events:
+                if event["type"] == "council_complete":
+                    stage1_results, stage2_results, stage3_result, metadata = event["result"]
+                else:
+                    yield f"data: {json.dumps(event)}\n\n"
+            logger.info(f"Stream: Council complete - Chairman: {stage3_result.get('model', 'unknown')}")
+
+            # Start synthesizing the answer's speech so play is instant
+            schedule_speech_prefetch(stage3_result.get("response", ""))
+
+            # Wait for the model title if it was started (None = keep the local title)
             if title_task:
                 title = await title_task
-                storage.update_conversation_title(conversation_id, title)
-                yield f"data: {json.dumps({'type': 'title_complete', 'data': {'title': title}})}\n\n"
+                if title:
+                    yield f"data: {json.dumps({'type': 'title_complete', 'data': {'title': title}})}\n\n"
 
             # Save complete assistant message
             storage.add_assistant_message(
@@ -251,6 +299,7 @@ async def send_message_stream(conversation_id: str, request: SendMessageRequest)
                 stage2_results,
                 stage3_result
             )
+            schedule_memory_update(conversation_id)
 
             # Send completion event
             yield f"data: {json.dumps({'type': 'complete'})}\n\n"
@@ -270,21 +319,105 @@ async def send_message_stream(conversation_id: str, request: SendMessageRequest)
     )
 
 
+class RegenerateRequest(BaseModel):
+    """Request to regenerate part of a stored assistant message."""
+    message_index: int = -1  # Among assistant messages; -1 means latest
+    profile: Optional[str] = None  # Council profile for the chairman, ranking mode and timeouts
+
+
+def find_assistant_turn(conversation: dict, message_index: int) -> Tuple[int, str, Dict[str, Any]]:
+    """
+    Locate an assistant message and the question it answered.
+
+    Args:
+        conversation: The conversation dict with messages
+        message_index: Index among assistant messages (negative counts from the latest)
+
+    Returns:
+        Tuple of (position in the messages list, user question, assistant message)
+
+    Raises:
+        HTTPException: 404 if there is no such assistant message
+    """
+    positions = [i for i, msg in enumerate(conversation["messages"]) if msg.get("role") == "assistant"]
+    if not -len(positions) <= message_index < len(positions):
+        raise HTTPException(status_code=404, detail="Message index out of range")
+
+    position = positions[message_index]
+    user_query = next(
+        (msg["content"] for msg in reversed(conversation["messages"][:position]) if msg.get("role") == "user"),
+        None
+    )
+    if user_query is None:
+        raise HTTPException(status_code=404, detail="No user message precedes this answer")
+    return position, user_query, conversation["messages"][position]
+
+
+async def regenerate_message(conversation_id: str, request: RegenerateRequest, rerank: bool) -> Dict[str, Any]:
+    """Re-run Stage 3 (and Stage 2 when rerank) of a stored answer and save the result."""
+    conversation = storage.get_conversation(conversation_id)
+    if conversation is None:
+        raise HTTPException(status_code=404, detail="Conversation not found")
+
+    position, user_query, message = find_assistant_turn(conversation, request.message_index)
+    if message.get("stage1") and message["stage1"][0].get("layer") is not None:
+        raise HTTPException(status_code=400, detail="Mixture-of-agents answers cannot be regenerated by stage")
+
+    try:
+        stage2_results, stage3_result, metadata = await regenerate_council_stages(
+            user_query,
+            message.get("stage1") or [],
+            message.get("stage2") or [],
+            rerank=rerank,
+            profile=request.profile
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    storage.replace_assistant_stages(conversation_id, position, stage2_results, stage3_result)
+    return {
+        "stage1": message.get("stage1") or [],
+        "stage2": stage2_results,
+        "stage3": stage3_result,
+        "metadata": metadata
+    }
+
+
+@app.post("/api/conversations/{conversation_id}/regenerate/synthesis")
+async def regenerate_synthesis(conversation_id: str, request: RegenerateRequest = None):
+    """
+    Re-run only the chairman synthesis of a stored answer.
+    Reuses the stored Stage 1 answers and Stage 2 rankings; returns all stages.
+    """
+    return await regenerate_message(conversation_id, request or RegenerateRequest(), rerank=False)
+
+
+@app.post("/api/conversations/{conversation_id}/regenerate/rankings")
+async def regenerate_rankings(conversation_id: str, request: RegenerateRequest = None):
+    """
+    Re-run the peer rankings and the chairman synthesis of a stored answer.
+    Reuses the stored Stage 1 answers; returns all stages.
+    """
+    return await regenerate_message(conversation_id, request or RegenerateRequest(), rerank=True)
+
+
 class SpeakRequest(BaseModel):
     """Request to synthesize speech."""
     voice_id: str = "Matthew"
     message_index: int = -1  # -1 means latest
 
 
-@app.post("/api/conversations/{conversation_id}/speak")
-async def speak_response(conversation_id: str, request: SpeakRequest = None):
-    """
-    Synthesize speech for a Stage 3 response.
-    Returns MP3 audio.
+def select_stage3_text(conversation_id: str, message_index: int) -> str:
     """
-    if request is None:
-        request = SpeakRequest()
+    Stage 3 text of an assistant message.
 
+    Args:
+        conversation_id: Conversation identifier
+        message_index: Index among assistant messages (-1 for latest)
+
+    Raises:
+        HTTPException: 404 if the conversation or message is missing, 400 if it has no Stage 3 text
+    """
     # Get the conversation
     conversation = storage.get_conversation(conversation_id)
     if conversation is None:
@@ -300,7 +433,7 @@ async def speak_response(conversation_id: str, request: SpeakRequest = None):
         raise HTTPException(status_code=404, detail="No assistant response found")
 
     # Select message by index (-1 for latest)
-    msg_index = request.message_index
+    msg_index = message_index
     if msg_index < 0:
         msg_index = len(assistant_messages) + msg_index  # Convert negative to positive
 
@@ -315,9 +448,22 @@ async def speak_response(conversation_id: str, request: SpeakRequest = None):
 
     if not text:
         raise HTTPException(status_code=400, detail="No Stage 3 response to synthesize")
+    return text
+
+
+async def speech_response(text: str, voice_id: str):
+    """Serve speech for text from the audio cache (with range requests), synthesizing on a miss."""
+    headers = {"Content-Disposition": "inline; filename=response.mp3"}
+
+    if TTS_CACHE == "on":
+        path = await cached_speech(text, voice_id=voice_id)
+        if path is None:
+            raise HTTPException(status_code=500, detail="Failed to synthesize speech")
+        # FileResponse answers Range requests, so players can seek in cached audio
+        return FileResponse(path, media_type="audio/mpeg", headers={**headers, "Cache-Control": "private, max-age=86400"})
 
     # Synthesize speech
-    audio_bytes = await synthesize_speech(text, voice_id=request.voice_id)
+    audio_bytes = await synthesize_speech(text, voice_id=voice_id, engine=POLLY_ENGINE)
 
     if audio_bytes is None:
         raise HTTPException(status_code=500, detail="Failed to synthesize speech")
@@ -326,12 +472,33 @@ async def speak_response(conversation_id: str, request: SpeakRequest = None):
     return StreamingResponse(
         iter([audio_bytes]),
         media_type="audio/mpeg",
-        headers={
-            "Content-Disposition": "inline; filename=response.mp3"
-        }
+        headers=headers
     )
 
 
+@app.post("/api/conversations/{conversation_id}/speak")
+async def speak_response(conversation_id: str, request: SpeakRequest = None):
+    """
+    Synthesize speech for a Stage 3 response.
+    Returns MP3 audio, from the audio cache when it was synthesized before.
+    """
+    if request is None:
+        request = SpeakRequest()
+
+    text = select_stage3_text(conversation_id, request.message_index)
+    return await speech_response(text, request.voice_id)
+
+
+@app.get("/api/conversations/{conversation_id}/speak")
+async def get_speech(conversation_id: str, voice_id: str = "Matthew", message_index: int = -1):
+    """
+    Stage 3 speech as a plain URL, usable as an <audio> source.
+    Supports Range requests for seeking once the audio is cached.
+    """
+    text = select_stage3_text(conversation_id, message_index)
+    return await speech_response(text, voice_id)
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8001)
@@ -0,0 +1,199 @@
+"""Rolling conversation memory for multi-turn council sessions.
+
+Older turns are folded into a running summary that is updated in the
+background after each turn and stored with the conversation. Stage 1 receives
+that summary plus the most recent turns verbatim, all within a token budget,
+so prompt size stays bounded however long the conversation runs.
+"""
+
+import asyncio
+import logging
+from typing import List, Dict, Any, Optional, Tuple
+
+from . import storage
+from .config import (
+    API_PROVIDER, TITLE_MODEL,
+    MEMORY_RECENT_TURNS, MEMORY_TOKEN_BUDGET, MEMORY_SUMMARY_WORDS
+)
+
+logger = logging.getLogger("llm_council.memory")
+
+# Dynamic import based on provider
+if API_PROVIDER == "bedrock":
+    from .bedrock import query_model
+else:
+    from .openrouter import query_model
+
+# Keep references to background summary tasks so they are not garbage collected
+_background_tasks = set()
+
+
+def _estimate_tokens(text: str) -> int:
+    """Rough token estimate (1 token ≈ 4 chars)."""
+    return len(text) // 4
+
+
+def get_turns(conversation: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """
+    Pair conversation messages into (user question, final council answer) turns.
+
+    Args:
+        conversation: The conversation dict with messages
+
+    Returns:
+        List of (user content, stage 3 response) tuples; the answer may be empty
+    """
+    turns = []
+    for msg in conversation.get("messages", []):
+        if msg["role"] == "user":
+            turns.append([msg["content"], ""])
+        elif msg["role"] == "assistant" and turns and msg.get("stage3"):
+            turns[-1][1] = msg["stage3"].get("response", "")
+    return [tuple(turn) for turn in turns]
+
+
+def _truncate(text: str, max_tokens: int) -> str:
+    """Trim text to roughly max_tokens, keeping the beginning."""
+    max_chars = max(0, max_tokens * 4)
+    if len(text) <= max_chars:
+        return text
+    return text[:max_chars].rstrip() + " [...]"
+
+
+def _fallback_summary(turns: List[Tuple[str, str]]) -> str:
+    """Cheap local summary used until the background summary catches up."""
+    questions = [question.strip().splitlines()[0][:200] for question, _ in turns if question.strip()]
+    return "Earlier questions in this conversation: " + "; ".join(questions)
+
+
+def build_memory_context(
+    conversation: Dict[str, Any],
+    recent_turns: int = MEMORY_RECENT_TURNS,
+    token_budget: int = MEMORY_TOKEN_BUDGET
+) -> List[Dict[str, str]]:
+    """
+    Build bounded message history: rolling summary plus recent turns verbatim.
+
+    Args:
+        conversation: The conversation dict with messages and optional 'memory'
+        recent_turns: Number of most recent turns to include verbatim
+        token_budget: Maximum estimated tokens for the whole history
+
+    Returns:
+        List of message dicts with role and content
+    """
+    turns = [turn for turn in get_turns(conversation) if turn[1]]
+    if not turns:
+        return []
+
+    recent = turns[-recent_turns:] if recent_turns > 0 else []
+    older = turns[:len(turns) - len(recent)]
+
+    memory = conversation.get("memory") or {}
+    summary = memory.get("summary", "")
+    unsummarized = older[memory.get("summarized_turns", 0):]
+    if unsummarized:
+        # The background summary lags behind; cover the gap locally
+        summary = "\n\n".join(part for part in (summary, _fallback_summary(unsummarized)) if part)
+
+    context = []
+    remaining = token_budget
+    if older and summary:
+        summary = _truncate(summary, token_budget // 3)
+        context.extend([
+            {"role": "user", "content": f"Summary of our earlier conversation, for context:\n\n{summary}"},
+            {"role": "assistant", "content": "Understood. I'll keep that context in mind."}
+        ])
+        remaining -= _estimate_tokens(summary)
+
+    # Newest turn first: each turn may use up to half of what is left, so
+    # older turns are trimmed harder and the total never exceeds the budget
+    recent_messages = []
+    for question, answer in reversed(recent):
+        if remaining <= 0:
+            break
+        share = remaining // 2 if len(recent) > 1 else remaining
+        question = _truncate(question, share // 3)
+        answer = _truncate(answer, share - _estimate_tokens(question))
+        recent_messages[:0] = [
+            {"role": "user", "content": question},
+            {"role": "assistant", "content": answer}
+        ]
+        remaining -= _estimate_tokens(question) + _estimate_tokens(answer)
+
+    return context + recent_messages
+
+
+async def summarize_turns(previous_summary: str, turns: List[Tuple[str, str]]) -> Optional[str]:
+    """
+    Fold new turns into the running summary with the fast title model.
+
+    Args:
+        previous_summary: The current summary (may be empty)
+        turns: Turns not yet covered by the summary
+
+    Returns:
+        The updated summary, or None if the model call failed
+    """
+    transcript = "\n\n".join(
+        f"User: {question}\nCouncil: {_truncate(answer, 1500)}" for question, answer in turns
+    )
+    prompt = f"""You maintain a running summary of a conversation between a user and an AI council.
+Update the summary so it also covers the new exchanges. Keep the user's goals, key facts,
+decisions and open questions. Use at most {MEMORY_SUMMARY_WORDS} words. Reply with the summary only.
+
+Current summary:
+{previous_summary or "(none yet)"}
+
+New exchanges:
+{transcript}
+
+Updated summary:"""
+
+    response = await query_model(TITLE_MODEL, [{"role": "user", "content": prompt}], timeout=60.0)
+    if response is None:
+        return None
+    return response.get("content", "").strip() or None
+
+
+async def update_conversation_memory(conversation_id: str, recent_turns: int = MEMORY_RECENT_TURNS):
+    """
+    Summarize turns that have left the verbatim window and store the new summary.
+
+    Args:
+        conversation_id: Conversation identifier
+        recent_turns: Number of most recent turns kept verbatim
+    """
+    conversation = storage.get_conversation(conversation_id)
+    if conversation is None:
+        return
+
+    turns = [turn for turn in get_turns(conversation) if turn[1]]
+    older = turns[:max(0, len(turns) - recent_turns)]
+    memory = conversation.get("memory") or {"summary": "", "summarized_turns": 0}
+    pending = older[memory.get("summarized_turns", 0):]
+    if not pending:
+        return
+
+    logger.info(f"Memory: summarizing {len(pending)} turn(s) for conversation {conversation_id}")
+    summary = await summarize_turns(memory.get("summary", ""), pending)
+    if summary is None:
+        logger.warning(f"Memory: summary update failed for conversation {conversation_id}")
+        return
+
+    storage.update_conversation_memory(conversation_id, {
+        "summary": summary,
+        "summarized_turns": len(older)
+    })
+
+
+def schedule_memory_update(conversation_id: str):
+    """
+    Update the conversation memory in the background after a turn completes.
+
+    Args:
+        conversation_id: Conversation identifier
+    """
+    task = asyncio.create_task(update_conversation_memory(conversation_id))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
@@ -0,0 +1,280 @@
+"""Layered mixture-of-agents mode for LLM Council.
+
+An alternative to the 3-stage council: layer 1 answers the question, each
+following layer answers again with the previous layer's outputs as
+references, and the chairman aggregates the last layer. Every layer runs
+fully in parallel and stops waiting at its deadline once a quorum of models
+has answered, so one slow agent cannot stall the stack.
+
+Resolved council profile settings apply as in the 3-stage council: models
+(every layer), chairman (the aggregator), web search, thinking and token
+budgets, stage1_deadline_s and quorum (per layer) and stage3_timeout_s (the
+aggregator call).
+"""
+
+import time
+import logging
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterator
+
+from .config import (
+    CHAIRMAN_MODEL, API_PROVIDER, MOA_LAYERS, MOA_LAYER_DEADLINE_S, MOA_LAYER_QUORUM
+)
+from .concurrency import query_models_with_quorum
+from .council import perform_web_search, build_stage1_messages
+from .profiles import resolve_profile
+from .search_routing import decide_web_search
+from .deliberations import save_deliberation
+
+logger = logging.getLogger("llm_council.moa")
+
+# Dynamic import based on provider
+if API_PROVIDER == "bedrock":
+    from .bedrock import query_model
+else:
+    from .openrouter import query_model
+
+REFERENCES_PROMPT = """You have been provided with a set of responses from various models to the latest user query. Your task is to synthesize these responses into a single, high-quality response. Critically evaluate the information provided in these responses, recognizing that some of it may be biased or incorrect. Your response should not simply replicate the given answers but should offer a refined, accurate, and comprehensive reply to the question.
+
+Responses from models:
+{references}
+
+Question: {user_query}"""
+
+
+def build_reference_messages(
+    base_messages: List[Dict[str, str]],
+    user_query: str,
+    references: List[str]
+) -> List[Dict[str, str]]:
+    """
+    Replace the final user message with the question plus reference answers.
+
+    Args:
+        base_messages: Layer 1 messages (history plus question)
+        user_query: The user's question
+        references: Outputs of the previous layer
+
+    Returns:
+        Messages for the next layer
+    """
+    numbered = "\n\n".join(f"{i}. {reference}" for i, reference in enumerate(references, start=1))
+    prompt = REFERENCES_PROMPT.format(references=numbered, user_query=user_query)
+    return base_messages[:-1] + [{"role": "user", "content": prompt}]
+
+
+def _token_usage(messages: List[Dict[str, str]], response: Dict[str, Any]) -> Tuple[int, int]:
+    """Reported (input, output) tokens, estimated at 4 chars/token when not reported."""
+    usage = response.get('usage') or {}
+    input_tokens = usage.get('input_tokens') or sum(len(m.get('content', '')) for m in messages) // 4
+    output_tokens = usage.get('output_tokens') or len(response.get('content', '')) // 4
+    return input_tokens, output_tokens
+
+
+async def run_layer(
+    layer_index: int,
+    models: List[str],
+    messages: List[Dict[str, str]],
+    deadline_s: float,
+    quorum: int,
+    **query_kwargs
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Run one layer in parallel with a deadline and quorum.
+
+    Args:
+        layer_index: 1-based layer number
+        models: Models in this layer
+        messages: Messages sent to every model in the layer
+        deadline_s: Seconds after which a met quorum ends the layer
+        quorum: Minimum responses before the deadline can end the layer
+        **query_kwargs: Extra arguments for query_model (thinking_budget, max_tokens)
+
+    Returns:
+        Tuple of (results with 'model', 'response', 'latency_s', layer report)
+    """
+    start = time.perf_counter()
+    responses, cancelled = await query_models_with_quorum(models, messages, deadline_s, quorum, **query_kwargs)
+
+    results = []
+    input_tokens = output_tokens = 0
+    for model in models:
+        response = responses.get(model)
+        if response is None or not response.get('content'):
+            continue
+        results.append({
+            "model": model,
+            "response": response['content'],
+            "latency_s": response.get('latency_s'),
+            "layer": layer_index
+        })
+        used_in, used_out = _token_usage(messages, response)
+        input_tokens += used_in
+        output_tokens += used_out
+
+    report = {
+        "layer": layer_index,
+        "models": models,
+        "responded": [r['model'] for r in results],
+        "cancelled_at_deadline": cancelled,
+        "duration_s": round(time.perf_counter() - start, 2),
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens
+    }
+    logger.info(
+        f"MoA layer {layer_index}: {len(results)}/{len(models)} responded in {report['duration_s']}s "
+        f"({input_tokens} in / {output_tokens} out tokens)"
+    )
+    return results, report
+
+
+async def run_mixture_of_agents(
+    user_query: str,
+    conversation_history: List[Dict[str, str]] = None,
+    layers: Optional[List[List[str]]] = None,
+    deadline_s: Optional[float] = None,
+    quorum: Optional[int] = None,
+    settings: Optional[Dict[str, Any]] = None
+) -> Tuple[List, List, Dict, Dict]:
+    """
+    Run the layered mixture-of-agents process.
+
+    Args:
+        user_query: The user's question
+        conversation_history: Optional list of previous messages for multi-turn context
+        layers: Models per layer (defaults to the settings' models in every
+            layer, then MOA_LAYERS)
+        deadline_s: Per-layer deadline in seconds (defaults to the settings'
+            stage1_deadline_s, then MOA_LAYER_DEADLINE_S)
+        quorum: Per-layer quorum (defaults to the settings' quorum, then MOA_LAYER_QUORUM)
+        settings: Settings from resolve_profile() (defaults to the default profile)
+
+    Returns:
+        Tuple of (last layer results, [], aggregator result, metadata), the same
+        shape as run_full_council
+    """
+    settings = settings or resolve_profile()
+    if layers is None:
+        layers = [list(settings["models"]) for _ in MOA_LAYERS] if settings["models"] else MOA_LAYERS
+    deadline_s = deadline_s or settings["stage1_deadline_s"] or MOA_LAYER_DEADLINE_S
+    quorum = quorum or settings["quorum"] or MOA_LAYER_QUORUM
+    chairman = settings["chairman"] or CHAIRMAN_MODEL
+    aggregator_timeout = settings["stage3_timeout_s"] or 180.0
+    query_kwargs = {"thinking_budget": settings["thinking_budget"]}
+    if settings["max_tokens"]:
+        query_kwargs["max_tokens"] = settings["max_tokens"]
+
+    logger.info(
+        f"=== Mixture-of-agents session starting ({len(layers)} layers, "
+        f"profile {settings['profile']}, aggregator {chairman}) ==="
+    )
+    start = time.perf_counter()
+
+    # Perform web search for real-time information, unless the question does not need it
+    search_decision = decide_web_search(user_query, settings["web_search"])
+    web_context = await perform_web_search(user_query, search_decision["search"])
+    search_decision["used"] = web_context is not None
+    base_messages = build_stage1_messages(user_query, conversation_history, web_context)
+
+    layer_reports = []
+    results: List[Dict[str, Any]] = []
+    for index, models in enumerate(layers, start=1):
+        if results:
+            messages = build_reference_messages(base_messages, user_query, [r['response'] for r in results])
+        else:
+            messages = base_messages
+
+        layer_results, report = await run_layer(index, models, messages, deadline_s, quorum, **query_kwargs)
+        layer_reports.append(report)
+
+        if not layer_results:
+            logger.error(f"MoA layer {index}: no model responded")
+            if not results:
+                return [], [], {
+                    "model": "error",
+                    "response": "All models failed to respond. Please try again."
+                }, {"mode": "moa", "layers": layer_reports, "profile": settings, "web_search": search_decision}
+            # Keep the previous layer's outputs as references for the aggregator
+            break
+        results = layer_results
+
+    # Final aggregation by the chairman
+    aggregate_messages = build_reference_messages(base_messages, user_query, [r['response'] for r in results])
+    aggregate_start = time.perf_counter()
+    response = await query_model(chairman, aggregate_messages, timeout=aggregator_timeout)
+    if response is None:
+        logger.error(f"MoA aggregator {chairman} failed to respond")
+        stage3_result = {"model": chairman, "response": "Error: Unable to generate final synthesis."}
+        aggregate_tokens = (0, 0)
+    else:
+        stage3_result = {"model": chairman, "response": response.get('content', '')}
+        aggregate_tokens = _token_usage(aggregate_messages, response)
+
+    layer_reports.append({
+        "layer": len(layer_reports) + 1,
+        "models": [chairman],
+        "responded": [chairman] if response is not None else [],
+        "cancelled_at_deadline": [],
+        "duration_s": round(time.perf_counter() - aggregate_start, 2),
+        "input_tokens": aggregate_tokens[0],
+        "output_tokens": aggregate_tokens[1],
+        "aggregator": True
+    })
+
+    metadata = {
+        "mode": "moa",
+        "label_to_model": {},
+        "aggregate_rankings": [],
+        "layers": layer_reports,
+        "layer_deadline_s": deadline_s,
+        "layer_quorum": quorum,
+        "profile": settings,
+        "web_search": search_decision,
+        "total_input_tokens": sum(r["input_tokens"] for r in layer_reports),
+        "total_output_tokens": sum(r["output_tokens"] for r in layer_reports),
+        "timings": {"total_s": round(time.perf_counter() - start, 2)}
+    }
+
+    try:
+        delib_path = save_deliberation(
+            question=user_query,
+            stage1_results=results,
+            stage2_results=[],
+            stage3_result=stage3_result,
+            metadata=metadata,
+            web_context=web_context
+        )
+        logger.info(f"Deliberation archived to: {delib_path}")
+        metadata["deliberation_path"] = delib_path
+    except Exception as e:
+        logger.error(f"Failed to save deliberation: {e}", exc_info=True)
+
+    logger.info(f"=== Mixture-of-agents session complete ===")
+    return results, [], stage3_result, metadata
+
+
+async def mixture_of_agents_events(
+    user_query: str,
+    conversation_history: List[Dict[str, str]] = None,
+    settings: Optional[Dict[str, Any]] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Run the mixture-of-agents process, yielding the same stage events as council_events.
+
+    The layers stand in for Stage 1 and the aggregator for Stage 3; Stage 2
+    carries the layer reports instead of rankings.
+
+    Args:
+        user_query: The user's question
+        conversation_history: Optional list of previous messages for multi-turn context
+        settings: Settings from resolve_profile() (defaults to the default profile)
+
+    Yields:
+        Stage event dicts, ending with "council_complete"
+    """
+    yield {"type": "stage1_start"}
+    result = await run_mixture_of_agents(user_query, conversation_history, settings=settings)
+    stage1_results, stage2_results, stage3_result, metadata = result
+    yield {"type": "stage1_complete", "data": stage1_results}
+    yield {"type": "stage2_complete", "data": stage2_results, "metadata": metadata}
+    yield {"type": "stage3_complete", "data": stage3_result}
+    yield {"type": "council_complete", "result": result}
@@ -1,5 +1,6 @@
 """OpenRouter API client for making LLM requests."""
 
+import time
 import logging
 import httpx
 from typing import List, Dict, Any, Optional
@@ -23,7 +24,10 @@ REASONING_MODELS = [
 async def query_model(
     model: str,
     messages: List[Dict[str, str]],
-    timeout: float = 120.0
+    timeout: float = 120.0,
+    max_tokens: Optional[int] = None,
+    json_schema: Optional[Dict[str, Any]] = None,
+    thinking_budget: Optional[int] = None
 ) -> Optional[Dict[str, Any]]:
     """
     Query a single model via OpenRouter API.
@@ -32,9 +36,12 @@ async def query_model(
         model: OpenRouter model identifier (e.g., "openai/gpt-4o")
         messages: List of message dicts with 'role' and 'content'
         timeout: Request timeout in seconds
+        max_tokens: Optional cap on output tokens
+        json_schema: Optional JSON schema to request structured output
+        thinking_budget: Optional reasoning token budget for reasoning models (0 disables it)
 
     Returns:
-        Response dict with 'content' and optional 'reasoning_details', or None if failed
+        Response dict with 'content', optional 'reasoning_details', 'usage' and 'latency_s', or None if failed
     """
     headers = {
         "Authorization": f"Bearer {OPENROUTER_API_KEY}",
@@ -55,14 +62,33 @@ async def query_model(
         }
         logger.debug(f"Web search enabled for {model}")
 
+    if max_tokens:
+        payload["max_tokens"] = max_tokens
+
+    # Request structured output; models without support ignore it and answer in text
+    if json_schema is not None:
+        payload["response_format"] = {
+            "type": "json_schema",
+            "json_schema": {
+                "name": json_schema.get("title", "structured_output"),
+                "strict": True,
+                "schema": json_schema
+            }
+        }
+
     # Check if model supports extended reasoning
     model_lower = model.lower()
     supports_reasoning = any(rm in model_lower for rm in REASONING_MODELS)
     if supports_reasoning:
         logger.debug(f"Model {model} supports extended reasoning")
+        if thinking_budget is not None:
+            payload["reasoning"] = (
+                {"max_tokens": thinking_budget} if thinking_budget > 0 else {"enabled": False}
+            )
 
     logger.debug(f"Querying OpenRouter model: {model} with {len(messages)} messages")
 
+    start = time.perf_counter()
     try:
         async with httpx.AsyncClient(timeout=timeout) as client:
             response = await client.post(
@@ -80,7 +106,12 @@ async def query_model(
 
             return {
                 'content': content,
-                'reasoning_details': message.get('reasoning_details')
+                'reasoning_details': message.get('reasoning_details'),
+                'usage': {
+                    'input_tokens': (data.get('usage') or {}).get('prompt_tokens', 0),
+                    'output_tokens': (data.get('usage') or {}).get('completion_tokens', 0)
+                },
+                'latency_s': round(time.perf_counter() - start, 3)
             }
 
     except httpx.HTTPStatusError as e:
@@ -93,7 +124,10 @@ async def query_model(
 
 async def query_models_parallel(
     models: List[str],
-    messages: List[Dict[str, str]]
+    messages: List[Dict[str, str]],
+    max_tokens: Optional[int] = None,
+    json_schema: Optional[Dict[str, Any]] = None,
+    thinking_budget: Optional[int] = None
 ) -> Dict[str, Optional[Dict[str, Any]]]:
     """
     Query multiple models in parallel.
@@ -101,6 +135,9 @@ async def query_models_parallel(
     Args:
         models: List of OpenRouter model identifiers
         messages: List of message dicts to send to each model
+        max_tokens: Optional cap on output tokens
+        json_schema: Optional JSON schema to request structured output
+        thinking_budget: Optional reasoning token budget (0 disables it)
 
     Returns:
         Dict mapping model identifier to response dict (or None if failed)
@@ -108,7 +145,13 @@ async def query_models_parallel(
     import asyncio
 
     # Create tasks for all models
-    tasks = [query_model(model, messages) for model in models]
+    tasks = [
+        query_model(
+            model, messages, max_tokens=max_tokens, json_schema=json_schema,
+            thinking_budget=thinking_budget
+        )
+        for model in models
+    ]
 
     # Wait for all to complete
     responses = await asyncio.gather(*tasks)
@@ -7,10 +7,12 @@ or configure credentials via ~/.aws/credentials.
 """
 
 import asyncio
+import functools
 import logging
 import re
 import boto3
 from botocore.exceptions import NoCredentialsError, ClientError
+from concurrent.futures import Executor
 from typing import Optional, List
 from .config import AWS_REGION
 
@@ -122,7 +124,8 @@ def _sync_synthesize_speech(
     client,
     text: str,
     voice_id: str = "Matthew",
-    output_format: str = "mp3"
+    output_format: str = "mp3",
+    engine: str = "neural"
 ) -> Optional[bytes]:
     """
     Synchronous speech synthesis (runs in thread pool).
@@ -133,6 +136,7 @@ def _sync_synthesize_speech(
         text: Text to synthesize
         voice_id: Polly voice ID (e.g., "Matthew", "Joanna", "Amy")
         output_format: Audio format ("mp3", "ogg_vorbis", "pcm")
+        engine: Polly engine ("neural" falls back to "standard" for voices without it)
 
     Returns:
         Audio bytes or None if failed
@@ -145,7 +149,7 @@ def _sync_synthesize_speech(
         audio_parts = []
         for i, chunk in enumerate(chunks):
             logger.debug(f"Synthesizing chunk {i+1}/{len(chunks)} ({len(chunk)} chars)")
-            audio = _synthesize_chunk(client, chunk, voice_id, output_format)
+            audio = _synthesize_chunk(client, chunk, voice_id, output_format, engine)
             if audio:
                 audio_parts.append(audio)
             else:
@@ -175,7 +179,9 @@ def _sync_synthesize_speech(
 async def synthesize_speech(
     text: str,
     voice_id: str = "Matthew",
-    output_format: str = "mp3"
+    output_format: str = "mp3",
+    engine: str = "neural",
+    executor: Optional[Executor] = None
 ) -> Optional[bytes]:
     """
     Synthesize speech from text using Amazon Polly.
@@ -184,6 +190,9 @@ async def synthesize_speech(
         text: Text to convert to speech
         voice_id: Polly voice ID (e.g., "Matthew", "Joanna", "Amy", "Brian")
         output_format: Audio format ("mp3", "ogg_vorbis", "pcm")
+        engine: Polly engine ("neural" or "standard")
+        executor: Thread pool for the blocking calls (defaults to the event
+            loop's, shared with the Bedrock client)
 
     Returns:
         Audio bytes in the specified format, or None if failed
@@ -191,8 +200,9 @@ async def synthesize_speech(
     client = _get_polly_client()
 
     # Run synchronous boto3 call in thread pool
-    result = await asyncio.to_thread(
-        _sync_synthesize_speech, client, text, voice_id, output_format
+    result = await asyncio.get_running_loop().run_in_executor(
+        executor,
+        functools.partial(_sync_synthesize_speech, client, text, voice_id, output_format, engine)
     )
 
     return result
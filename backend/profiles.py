@@ -0,0 +1,68 @@
+"""Council profiles for LLM Council.
+
+A profile is a named set of council settings (models, chairman, web search,
+thinking and token budgets, stage deadlines and quorum). Requests pick a
+profile and may override individual settings; run_full_council receives the
+resolved settings instead of reading the global constants directly.
+"""
+
+import logging
+from typing import Dict, Any, Optional
+
+from .config import (
+    COUNCIL_PROFILES, DEFAULT_COUNCIL_PROFILE, CANDIDATE_MODELS, RANKING_PANEL_MODELS,
+    COUNCIL_MODELS, CHAIRMAN_MODEL, TITLE_MODEL
+)
+
+logger = logging.getLogger("llm_council.profiles")
+
+# Settings a profile or a request override may set (None = use the global default)
+PROFILE_FIELDS = (
+    "models", "council_size", "chairman", "web_search", "thinking_budget", "max_tokens",
+    "ranking_mode", "stage2", "tier", "debate_rounds",
+    "stage1_deadline_s", "stage2_deadline_s", "stage3_timeout_s", "quorum", "cache_ttl_s",
+    "semantic_threshold"
+)
+
+# Requests may only pick models this deployment already uses
+ALLOWED_MODELS = set(CANDIDATE_MODELS) | set(RANKING_PANEL_MODELS) | set(COUNCIL_MODELS) | {CHAIRMAN_MODEL, TITLE_MODEL}
+
+
+def resolve_profile(
+    name: Optional[str] = None,
+    overrides: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Resolve a named profile plus per-request overrides into council settings.
+
+    Args:
+        name: Profile name (defaults to DEFAULT_COUNCIL_PROFILE)
+        overrides: Settings that take precedence over the profile (None values are ignored)
+
+    Returns:
+        Dict with every PROFILE_FIELDS key plus 'profile' (the profile name)
+
+    Raises:
+        ValueError: If the profile, an override key or a requested model is unknown
+    """
+    name = (name or DEFAULT_COUNCIL_PROFILE).lower()
+    if name not in COUNCIL_PROFILES:
+        raise ValueError(f"Unknown profile '{name}'. Expected one of: {', '.join(COUNCIL_PROFILES)}")
+
+    settings = {field: None for field in PROFILE_FIELDS}
+    settings.update(COUNCIL_PROFILES[name])
+
+    for key, value in (overrides or {}).items():
+        if key not in PROFILE_FIELDS:
+            raise ValueError(f"Unknown council setting '{key}'")
+        if value is not None:
+            settings[key] = value
+
+    requested = list(settings["models"] or []) + ([settings["chairman"]] if settings["chairman"] else [])
+    unknown = [model for model in requested if model not in ALLOWED_MODELS]
+    if unknown:
+        raise ValueError(f"Models not available on this council: {', '.join(unknown)}")
+
+    settings["profile"] = name
+    logger.debug(f"Council profile '{name}': {settings}")
+    return settings
@@ -0,0 +1,380 @@
+"""Ranking engine for the LLM Council.
+
+Splits Stage 2 into small groups (or pairwise matches) that can be judged in
+parallel, and aggregates parsed rankings held as integer position arrays with
+Borda, average-rank, Kemeny (approximate) and Bradley-Terry methods in NumPy.
+"""
+
+import logging
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger("llm_council.ranking")
+
+AGGREGATION_METHODS = ("average", "borda", "kemeny", "bradley_terry")
+
+
+def make_label(index: int) -> str:
+    """
+    Spreadsheet-style label for a 0-based index: A..Z, AA..AZ, BA, ...
+
+    Args:
+        index: 0-based response index
+
+    Returns:
+        Uppercase label
+    """
+    label = ""
+    index += 1
+    while index > 0:
+        index, remainder = divmod(index - 1, 26)
+        label = chr(65 + remainder) + label
+    return label
+
+
+def rankings_to_positions(rankings: List[List[str]], labels: List[str]) -> np.ndarray:
+    """
+    Convert ranked label lists into an integer position array.
+
+    Args:
+        rankings: One ranked label list per judge (best first)
+        labels: All labels, defining column order
+
+    Returns:
+        (judges, items) int array of 0-based positions, -1 where a judge did not rank an item
+    """
+    index = {label: i for i, label in enumerate(labels)}
+    positions = np.full((len(rankings), len(labels)), -1, dtype=np.int32)
+
+    for j, ranking in enumerate(rankings):
+        ranked = [index[label] for label in dict.fromkeys(ranking) if label in index]
+        positions[j, ranked] = np.arange(len(ranked), dtype=np.int32)
+
+    return positions
+
+
+def _judge_weights(positions: np.ndarray, weights: Optional[np.ndarray]) -> np.ndarray:
+    """Return a float weight per judge (all ones when not given)."""
+    if weights is None:
+        return np.ones(positions.shape[0])
+    return np.asarray(weights, dtype=np.float64)
+
+
+def pairwise_preferences(positions: np.ndarray, weights: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Weighted count of judges preferring each item over each other item.
+
+    Args:
+        positions: (judges, items) position array, -1 for unranked
+        weights: Optional weight per judge
+
+    Returns:
+        (items, items) array where entry [a, b] is the weight of judges ranking a above b
+    """
+    w = _judge_weights(positions, weights)
+    ranked = positions >= 0
+    both = ranked[:, :, None] & ranked[:, None, :]
+    above = (positions[:, :, None] < positions[:, None, :]) & both
+    return np.tensordot(w, above.astype(np.float64), axes=1)
+
+
+def average_ranks(positions: np.ndarray, weights: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Weighted mean 1-based rank of each item over the judges that ranked it.
+
+    Args:
+        positions: (judges, items) position array, -1 for unranked
+        weights: Optional weight per judge
+
+    Returns:
+        Array of average ranks (NaN for items nobody ranked)
+    """
+    w = _judge_weights(positions, weights)[:, None]
+    ranked = positions >= 0
+    total = (w * ranked).sum(axis=0)
+    sums = (w * np.where(ranked, positions + 1, 0)).sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(total > 0, sums / total, np.nan)
+
+
+def borda_scores(positions: np.ndarray, weights: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Weighted Borda count: an item earns one point per item ranked below it.
+
+    Args:
+        positions: (judges, items) position array, -1 for unranked
+        weights: Optional weight per judge
+
+    Returns:
+        Array of Borda scores (higher is better)
+    """
+    w = _judge_weights(positions, weights)[:, None]
+    ranked = positions >= 0
+    ranked_count = ranked.sum(axis=1, keepdims=True)
+    points = np.where(ranked, ranked_count - 1 - positions, 0)
+    return (w * points).sum(axis=0)
+
+
+def kemeny_order(preferences: np.ndarray, initial: np.ndarray, max_passes: int = 50) -> np.ndarray:
+    """
+    Approximate the Kemeny-optimal order by local search from an initial order.
+
+    Repeatedly swaps adjacent items whenever more judge weight prefers the
+    lower one, which never increases the Kendall-tau disagreement with the judges.
+
+    Args:
+        preferences: (items, items) pairwise preference matrix
+        initial: Initial order of item indices (e.g. by Borda score)
+        max_passes: Maximum sweeps over the order
+
+    Returns:
+        Item indices, best first
+    """
+    order = list(initial)
+    for _ in range(max_passes):
+        swapped = False
+        for k in range(len(order) - 1):
+            a, b = order[k], order[k + 1]
+            if preferences[b, a] > preferences[a, b]:
+                order[k], order[k + 1] = b, a
+                swapped = True
+        if not swapped:
+            break
+    return np.asarray(order)
+
+
+def aggregate_positions(
+    positions: np.ndarray,
+    method: str = "average",
+    weights: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Aggregate judge rankings into a single order.
+
+    Args:
+        positions: (judges, items) position array, -1 for unranked
+        method: "average", "borda", "kemeny" or "bradley_terry"
+        weights: Optional weight per judge
+
+    Returns:
+        Tuple of (item indices best first, per-item score). Scores are the
+        average rank for "average" and "kemeny" (lower is better), the Borda
+        count for "borda" and the strength for "bradley_terry" (higher is better).
+    """
+    if method == "average":
+        scores = average_ranks(positions, weights)
+        return np.argsort(np.nan_to_num(scores, nan=np.inf), kind="stable"), scores
+
+    if method == "borda":
+        scores = borda_scores(positions, weights)
+        return np.argsort(-scores, kind="stable"), scores
+
+    if method == "kemeny":
+        initial = np.argsort(-borda_scores(positions, weights), kind="stable")
+        order = kemeny_order(pairwise_preferences(positions, weights), initial)
+        return order, average_ranks(positions, weights)
+
+    if method == "bradley_terry":
+        scores = bradley_terry(pairwise_preferences(positions, weights))
+        return np.argsort(-scores, kind="stable"), scores
+
+    raise ValueError(f"Unknown aggregation method: {method}")
+
+
+def judge_agreement(positions: np.ndarray, weights: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Agreement of each judge with the leave-one-out consensus of the others.
+
+    Agreement is the fraction of item pairs (ranked by the judge, not tied in
+    the consensus) that the judge orders the same way as the consensus average
+    rank. Judges without at least two peers get an agreement of 1.0.
+
+    Args:
+        positions: (judges, items) position array, -1 for unranked
+        weights: Optional prior weight per judge used for the consensus
+
+    Returns:
+        Array of agreements in [0, 1], one per judge
+    """
+    n_judges = positions.shape[0]
+    w = _judge_weights(positions, weights)[:, None]
+    ranked = positions >= 0
+    weighted_ranks = w * np.where(ranked, positions + 1, 0)
+    weighted_counts = w * ranked
+    total_ranks = weighted_ranks.sum(axis=0)
+    total_counts = weighted_counts.sum(axis=0)
+
+    agreement = np.ones(n_judges)
+    if n_judges < 3:
+        return agreement
+
+    for j in range(n_judges):
+        counts = total_counts - weighted_counts[j]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            consensus = np.where(counts > 0, (total_ranks - weighted_ranks[j]) / counts, np.nan)
+
+        valid = ranked[j] & ~np.isnan(consensus)
+        if valid.sum() < 2:
+            continue
+
+        own = positions[j, valid].astype(np.float64)
+        cons = consensus[valid]
+        own_sign = np.sign(own[:, None] - own[None, :])
+        cons_sign = np.sign(cons[:, None] - cons[None, :])
+        pairs = np.triu(cons_sign != 0, k=1)
+        total = pairs.sum()
+        if total:
+            agreement[j] = ((own_sign == cons_sign) & pairs).sum() / total
+
+    return agreement
+
+
+def build_shards(
+    n_items: int,
+    shard_size: int,
+    rounds: int,
+    seed: Optional[int] = None
+) -> List[List[int]]:
+    """
+    Split item indices into small overlapping groups.
+
+    Each round is a fresh random permutation cut into groups of shard_size, so
+    every item appears in `rounds` groups and the comparison graph is connected
+    with high probability. A shard_size of 2 produces pairwise matches.
+
+    Args:
+        n_items: Number of items to rank
+        shard_size: Items per group (minimum 2)
+        rounds: Number of times each item is shuffled into a group
+        seed: Optional random seed for reproducible shards
+
+    Returns:
+        List of groups, each a list of item indices
+    """
+    shard_size = max(2, shard_size)
+    if n_items <= shard_size:
+        return [list(range(n_items))]
+
+    rng = np.random.default_rng(seed)
+    shards = []
+    for _ in range(max(1, rounds)):
+        order = rng.permutation(n_items).tolist()
+        groups = [order[i:i + shard_size] for i in range(0, n_items, shard_size)]
+        # A lone leftover item carries no comparison, fold it into the previous group
+        if len(groups) > 1 and len(groups[-1]) < 2:
+            groups[-2].extend(groups.pop())
+        shards.extend(groups)
+
+    return shards
+
+
+def assign_judges(
+    shards: List[List[str]],
+    judges: List[str],
+    authors: Dict[str, str]
+) -> List[str]:
+    """
+    Assign one judge to each shard, round-robin, avoiding self-judging when possible.
+
+    Args:
+        shards: Groups of response labels
+        judges: Available judge models
+        authors: Mapping from response label to the model that wrote it
+
+    Returns:
+        Judge model for each shard, in shard order
+    """
+    assigned = []
+    for i, shard in enumerate(shards):
+        shard_authors = {authors.get(label) for label in shard}
+        choice = judges[i % len(judges)]
+        for offset in range(len(judges)):
+            candidate = judges[(i + offset) % len(judges)]
+            if candidate not in shard_authors:
+                choice = candidate
+                break
+        assigned.append(choice)
+    return assigned
+
+
+def wins_matrix(
+    rankings: List[List[str]],
+    labels: List[str],
+    weights: Optional[List[float]] = None
+) -> np.ndarray:
+    """
+    Convert partial rankings into a pairwise wins matrix.
+
+    Args:
+        rankings: Ranked label lists (best first), each covering a subset of labels
+        labels: All labels, defining matrix order
+        weights: Optional weight per ranking (e.g. judge reliability)
+
+    Returns:
+        (n, n) array where entry [i, j] is the weighted number of times i beat j
+    """
+    positions = rankings_to_positions(rankings, labels)
+    return pairwise_preferences(positions, None if weights is None else np.asarray(weights))
+
+
+def bradley_terry(
+    wins: np.ndarray,
+    prior: float = 0.1,
+    iterations: int = 200,
+    tol: float = 1e-8
+) -> np.ndarray:
+    """
+    Fit Bradley-Terry strengths with the minorization-maximization algorithm.
+
+    A small symmetric pseudo-count regularizes items that never won or lost
+    and keeps disconnected comparison graphs well defined.
+
+    Args:
+        wins: (n, n) pairwise wins matrix
+        prior: Pseudo-wins added to every pair in both directions
+        iterations: Maximum MM iterations
+        tol: Convergence tolerance on the strengths
+
+    Returns:
+        Strengths normalized to sum to 1 (higher is better)
+    """
+    n = wins.shape[0]
+    if n == 0:
+        return np.zeros(0)
+
+    off_diagonal = ~np.eye(n, dtype=bool)
+    w = wins + prior * off_diagonal
+    games = w + w.T
+    total_wins = w.sum(axis=1)
+
+    p = np.full(n, 1.0 / n)
+    for _ in range(iterations):
+        denom = games / (p[:, None] + p[None, :])
+        denom[~off_diagonal] = 0.0
+        new_p = total_wins / denom.sum(axis=1)
+        new_p /= new_p.sum()
+        if np.abs(new_p - p).max() < tol:
+            p = new_p
+            break
+        p = new_p
+
+    return p
+
+
+def expected_ranks(strengths: np.ndarray) -> np.ndarray:
+    """
+    Expected rank of each item under a Bradley-Terry model.
+
+    Rank of i is 1 plus the probability-weighted count of items beating it,
+    which keeps the scale comparable to an average rank.
+
+    Args:
+        strengths: Bradley-Terry strengths
+
+    Returns:
+        Array of expected ranks (1 is best)
+    """
+    beat_prob = strengths[None, :] / (strengths[:, None] + strengths[None, :])
+    np.fill_diagonal(beat_prob, 0.0)
+    return 1.0 + beat_prob.sum(axis=1)
@@ -0,0 +1,343 @@
+"""Exact-match deliberation result cache for LLM Council.
+
+Identical questions (RSS re-analyses, API retries, the same question from
+several users) re-run the whole council. This cache keys a finished
+deliberation on everything that shapes its answer - the normalized question,
+the council members, the chairman, the conversation history, the web search
+context and the resolved profile settings - and serves repeats from an
+in-memory LRU backed by one JSON file per entry on disk.
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+
+from .config import (
+    RESULT_CACHE, RESULT_CACHE_DIR, RESULT_CACHE_MAX_ENTRIES, RESULT_CACHE_TTL_S, SHARED_CACHE_BACKEND
+)
+from .shared_cache import get_shared_cache
+
+logger = logging.getLogger("llm_council.result_cache")
+
+
+def normalize_question(question: str) -> str:
+    """Lowercase, collapse whitespace and drop trailing punctuation."""
+    return " ".join(question.lower().split()).rstrip("?!. ")
+
+
+def fingerprint(value: Any) -> str:
+    """Short stable hash of any JSON-serializable value."""
+    encoded = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:16]
+
+
+def council_cache_key(
+    question: str,
+    models: List[str],
+    chairman: str,
+    conversation_history: Optional[List[Dict[str, str]]],
+    web_context: Optional[str],
+    settings: Dict[str, Any]
+) -> str:
+    """
+    Build the cache key for a council run.
+
+    Args:
+        question: The user's question
+        models: Council members answering it
+        chairman: Chairman model
+        conversation_history: Previous messages sent with the question
+        web_context: Formatted web search results (None when not searched)
+        settings: Resolved profile settings
+
+    Returns:
+        Hex digest identifying the deliberation
+    """
+    parts = {
+        "question": normalize_question(question),
+        "models": sorted(models),
+        "chairman": chairman,
+        "history": fingerprint(conversation_history or []),
+        "search": fingerprint(" ".join(web_context.split())) if web_context else None,
+        "settings": fingerprint({k: v for k, v in settings.items() if k != "cache_ttl_s"})
+    }
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def council_request_key(
+    question: str,
+    conversation_history: Optional[List[Dict[str, str]]],
+    settings: Dict[str, Any],
+    use_cache: bool
+) -> str:
+    """
+    Key identifying equivalent council requests before any work starts.
+
+    Unlike council_cache_key it does not depend on the members chosen or the
+    search results, so concurrent identical requests can be coalesced up front.
+
+    Args:
+        question: The user's question
+        conversation_history: Previous messages sent with the question
+        settings: Resolved profile settings
+        use_cache: Whether the request may be served from the caches
+
+    Returns:
+        Hex digest identifying the request
+    """
+    return fingerprint({
+        "question": normalize_question(question),
+        "history": conversation_history or [],
+        "settings": settings,
+        "use_cache": use_cache
+    })
+
+
+def cache_ttl(settings: Dict[str, Any]) -> float:
+    """Cache lifetime in seconds for resolved settings (0 = do not cache)."""
+    if RESULT_CACHE != "on":
+        return 0.0
+    ttl = settings.get("cache_ttl_s")
+    return float(RESULT_CACHE_TTL_S if ttl is None else ttl)
+
+
+class ResultCache:
+    """
+    Two-tier cache: an in-memory LRU in front of the shared cache.
+
+    Entries live in the shared cache namespace named after the directory
+    (one JSON file per entry in that directory when SHARED_CACHE_BACKEND is
+    "files"). Methods block on the shared cache and are safe to call from
+    worker threads, so async code runs them with asyncio.to_thread.
+    """
+
+    def __init__(
+        self,
+        directory: str = RESULT_CACHE_DIR,
+        max_entries: int = RESULT_CACHE_MAX_ENTRIES,
+        memory: bool = True
+    ):
+        self.directory = Path(directory)
+        self.namespace = self.directory.name
+        self.max_entries = max(1, max_entries) if memory else 0
+        self.memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = {"memory": 0, "disk": 0}
+        self.misses = 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def _remember(self, key: str, entry: Dict[str, Any]):
+        if not self.max_entries:
+            return
+        with self.lock:
+            self.memory[key] = entry
+            self.memory.move_to_end(key)
+            while len(self.memory) > self.max_entries:
+                self.memory.popitem(last=False)
+
+    def _load(self, key: str) -> Optional[Dict[str, Any]]:
+        if SHARED_CACHE_BACKEND != "files":
+            return get_shared_cache().get(self.namespace, key)
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Unreadable cache entry {path}: {e}")
+            return None
+
+    def get(self, key: str, ttl_s: float) -> Optional[Dict[str, Any]]:
+        """
+        Look up a live entry.
+
+        Args:
+            key: Cache key
+            ttl_s: Maximum entry age in seconds
+
+        Returns:
+            The entry (with 'created_at' and the cached 'result'), or None
+        """
+        tier = "memory"
+        entry = self.memory.get(key)
+        if entry is None:
+            tier = "disk"
+            entry = self._load(key)
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        if time.time() - entry["created_at"] > ttl_s:
+            self.invalidate(key)
+            self.misses += 1
+            return None
+
+        self._remember(key, entry)
+        self.hits[tier] += 1
+        return entry
+
+    def put(self, key: str, result: Dict[str, Any], ttl_s: Optional[float] = None):
+        """
+        Store a result in both tiers.
+
+        Args:
+            key: Cache key
+            result: JSON-serializable result
+            ttl_s: Lifetime in the shared cache (None keeps it until evicted)
+        """
+        entry = {"created_at": time.time(), "result": result}
+        self._remember(key, entry)
+        if SHARED_CACHE_BACKEND != "files":
+            get_shared_cache().set(self.namespace, key, entry, ttl_s)
+            return
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp_path = self._path(key).with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            logger.error(f"Failed to write cache entry {key}: {e}")
+
+    def get_or_put(self, key: str, result: Dict[str, Any], ttl_s: Optional[float] = None) -> Tuple[Dict[str, Any], bool]:
+        """
+        Store a result unless an entry exists (atomically across workers with a shared backend).
+
+        Args:
+            key: Cache key
+            result: JSON-serializable result
+            ttl_s: Lifetime in the shared cache (None keeps it until evicted)
+
+        Returns:
+            Tuple of (the entry now stored, True if this call stored it)
+        """
+        if SHARED_CACHE_BACKEND == "files":
+            entry = self._load(key)
+            if entry is not None:
+                return entry, False
+            self.put(key, result, ttl_s)
+            return self.memory.get(key) or {"created_at": time.time(), "result": result}, True
+
+        entry, created = get_shared_cache().get_or_set(
+            self.namespace, key, {"created_at": time.time(), "result": result}, ttl_s
+        )
+        self._remember(key, entry)
+        return entry, created
+
+    def invalidate(self, key: str):
+        """Drop an entry from both tiers."""
+        self.memory.pop(key, None)
+        if SHARED_CACHE_BACKEND != "files":
+            get_shared_cache().delete(self.namespace, key)
+            return
+        try:
+            self._path(key).unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Failed to remove cache entry {key}: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit and miss counters since startup."""
+        lookups = sum(self.hits.values()) + self.misses
+        return {
+            "memory_entries": len(self.memory),
+            "memory_hits": self.hits["memory"],
+            "disk_hits": self.hits["disk"],
+            "misses": self.misses,
+            "hit_rate": round(sum(self.hits.values()) / lookups, 3) if lookups else 0.0
+        }
+
+
+_result_cache: Optional[ResultCache] = None
+
+
+def get_result_cache() -> ResultCache:
+    """Process-wide result cache."""
+    global _result_cache
+    if _result_cache is None:
+        _result_cache = ResultCache()
+    return _result_cache
+
+
+def lookup_result(key: str, ttl_s: float) -> Optional[Tuple[List, List, Dict, Dict]]:
+    """
+    Return a cached council result, if one is live.
+
+    Args:
+        key: Key from council_cache_key()
+        ttl_s: Maximum entry age in seconds (0 disables the lookup)
+
+    Returns:
+        (stage1_results, stage2_results, stage3_result, metadata) with a
+        metadata['cache'] report pointing at the original deliberation, or None
+    """
+    if ttl_s <= 0:
+        return None
+    entry = get_result_cache().get(key, ttl_s)
+    if entry is None:
+        return None
+
+    result = entry["result"]
+    metadata = dict(result["metadata"])
+    metadata["cache"] = {
+        "hit": True,
+        "type": "exact",
+        "key": key,
+        "cached_at": datetime.fromtimestamp(entry["created_at"]).isoformat(),
+        "age_s": round(time.time() - entry["created_at"], 1),
+        "original_deliberation_path": metadata.get("deliberation_path")
+    }
+    logger.info(f"Result cache hit {key[:12]} (age {metadata['cache']['age_s']}s)")
+    return result["stage1"], result["stage2"], result["stage3"], metadata
+
+
+def store_result(
+    key: str,
+    ttl_s: float,
+    stage1_results: List[Dict[str, Any]],
+    stage2_results: List[Dict[str, Any]],
+    stage3_result: Dict[str, Any],
+    metadata: Dict[str, Any]
+):
+    """
+    Cache a finished council result.
+
+    Failed runs (no Stage 1 answers or no synthesis) are not cached.
+
+    Args:
+        key: Key from council_cache_key()
+        ttl_s: Entry lifetime in seconds (0 disables caching)
+        stage1_results: Results from Stage 1
+        stage2_results: Results from Stage 2
+        stage3_result: Final result
+        metadata: Deliberation metadata
+    """
+    if ttl_s <= 0 or not stage1_results or stage3_result.get("model") == "error":
+        return
+    if stage3_result.get("response", "").startswith("Error:"):
+        return
+    metadata["cache"] = {"hit": False, "key": key, "ttl_s": ttl_s}
+    get_result_cache().put(key, {
+        "stage1": stage1_results,
+        "stage2": stage2_results,
+        "stage3": stage3_result,
+        "metadata": {k: v for k, v in metadata.items() if k != "cache"}
+    }, ttl_s)
+
+
+def bypasses_cache(cache_control: Optional[str]) -> bool:
+    """Whether a Cache-Control request header asks for a fresh result."""
+    directives = {d.strip().lower() for d in (cache_control or "").split(",")}
+    return bool(directives & {"no-cache", "no-store"})
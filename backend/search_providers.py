@@ -1,12 +1,33 @@
-"""Multi-provider web search with automatic fallback."""
+"""Multi-provider web search with automatic fallback.
 
+Successful searches are cached under the normalized query (lowercase, no
+punctuation or stopwords), in memory and on disk, for a lifetime that depends
+on how fresh the answer must be: minutes for news-style queries, hours by
+default and days for evergreen ones.
+"""
+
+import time
+import asyncio
+import hashlib
 import logging
 import httpx
 from typing import List, Dict, Any, Optional
 from enum import Enum
 
+from .config import (
+    SEARCH_CACHE, SEARCH_CACHE_DIR, SEARCH_CACHE_MAX_ENTRIES,
+    SEARCH_CACHE_NEWS_TTL_S, SEARCH_CACHE_TTL_S, SEARCH_CACHE_EVERGREEN_TTL_S
+)
+from .result_cache import ResultCache
+from .similarity import tokenize
+from .search_routing import RECENCY_PATTERN, DAY_PATTERN, YEAR_PATTERN, TIMELESS_PATTERN
+
 logger = logging.getLogger("llm_council.search")
 
+# Words dropped when normalizing a query for the cache; anything that can change
+# the intent ("who is" versus "who was", "flights to" versus "flights in") is kept
+SEARCH_QUERY_STOPWORDS = frozenset({"a", "an", "the", "please"})
+
 
 class SearchProvider(Enum):
     """Available search providers."""
@@ -27,6 +48,116 @@ class SearchProviderConfig:
         return f"SearchProviderConfig({self.provider.value}, enabled={self.enabled})"
 
 
+def normalize_search_query(query: str) -> str:
+    """Lowercase the query and drop punctuation, extra whitespace and articles (word order is kept)."""
+    tokens = tokenize(query)
+    kept = [token for token in tokens if token not in SEARCH_QUERY_STOPWORDS]
+    return " ".join(kept or tokens)
+
+
+def search_freshness(query: str) -> str:
+    """
+    How fresh search results for a query must be.
+
+    Returns:
+        "news" for recency cues, dates or the current year, "evergreen" for
+        timeless question types, otherwise "default"
+    """
+    years = [int(year) for year in YEAR_PATTERN.findall(query)]
+    if RECENCY_PATTERN.search(query) or DAY_PATTERN.search(query) or (
+        years and max(years) >= time.localtime().tm_year
+    ):
+        return "news"
+    if TIMELESS_PATTERN.search(query):
+        return "evergreen"
+    return "default"
+
+
+SEARCH_CACHE_TTLS = {
+    "news": SEARCH_CACHE_NEWS_TTL_S,
+    "default": SEARCH_CACHE_TTL_S,
+    "evergreen": SEARCH_CACHE_EVERGREEN_TTL_S,
+}
+
+
+class SearchCache:
+    """Search results by normalized query, with hit rate and time saved."""
+
+    def __init__(self):
+        self.entries = ResultCache(directory=SEARCH_CACHE_DIR, max_entries=SEARCH_CACHE_MAX_ENTRIES)
+        self.hits = {freshness: 0 for freshness in SEARCH_CACHE_TTLS}
+        self.misses = {freshness: 0 for freshness in SEARCH_CACHE_TTLS}
+        self.saved_s = 0.0
+
+    @staticmethod
+    def key(query: str, max_results: int) -> str:
+        return hashlib.sha256(f"{max_results}:{normalize_search_query(query)}".encode("utf-8")).hexdigest()
+
+    def get(self, query: str, max_results: int) -> Optional[Dict[str, Any]]:
+        """
+        Look up live results for a query.
+
+        Args:
+            query: The search query
+            max_results: Number of results requested
+
+        Returns:
+            The cached search data with a 'cache' report, or None
+        """
+        freshness = search_freshness(query)
+        entry = self.entries.get(self.key(query, max_results), SEARCH_CACHE_TTLS[freshness])
+        if entry is None:
+            self.misses[freshness] += 1
+            return None
+
+        self.hits[freshness] += 1
+        result = entry["result"]
+        self.saved_s += result["latency_s"]
+        age_s = round(time.time() - entry["created_at"], 1)
+        logger.info(f"Search cache hit ({freshness}, age {age_s}s): {query[:80]}")
+        return {**result["data"], "cache": {"hit": True, "freshness": freshness, "age_s": age_s}}
+
+    def put(self, query: str, max_results: int, data: Dict[str, Any], latency_s: float):
+        """
+        Cache successful search results.
+
+        Args:
+            query: The search query
+            max_results: Number of results requested
+            data: Search data returned by a provider
+            latency_s: Time the live search took (credited as saved on each hit)
+        """
+        self.entries.put(
+            self.key(query, max_results),
+            {"data": data, "latency_s": round(latency_s, 3)},
+            SEARCH_CACHE_TTLS[search_freshness(query)]
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit rates per freshness class and search time saved since startup."""
+        hits, misses = sum(self.hits.values()), sum(self.misses.values())
+        return {
+            "enabled": SEARCH_CACHE == "on",
+            "ttl_s": SEARCH_CACHE_TTLS,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(hits / (hits + misses), 3) if hits + misses else 0.0,
+            "latency_saved_s": round(self.saved_s, 2),
+            "memory_entries": len(self.entries.memory)
+        }
+
+
+_search_cache: Optional[SearchCache] = None
+
+
+def get_search_cache() -> SearchCache:
+    """Process-wide search result cache."""
+    global _search_cache
+    if _search_cache is None:
+        _search_cache = SearchCache()
+    return _search_cache
+
+
 async def search_tavily(
     api_key: str,
     query: str,
@@ -206,7 +337,8 @@ async def search_with_fallback(
     providers: List[SearchProviderConfig],
     query: str,
     max_results: int = 5,
-    timeout: float = 30.0
+    timeout: float = 30.0,
+    use_cache: bool = True
 ) -> Optional[Dict[str, Any]]:
     """
     Try multiple search providers until one succeeds.
@@ -216,6 +348,7 @@ async def search_with_fallback(
         query: The search query
         max_results: Maximum number of results to return
         timeout: Request timeout in seconds
+        use_cache: Serve and store results in the search cache (when SEARCH_CACHE is on)
 
     Returns:
         Dict with search results, or None if all providers failed
@@ -229,6 +362,13 @@ async def search_with_fallback(
         logger.warning("No enabled search providers found")
         return None
 
+    use_cache = use_cache and SEARCH_CACHE == "on"
+    if use_cache:
+        cached = await asyncio.to_thread(get_search_cache().get, query, max_results)
+        if cached is not None:
+            return cached
+    start = time.perf_counter()
+
     logger.info(f"Attempting search with {len(enabled_providers)} providers: {[p.provider.value for p in enabled_providers]}")
 
     for provider_config in enabled_providers:
@@ -252,6 +392,10 @@ async def search_with_fallback(
 
             if result and result.get("results"):
                 logger.info(f"✓ {provider.value} returned {len(result['results'])} results")
+                if use_cache:
+                    await asyncio.to_thread(
+                        get_search_cache().put, query, max_results, result, time.perf_counter() - start
+                    )
                 return result
             else:
                 logger.warning(f"✗ {provider.value} returned no results")
@@ -0,0 +1,161 @@
+"""Web search routing for LLM Council.
+
+A local classifier (no model calls, well under a millisecond) estimates
+whether a question needs fresh information from the web: recency cues, recent
+dates, named entities and factual lookups push toward searching; timeless
+question types (explanations, code, maths, writing) push away from it. When
+the search is skipped Stage 1 starts at once instead of waiting on the search
+providers.
+"""
+
+import re
+import math
+import time
+import logging
+from typing import Dict, Any, List, Optional
+
+from .config import ENABLE_WEB_SEARCH, WEB_SEARCH_ROUTING, WEB_SEARCH_THRESHOLD
+from .difficulty import ARITHMETIC_PATTERN, CODE_PATTERN
+
+logger = logging.getLogger("llm_council.search_routing")
+
+# Log-odds of searching before any cue is seen (slightly toward skipping)
+SEARCH_BIAS = -0.5
+
+RECENCY_PATTERN = re.compile(
+    r"\b(today|tonight|yesterday|tomorrow|latest|newest|current(?:ly)?|right now|nowadays|"
+    r"recent(?:ly)?|this (?:week|month|year|quarter|season)|last (?:week|month|night)|"
+    r"news|breaking|headlines?|updates?|as of|so far|upcoming|announced?|released?|"
+    r"prices?|stocks?|shares?|market|weather|forecast|scores?|standings|elections?|"
+    r"trending|live|schedule|deadline|still)\b",
+    re.IGNORECASE
+)
+YEAR_PATTERN = re.compile(r"\b(19\d{2}|20\d{2})\b")
+DAY_PATTERN = re.compile(
+    r"\b(jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|"
+    r"sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\.?\s+\d{1,2}\b",
+    re.IGNORECASE
+)
+LOOKUP_PATTERN = re.compile(
+    r"\b(who (?:is|are|was|won|owns|runs|leads)|who's|when (?:is|are|was|did|does|will)|"
+    r"where (?:is|are|can)|how much (?:is|does|are|do)|is there|what happened|status of)\b",
+    re.IGNORECASE
+)
+TIMELESS_PATTERN = re.compile(
+    r"\b(explain|what is an?|what are|how (?:does|do) .{1,40} work|define|definition|"
+    r"difference between|concepts?|theor(?:y|em)|prove|proof|derive|algorithms?|"
+    r"write (?:an? |the |me )?(?:function|program|script|class|query|poem|story|essay|letter)|"
+    r"implement|refactor|debug|rewrite|summari[sz]e (?:this|the following)|translate|calculate|"
+    r"solve|example of|tips|pros and cons|best practices?)\b",
+    re.IGNORECASE
+)
+URL_PATTERN = re.compile(r"https?://\S+")
+SENTENCE_SPLIT = re.compile(r"(?<=[.!?:])\s+|\n+")
+ENTITY_WORD = re.compile(r"^(?:[A-Z][A-Za-z0-9&'.-]*[A-Za-z0-9]|[A-Z]{2,}[0-9]*)$")
+
+
+def _named_entities(question: str) -> List[str]:
+    """Capitalized words that do not start a sentence, plus acronyms anywhere."""
+    entities = set()
+    for sentence in SENTENCE_SPLIT.split(question):
+        words = [w.strip(",;:()\"'?!") for w in sentence.split()]
+        for position, word in enumerate(words):
+            if word == "I" or not ENTITY_WORD.match(word):
+                continue
+            if position > 0 or (len(word) > 1 and word.isupper()):
+                entities.add(word)
+    return sorted(entities)
+
+
+def classify_search_need(question: str) -> Dict[str, Any]:
+    """
+    Estimate whether answering a question needs a web search.
+
+    Args:
+        question: The user's question
+
+    Returns:
+        Dict with 'search' (bool), 'probability' of needing a search,
+        'confidence' in the decision, the contributing 'signals' and 'classify_ms'
+    """
+    start = time.perf_counter()
+    score = SEARCH_BIAS
+    signals: Dict[str, Any] = {}
+
+    if ARITHMETIC_PATTERN.match(question) and any(ch.isdigit() for ch in question):
+        signals["arithmetic"] = True
+        score -= 4.0
+
+    recency = {m.group(0).lower() for m in RECENCY_PATTERN.finditer(question)}
+    if recency:
+        signals["recency"] = sorted(recency)
+        score += min(3.0, 2.0 * len(recency))
+
+    current_year = time.localtime().tm_year
+    years = sorted({int(y) for y in YEAR_PATTERN.findall(question)})
+    if years:
+        signals["years"] = years
+        score += 1.5 if max(years) >= current_year - 1 else 0.5
+    if DAY_PATTERN.search(question):
+        signals["date"] = True
+        score += 1.0
+
+    entities = _named_entities(question)
+    if entities:
+        signals["entities"] = entities[:10]
+        score += min(1.5, 0.5 * len(entities))
+
+    if LOOKUP_PATTERN.search(question):
+        signals["lookup"] = True
+        score += 1.0
+
+    if URL_PATTERN.search(question):
+        signals["url"] = True
+        score += 1.0
+
+    timeless = {m.group(0).lower() for m in TIMELESS_PATTERN.finditer(question)}
+    if timeless:
+        signals["timeless"] = sorted(timeless)
+        score -= min(3.0, 1.5 * len(timeless))
+
+    if CODE_PATTERN.search(question):
+        signals["code"] = True
+        score -= 1.5
+
+    probability = 1.0 / (1.0 + math.exp(-score))
+    search = probability >= WEB_SEARCH_THRESHOLD
+    return {
+        "search": search,
+        "probability": round(probability, 3),
+        "confidence": round(probability if search else 1.0 - probability, 3),
+        "signals": signals,
+        "classify_ms": round((time.perf_counter() - start) * 1000, 3)
+    }
+
+
+def decide_web_search(question: str, override: Optional[bool] = None) -> Dict[str, Any]:
+    """
+    Decide whether to search the web before Stage 1.
+
+    Args:
+        question: The user's question
+        override: Per-request decision (True/False); None lets the router decide
+
+    Returns:
+        Dict with 'search', 'source' ("override", "unavailable", "always" or
+        "classifier"), 'confidence' and the classifier output when it ran
+    """
+    if override is not None:
+        decision = {"search": bool(override), "source": "override", "confidence": 1.0}
+    elif not ENABLE_WEB_SEARCH:
+        decision = {"search": False, "source": "unavailable", "confidence": 1.0}
+    elif WEB_SEARCH_ROUTING != "auto":
+        decision = {"search": True, "source": "always", "confidence": 1.0}
+    else:
+        decision = {"source": "classifier", **classify_search_need(question)}
+
+    logger.info(
+        f"Web search {'needed' if decision['search'] else 'skipped'} "
+        f"({decision['source']}, confidence {decision['confidence']}): {decision.get('signals', {})}"
+    )
+    return decision
@@ -0,0 +1,334 @@
+"""Bandit-based council member selection for LLM Council.
+
+Picks which models from a larger candidate pool sit on each council. Every
+archived deliberation scores the participating models by their position in
+the aggregate ranking, discounted by response latency (quality per second),
+and a Thompson sampling or UCB policy learns from those rewards. The policy is
+bootstrapped from deliberations/*/metadata.json and keeps learning online
+from each new deliberation. replay_evaluation() replays the archive to
+compare policies offline.
+"""
+
+import json
+import math
+import logging
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+from .config import (
+    COUNCIL_MODELS, CANDIDATE_MODELS, COUNCIL_SELECTION, COUNCIL_SELECTION_SIZE,
+    SELECTION_LATENCY_WEIGHT, SELECTION_UCB_C
+)
+from .deliberations import DELIBERATIONS_DIR
+
+logger = logging.getLogger("llm_council.selection")
+
+SELECTION_STRATEGIES = ("thompson", "ucb")
+
+
+def deliberation_rewards(
+    metadata: Dict[str, Any],
+    latency_weight: float = SELECTION_LATENCY_WEIGHT
+) -> Dict[str, float]:
+    """
+    Score each participating model of one deliberation in [0, 1].
+
+    Quality is the model's position in the aggregate ranking scaled to
+    1.0 (best) .. 0.0 (worst). When latencies were recorded, quality is divided
+    by latency ** latency_weight and normalized by the best model of the same
+    deliberation, so the reward is relative quality per second.
+
+    Args:
+        metadata: Deliberation metadata with 'aggregate_rankings' and optional 'model_latency'
+        latency_weight: Exponent on latency (0 ignores latency, 1 is pure quality per second)
+
+    Returns:
+        Dict mapping model to reward (empty if the deliberation has no ranking)
+    """
+    ranked = [entry["model"] for entry in metadata.get("aggregate_rankings", [])]
+    if len(ranked) < 2:
+        return {}
+
+    n = len(ranked)
+    quality = {model: 1.0 - position / (n - 1) for position, model in enumerate(ranked)}
+
+    latency = metadata.get("model_latency") or {}
+    if latency_weight <= 0 or not all(latency.get(model) for model in ranked):
+        return quality
+
+    per_second = {
+        model: quality[model] / (latency[model] ** latency_weight) for model in ranked
+    }
+    best = max(per_second.values())
+    if best <= 0:
+        return quality
+    return {model: value / best for model, value in per_second.items()}
+
+
+class CouncilSelector:
+    """Thompson sampling / UCB policy over candidate council members."""
+
+    def __init__(self, strategy: str = "thompson", ucb_c: float = SELECTION_UCB_C, seed: Optional[int] = None):
+        """
+        Args:
+            strategy: "thompson" or "ucb"
+            ucb_c: Exploration constant for UCB
+            seed: Optional random seed for reproducible Thompson draws
+        """
+        if strategy not in SELECTION_STRATEGIES:
+            raise ValueError(f"Unknown selection strategy: {strategy}")
+        self.strategy = strategy
+        self.ucb_c = ucb_c
+        self.rng = np.random.default_rng(seed)
+        # Beta(1 + successes, 1 + failures) posteriors over fractional rewards
+        self.successes: Dict[str, float] = {}
+        self.failures: Dict[str, float] = {}
+        self.pulls: Dict[str, int] = {}
+        self.rounds = 0
+
+    def update(self, model: str, reward: float):
+        """
+        Record a reward in [0, 1] for a model.
+
+        Args:
+            model: Model identifier
+            reward: Observed reward
+        """
+        reward = min(1.0, max(0.0, reward))
+        self.successes[model] = self.successes.get(model, 0.0) + reward
+        self.failures[model] = self.failures.get(model, 0.0) + 1.0 - reward
+        self.pulls[model] = self.pulls.get(model, 0) + 1
+
+    def observe(self, metadata: Dict[str, Any]) -> Dict[str, float]:
+        """
+        Learn from one deliberation's ranking and latencies.
+
+        Args:
+            metadata: Deliberation metadata
+
+        Returns:
+            The rewards that were applied
+        """
+        rewards = deliberation_rewards(metadata)
+        for model, reward in rewards.items():
+            self.update(model, reward)
+        if rewards:
+            self.rounds += 1
+        return rewards
+
+    def mean_reward(self, model: str) -> float:
+        """Posterior mean reward of a model (0.5 when unseen)."""
+        return (1.0 + self.successes.get(model, 0.0)) / (2.0 + self.pulls.get(model, 0))
+
+    def scores(self, candidates: List[str]) -> np.ndarray:
+        """
+        Score candidates for one selection round.
+
+        Args:
+            candidates: Candidate model identifiers
+
+        Returns:
+            Array of scores (higher is better)
+        """
+        if self.strategy == "thompson":
+            alpha = np.array([1.0 + self.successes.get(m, 0.0) for m in candidates])
+            beta = np.array([1.0 + self.failures.get(m, 0.0) for m in candidates])
+            return self.rng.beta(alpha, beta)
+
+        total = max(1, sum(self.pulls.get(m, 0) for m in candidates))
+        scores = []
+        for model in candidates:
+            pulls = self.pulls.get(model, 0)
+            if pulls == 0:
+                # Try every candidate at least once
+                scores.append(math.inf)
+            else:
+                bonus = self.ucb_c * math.sqrt(2.0 * math.log(total) / pulls)
+                scores.append(self.mean_reward(model) + bonus)
+        return np.array(scores)
+
+    def select(self, candidates: List[str], k: int) -> List[str]:
+        """
+        Pick k council members from the candidates.
+
+        Args:
+            candidates: Candidate model identifiers
+            k: Council size
+
+        Returns:
+            Selected models, highest score first
+        """
+        if k >= len(candidates):
+            return list(candidates)
+        order = np.argsort(-self.scores(candidates), kind="stable")
+        return [candidates[i] for i in order[:k]]
+
+    def summary(self, candidates: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Per-model statistics, best posterior mean first.
+
+        Args:
+            candidates: Models to include (defaults to every model seen)
+
+        Returns:
+            List of dicts with model, mean_reward and observations
+        """
+        models = candidates or list(self.pulls)
+        stats = [
+            {
+                "model": model,
+                "mean_reward": round(self.mean_reward(model), 3),
+                "observations": self.pulls.get(model, 0)
+            }
+            for model in models
+        ]
+        return sorted(stats, key=lambda s: -s["mean_reward"])
+
+
+def load_archived_metadata(deliberations_dir: Path = DELIBERATIONS_DIR) -> List[Dict[str, Any]]:
+    """
+    Load metadata of every archived deliberation, oldest first.
+
+    Args:
+        deliberations_dir: Deliberation archive directory
+
+    Returns:
+        List of metadata dicts
+    """
+    if not deliberations_dir.exists():
+        return []
+
+    archive = []
+    # Directory names start with the timestamp, so name order is chronological
+    for path in sorted(deliberations_dir.glob("*/metadata.json")):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                archive.append(json.load(f))
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Selection: skipping unreadable {path}: {e}")
+    return archive
+
+
+def replay_evaluation(
+    archive: List[Dict[str, Any]],
+    strategy: str = "thompson",
+    council_size: int = 2,
+    seed: Optional[int] = 0
+) -> Dict[str, Any]:
+    """
+    Offline replay evaluation of a selection policy over archived deliberations.
+
+    Deliberations are replayed in order. At each one the policy picks
+    council_size members from the models that actually took part (the only
+    models whose reward is known), its reward is the mean reward of its picks,
+    and it then learns from the full logged outcome. The same is measured for a
+    uniformly random pick and for the best fixed subset in hindsight.
+
+    Args:
+        archive: Archived metadata, oldest first
+        strategy: "thompson" or "ucb"
+        council_size: Members picked per deliberation
+        seed: Random seed for the policy and the random baseline
+
+    Returns:
+        Dict with policy, random and hindsight mean rewards and a per-model summary
+    """
+    selector = CouncilSelector(strategy, seed=seed)
+    rng = np.random.default_rng(seed)
+    policy_rewards, random_rewards, evaluated = [], [], []
+
+    for metadata in archive:
+        rewards = deliberation_rewards(metadata)
+        if len(rewards) <= council_size:
+            # Nothing to choose between; still learn from it
+            selector.observe(metadata)
+            continue
+
+        models = list(rewards)
+        picked = selector.select(models, council_size)
+        policy_rewards.append(float(np.mean([rewards[m] for m in picked])))
+
+        baseline = rng.choice(len(models), size=council_size, replace=False)
+        random_rewards.append(float(np.mean([rewards[models[i]] for i in baseline])))
+
+        evaluated.append(rewards)
+        selector.observe(metadata)
+
+    # Best fixed models in hindsight: highest average reward where they took part
+    totals: Dict[str, List[float]] = {}
+    for rewards in evaluated:
+        for model, reward in rewards.items():
+            totals.setdefault(model, []).append(reward)
+    fixed = sorted(totals, key=lambda m: -np.mean(totals[m]))[:council_size]
+    hindsight = [
+        float(np.mean([rewards[m] for m in fixed if m in rewards]))
+        for rewards in evaluated if any(m in rewards for m in fixed)
+    ]
+
+    def mean(values: List[float]) -> Optional[float]:
+        return round(float(np.mean(values)), 4) if values else None
+
+    return {
+        "strategy": strategy,
+        "council_size": council_size,
+        "deliberations": len(archive),
+        "evaluated": len(evaluated),
+        "policy_mean_reward": mean(policy_rewards),
+        "random_mean_reward": mean(random_rewards),
+        "best_fixed_mean_reward": mean(hindsight),
+        "best_fixed_models": fixed,
+        "models": selector.summary()
+    }
+
+
+_selector: Optional[CouncilSelector] = None
+
+
+def get_selector() -> CouncilSelector:
+    """
+    Return the process-wide selector, bootstrapped from the archive on first use.
+
+    Returns:
+        The shared CouncilSelector
+    """
+    global _selector
+    if _selector is None:
+        strategy = COUNCIL_SELECTION if COUNCIL_SELECTION in SELECTION_STRATEGIES else "thompson"
+        _selector = CouncilSelector(strategy)
+        archive = load_archived_metadata()
+        for metadata in archive:
+            _selector.observe(metadata)
+        logger.info(f"Selection: bootstrapped {strategy} policy from {_selector.rounds}/{len(archive)} deliberations")
+    return _selector
+
+
+def select_council_models() -> List[str]:
+    """
+    Choose the council members for the next deliberation.
+
+    Returns:
+        COUNCIL_MODELS when selection is off, otherwise COUNCIL_SELECTION_SIZE
+        models picked from CANDIDATE_MODELS by the bandit policy
+    """
+    if COUNCIL_SELECTION not in SELECTION_STRATEGIES:
+        return list(COUNCIL_MODELS)
+
+    models = get_selector().select(CANDIDATE_MODELS, COUNCIL_SELECTION_SIZE)
+    logger.info(f"Selection: {COUNCIL_SELECTION} picked {models}")
+    return models
+
+
+def record_deliberation(metadata: Dict[str, Any]):
+    """
+    Feed a finished deliberation back into the policy (online learning).
+
+    Args:
+        metadata: Council metadata with 'aggregate_rankings' and 'model_latency'
+    """
+    if COUNCIL_SELECTION not in SELECTION_STRATEGIES:
+        return
+    rewards = get_selector().observe(metadata)
+    if rewards:
+        logger.debug(f"Selection: rewards {rewards}")
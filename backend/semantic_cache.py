@@ -0,0 +1,260 @@
+"""Semantic answer cache for LLM Council.
+
+Paraphrased repeats of a question miss the exact-match result cache. This
+cache embeds standalone questions locally (similarity.embed_question), keeps
+the vectors of archived council deliberations in a NumPy matrix, and answers
+a new question from the archive when its nearest neighbour is similar enough,
+fresh enough and does not name different entities or numbers.
+
+The matrix grows by doubling up to SEMANTIC_CACHE_MAX_ENTRIES rows and then
+reuses the stalest row, so indexing stays linear. Building the index reads
+the archive, so async code calls this module through asyncio.to_thread.
+"""
+
+import re
+import time
+import logging
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+
+from .config import (
+    SEMANTIC_CACHE, SEMANTIC_CACHE_THRESHOLD, SEMANTIC_CACHE_MAX_ENTRIES,
+    RESULT_CACHE_TTL_S, DEFAULT_COUNCIL_PROFILE
+)
+from .similarity import embed_question, tokenize
+from .deliberations import list_deliberations, read_question, load_deliberation_result
+
+logger = logging.getLogger("llm_council.semantic_cache")
+
+# Rows allocated for the first entries; the matrix doubles from there
+INITIAL_CAPACITY = 64
+
+# Upper edges of the best-similarity histogram buckets
+SIMILARITY_BUCKETS = (0.5, 0.6, 0.7, 0.8, 0.9, 1.0)
+
+KEY_TERM_PATTERN = re.compile(r"\b(?:\d+(?:\.\d+)?|[A-Z][A-Za-z0-9]*[A-Z0-9][A-Za-z0-9]*|(?<=\s)[A-Z][a-z]+)\b")
+
+
+def key_terms(question: str) -> set:
+    """Numbers, acronyms, mixed-case names and capitalized words after the first."""
+    return {term.lower() for term in KEY_TERM_PATTERN.findall(question)}
+
+
+def terms_compatible(question: str, other: str) -> bool:
+    """
+    Whether neither question names an entity or number the other lacks.
+
+    Guards against near-identical questions about different things
+    ("capital of France" versus "capital of Spain"). Key terms are matched
+    against the other question's key terms as well as its tokens, since
+    tokenize splits decimals ("3.12") that key_terms keeps whole.
+    """
+    terms, other_terms = key_terms(question), key_terms(other)
+    words, other_words = set(tokenize(question)) | terms, set(tokenize(other)) | other_terms
+    return terms <= other_words and other_terms <= words
+
+
+class SemanticCache:
+    """Nearest-neighbour index of question embeddings over archived deliberations."""
+
+    def __init__(self, max_entries: int = SEMANTIC_CACHE_MAX_ENTRIES):
+        self.max_entries = max(1, max_entries)
+        # entries[i] describes row i of vectors; rows past len(entries) are unused capacity
+        self.entries: List[Dict[str, Any]] = []
+        self.vectors: Optional[np.ndarray] = None
+        self.next_row = 0  # Row to overwrite once full (the stalest)
+        self.lock = threading.Lock()
+        self.lookups = 0
+        self.hits = 0
+        self.hit_similarities: List[float] = []
+        self.histogram = [0] * len(SIMILARITY_BUCKETS)
+
+    def add(self, question: str, path: str, created_at: float, profile: str):
+        """
+        Index a deliberation.
+
+        Args:
+            question: The standalone question it answered
+            path: Deliberation archive path
+            created_at: Unix timestamp of the deliberation
+            profile: Council profile it ran with
+        """
+        vector = embed_question(question)
+        entry = {"question": question, "path": path, "created_at": created_at, "profile": profile}
+
+        with self.lock:
+            if len(self.entries) < self.max_entries:
+                row = len(self.entries)
+                if self.vectors is None or row == len(self.vectors):
+                    capacity = min(self.max_entries, max(INITIAL_CAPACITY, 2 * row))
+                    grown = np.zeros((capacity, vector.shape[0]), dtype=vector.dtype)
+                    if self.vectors is not None:
+                        grown[:row] = self.vectors
+                    self.vectors = grown
+                self.entries.append(entry)
+            else:
+                # Entries are added oldest first, so rows are reused in the same order
+                row = self.next_row
+                self.entries[row] = entry
+                self.next_row = (row + 1) % self.max_entries
+            self.vectors[row] = vector
+
+    def nearest(
+        self,
+        question: str,
+        profile: str,
+        ttl_s: float,
+        threshold: float
+    ) -> Optional[Tuple[Dict[str, Any], float]]:
+        """
+        Find the most similar fresh deliberation for a question.
+
+        Args:
+            question: The new question
+            profile: Council profile requested (only its own deliberations match)
+            ttl_s: Maximum deliberation age in seconds
+            threshold: Minimum cosine similarity for a hit
+
+        Returns:
+            Tuple of (entry, similarity) on a hit, otherwise None
+        """
+        query = embed_question(question)
+        best = 0.0
+        match = None
+
+        with self.lock:
+            self.lookups += 1
+            if self.entries:
+                scores = self.vectors[:len(self.entries)] @ query
+                now = time.time()
+                for index in np.argsort(-scores):
+                    entry = self.entries[index]
+                    if entry["profile"] != profile or now - entry["created_at"] > ttl_s:
+                        continue
+                    best = float(scores[index])
+                    if best >= threshold and terms_compatible(question, entry["question"]):
+                        match = (entry, best)
+                    break
+
+            bucket = next(i for i, edge in enumerate(SIMILARITY_BUCKETS) if best <= edge or edge == 1.0)
+            self.histogram[bucket] += 1
+            if match:
+                self.hits += 1
+                self.hit_similarities.append(best)
+        return match
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit, miss and similarity statistics since startup."""
+        return {
+            "enabled": SEMANTIC_CACHE == "on",
+            "threshold": SEMANTIC_CACHE_THRESHOLD,
+            "indexed": len(self.entries),
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "misses": self.lookups - self.hits,
+            "hit_rate": round(self.hits / self.lookups, 3) if self.lookups else 0.0,
+            "mean_hit_similarity": (
+                round(sum(self.hit_similarities) / len(self.hit_similarities), 3) if self.hit_similarities else None
+            ),
+            "best_similarity_histogram": {
+                f"<={edge}": count for edge, count in zip(SIMILARITY_BUCKETS, self.histogram)
+            }
+        }
+
+
+_semantic_cache: Optional[SemanticCache] = None
+_semantic_cache_lock = threading.Lock()
+
+
+def get_semantic_cache() -> SemanticCache:
+    """Process-wide semantic cache, indexed from the deliberation archive on first use."""
+    global _semantic_cache
+    if _semantic_cache is not None:
+        return _semantic_cache
+    with _semantic_cache_lock:
+        if _semantic_cache is not None:
+            return _semantic_cache
+        cache = SemanticCache()
+        if SEMANTIC_CACHE == "on":
+            # Newest first from the archive; index oldest first so eviction drops the stalest
+            archived = list_deliberations(limit=cache.max_entries)
+            for metadata in reversed(archived):
+                if metadata.get("mode", "council") != "council" or metadata.get("history_messages"):
+                    continue
+                question = read_question(Path(metadata["path"]))
+                if not question:
+                    continue
+                try:
+                    created_at = datetime.fromisoformat(metadata["timestamp"]).timestamp()
+                except (KeyError, ValueError):
+                    continue
+                profile = (metadata.get("profile") or {}).get("profile") or DEFAULT_COUNCIL_PROFILE
+                cache.add(question, metadata["path"], created_at, profile)
+            logger.info(f"Semantic cache indexed {len(cache.entries)} archived deliberations")
+        _semantic_cache = cache
+    return _semantic_cache
+
+
+def lookup_similar(user_query: str, settings: Dict[str, Any]) -> Optional[Tuple[List, List, Dict, Dict]]:
+    """
+    Answer a standalone question from a similar archived deliberation.
+
+    Blocks on the archive (the first call builds the index), so async
+    callers run it through asyncio.to_thread.
+
+    Args:
+        user_query: The user's question (callers skip this when there is history)
+        settings: Resolved profile settings
+
+    Returns:
+        (stage1_results, stage2_results, stage3_result, metadata) with a
+        metadata['cache'] report, or None on a miss or when the cache is off
+    """
+    if SEMANTIC_CACHE != "on":
+        return None
+
+    ttl_s = RESULT_CACHE_TTL_S if settings.get("cache_ttl_s") is None else settings["cache_ttl_s"]
+    threshold = settings.get("semantic_threshold") or SEMANTIC_CACHE_THRESHOLD
+    if ttl_s <= 0:
+        return None
+
+    start = time.perf_counter()
+    match = get_semantic_cache().nearest(user_query, settings["profile"], ttl_s, threshold)
+    if match is None:
+        return None
+
+    entry, similarity = match
+    result = load_deliberation_result(entry["path"])
+    if result is None:
+        return None
+
+    stage1_results, stage2_results, stage3_result, metadata = result
+    metadata["cache"] = {
+        "hit": True,
+        "type": "semantic",
+        "similarity": round(similarity, 3),
+        "matched_question": entry["question"][:200],
+        "age_s": round(time.time() - entry["created_at"], 1),
+        "lookup_ms": round((time.perf_counter() - start) * 1000, 2),
+        "original_deliberation_path": entry["path"]
+    }
+    logger.info(f"Semantic cache hit (similarity {similarity:.3f}): {entry['question'][:80]}")
+    return stage1_results, stage2_results, stage3_result, metadata
+
+
+def remember_deliberation(user_query: str, metadata: Dict[str, Any]):
+    """
+    Index a freshly archived standalone deliberation (blocking, like lookup_similar).
+
+    Args:
+        user_query: The question it answered
+        metadata: Council metadata with 'deliberation_path' and 'profile'
+    """
+    if SEMANTIC_CACHE != "on" or not metadata.get("deliberation_path"):
+        return
+    profile = (metadata.get("profile") or {}).get("profile") or DEFAULT_COUNCIL_PROFILE
+    get_semantic_cache().add(user_query, metadata["deliberation_path"], time.time(), profile)
@@ -0,0 +1,337 @@
+"""Shared cache backend for LLM Council.
+
+In-process caches vanish on restart and are not shared between uvicorn
+workers. This module provides one key-value cache with TTLs, a size limit,
+atomic get-or-set and counters, and least-recently-used eviction, in two
+backends:
+
+- sqlite: a single SQLite database in WAL mode, shared by every worker on the
+  host and kept across restarts (the default)
+- memory: a process-local dictionary, for tests or single-worker setups
+
+The result, search, idempotency and stage caches store their entries here
+(see result_cache.ResultCache), and API key rate limits count requests here.
+Values must be JSON-serializable.
+
+Calls block (SQLite may wait on another worker's write lock), so async code
+runs them with asyncio.to_thread. Lookups are plain reads that never take the
+write lock; their recency updates are batched into the next write.
+"""
+
+import json
+import time
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from .config import SHARED_CACHE_BACKEND, SHARED_CACHE_PATH, SHARED_CACHE_MAX_MB
+
+logger = logging.getLogger("llm_council.shared_cache")
+
+# Writes between eviction passes
+EVICT_EVERY = 100
+
+# Recency is only recorded when an entry's last recorded use is older than
+# this, and pending updates are written with the next write (or once this
+# many are queued); LRU eviction does not need finer resolution
+TOUCH_INTERVAL_S = 60.0
+TOUCH_BATCH = 100
+
+
+def _resolve(default: Union[Any, Callable[[], Any]]) -> Any:
+    return default() if callable(default) else default
+
+
+class MemoryCacheBackend:
+    """Process-local backend: an LRU dictionary bounded by serialized size."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.entries: "OrderedDict[Tuple[str, str], Tuple[str, Optional[float]]]" = OrderedDict()
+        self.size = 0
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _live(self, item: Tuple[str, str]) -> Optional[str]:
+        entry = self.entries.get(item)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.time():
+            self._drop(item)
+            return None
+        self.entries.move_to_end(item)
+        return value
+
+    def _drop(self, item: Tuple[str, str]):
+        value, _ = self.entries.pop(item)
+        self.size -= len(value)
+
+    def _store(self, item: Tuple[str, str], value: Any, ttl_s: Optional[float]):
+        encoded = json.dumps(value, ensure_ascii=False)
+        if item in self.entries:
+            self._drop(item)
+        self.entries[item] = (encoded, time.time() + ttl_s if ttl_s else None)
+        self.size += len(encoded)
+        while self.size > self.max_bytes and len(self.entries) > 1:
+            self._drop(next(iter(self.entries)))
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        with self.lock:
+            value = self._live((namespace, key))
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return json.loads(value)
+
+    def set(self, namespace: str, key: str, value: Any, ttl_s: Optional[float] = None):
+        with self.lock:
+            self._store((namespace, key), value, ttl_s)
+
+    def get_or_set(
+        self, namespace: str, key: str, default: Union[Any, Callable[[], Any]], ttl_s: Optional[float] = None
+    ) -> Tuple[Any, bool]:
+        with self.lock:
+            value = self._live((namespace, key))
+            if value is not None:
+                self.hits += 1
+                return json.loads(value), False
+            self.misses += 1
+            value = _resolve(default)
+            self._store((namespace, key), value, ttl_s)
+            return value, True
+
+    def incr(self, namespace: str, key: str, amount: int = 1, ttl_s: Optional[float] = None) -> int:
+        with self.lock:
+            item = (namespace, key)
+            value = self._live(item)
+            if value is None:
+                self._store(item, amount, ttl_s)
+                return amount
+            # Keeps the counter's original expiry, so windows do not slide
+            count = json.loads(value) + amount
+            encoded = json.dumps(count)
+            self.size += len(encoded) - len(value)
+            self.entries[item] = (encoded, self.entries[item][1])
+            return count
+
+    def delete(self, namespace: str, key: str):
+        with self.lock:
+            if (namespace, key) in self.entries:
+                self._drop((namespace, key))
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            namespaces: Dict[str, int] = {}
+            for namespace, _ in self.entries:
+                namespaces[namespace] = namespaces.get(namespace, 0) + 1
+            return {"entries": namespaces, "bytes": self.size}
+
+
+class SQLiteCacheBackend:
+    """Backend on one SQLite database in WAL mode, shared by every process on the host."""
+
+    def __init__(self, path: str, max_bytes: int):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.writes = 0
+        self.hits = 0
+        self.misses = 0
+        self.touched: Dict[Tuple[str, str], float] = {}
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit; multi-statement operations take the write lock with BEGIN IMMEDIATE
+        self.db = sqlite3.connect(str(self.path), timeout=10.0, isolation_level=None, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            " namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL,"
+            " created_at REAL NOT NULL, expires_at REAL, accessed_at REAL NOT NULL, size INTEGER NOT NULL,"
+            " PRIMARY KEY (namespace, key))"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed_at)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS cache_expires ON cache (expires_at)")
+
+    def _live(self, namespace: str, key: str, now: float) -> Optional[str]:
+        row = self.db.execute(
+            "SELECT value, expires_at FROM cache WHERE namespace = ? AND key = ?", (namespace, key)
+        ).fetchone()
+        if row is None:
+            return None
+        if row[1] is not None and row[1] <= now:
+            self.db.execute("DELETE FROM cache WHERE namespace = ? AND key = ?", (namespace, key))
+            return None
+        self.db.execute(
+            "UPDATE cache SET accessed_at = ? WHERE namespace = ? AND key = ?", (now, namespace, key)
+        )
+        return row[0]
+
+    def _store(self, namespace: str, key: str, value: Any, ttl_s: Optional[float], now: float):
+        encoded = json.dumps(value, ensure_ascii=False)
+        self.db.execute(
+            "INSERT OR REPLACE INTO cache (namespace, key, value, created_at, expires_at, accessed_at, size)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (namespace, key, encoded, now, now + ttl_s if ttl_s else None, now, len(encoded))
+        )
+        self.writes += 1
+
+    def _flush_touches(self):
+        """Write the queued recency updates (inside a write transaction)."""
+        if self.touched:
+            self.db.executemany(
+                "UPDATE cache SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                [(at, namespace, key) for (namespace, key), at in self.touched.items()]
+            )
+            self.touched.clear()
+
+    def _transaction(self, operation: Callable[[float], Any]) -> Any:
+        """Run operation(now) holding the database write lock (caller holds self.lock)."""
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            self._flush_touches()
+            result = operation(time.time())
+            self.db.execute("COMMIT")
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        if self.writes >= EVICT_EVERY:
+            self.evict()
+        return result
+
+    def _write(self, operation: Callable[[float], Any]) -> Any:
+        with self.lock:
+            return self._transaction(operation)
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        now = time.time()
+        with self.lock:
+            # A plain read: in WAL mode it neither takes nor waits for the write lock
+            row = self.db.execute(
+                "SELECT value, expires_at, accessed_at FROM cache WHERE namespace = ? AND key = ?",
+                (namespace, key)
+            ).fetchone()
+            if row is not None and row[1] is not None and row[1] <= now:
+                # Expired rows are removed by the next eviction pass
+                row = None
+            if row is not None and now - row[2] >= TOUCH_INTERVAL_S:
+                self.touched[(namespace, key)] = now
+                if len(self.touched) >= TOUCH_BATCH:
+                    self._transaction(lambda _: None)
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, namespace: str, key: str, value: Any, ttl_s: Optional[float] = None):
+        self._write(lambda now: self._store(namespace, key, value, ttl_s, now))
+
+    def get_or_set(
+        self, namespace: str, key: str, default: Union[Any, Callable[[], Any]], ttl_s: Optional[float] = None
+    ) -> Tuple[Any, bool]:
+        def operation(now: float) -> Tuple[Any, bool]:
+            value = self._live(namespace, key, now)
+            if value is not None:
+                return json.loads(value), False
+            value = _resolve(default)
+            self._store(namespace, key, value, ttl_s, now)
+            return value, True
+
+        value, created = self._write(operation)
+        if created:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value, created
+
+    def incr(self, namespace: str, key: str, amount: int = 1, ttl_s: Optional[float] = None) -> int:
+        def operation(now: float) -> int:
+            if self._live(namespace, key, now) is None:
+                self._store(namespace, key, amount, ttl_s, now)
+                return amount
+            # Keeps the counter's original expiry, so windows do not slide
+            self.db.execute(
+                "UPDATE cache SET value = CAST(value AS INTEGER) + ? WHERE namespace = ? AND key = ?",
+                (amount, namespace, key)
+            )
+            return int(self.db.execute(
+                "SELECT value FROM cache WHERE namespace = ? AND key = ?", (namespace, key)
+            ).fetchone()[0])
+
+        return self._write(operation)
+
+    def delete(self, namespace: str, key: str):
+        with self.lock:
+            self.db.execute("DELETE FROM cache WHERE namespace = ? AND key = ?", (namespace, key))
+
+    def evict(self):
+        """Drop expired entries, then the least recently used until the cache fits max_bytes."""
+        self.writes = 0
+        now = time.time()
+        self.db.execute("DELETE FROM cache WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+        total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+        evicted = 0
+        while total > self.max_bytes:
+            rows = self.db.execute(
+                "SELECT namespace, key, size FROM cache ORDER BY accessed_at LIMIT 100"
+            ).fetchall()
+            if not rows:
+                break
+            for namespace, key, size in rows:
+                if total <= self.max_bytes:
+                    break
+                self.db.execute("DELETE FROM cache WHERE namespace = ? AND key = ?", (namespace, key))
+                total -= size
+                evicted += 1
+        if evicted:
+            logger.info(f"Shared cache evicted {evicted} entries to fit {self.max_bytes} bytes")
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            namespaces = dict(self.db.execute("SELECT namespace, COUNT(*) FROM cache GROUP BY namespace").fetchall())
+            total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+        return {"entries": namespaces, "bytes": total}
+
+
+CacheBackend = Union[MemoryCacheBackend, SQLiteCacheBackend]
+
+_shared_cache: Optional[CacheBackend] = None
+
+
+def get_shared_cache() -> CacheBackend:
+    """
+    Process-wide shared cache for SHARED_CACHE_BACKEND.
+
+    The "files" setting keeps per-entry JSON files for the result caches; its
+    counters (API rate limits) then live in memory.
+    """
+    global _shared_cache
+    if _shared_cache is None:
+        max_bytes = int(SHARED_CACHE_MAX_MB * 1024 * 1024)
+        if SHARED_CACHE_BACKEND == "sqlite":
+            _shared_cache = SQLiteCacheBackend(SHARED_CACHE_PATH, max_bytes)
+            logger.info(f"Shared cache: SQLite at {SHARED_CACHE_PATH}")
+        else:
+            _shared_cache = MemoryCacheBackend(max_bytes)
+    return _shared_cache
+
+
+def shared_cache_stats() -> Dict[str, Any]:
+    """Backend, entry counts per namespace, size and this process's hit counts."""
+    cache = get_shared_cache()
+    lookups = cache.hits + cache.misses
+    return {
+        "backend": SHARED_CACHE_BACKEND,
+        "max_bytes": cache.max_bytes,
+        **cache.stats(),
+        "hits": cache.hits,
+        "misses": cache.misses,
+        "hit_rate": round(cache.hits / lookups, 3) if lookups else 0.0
+    }
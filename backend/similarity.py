@@ -0,0 +1,187 @@
+"""Local text similarity for LLM Council.
+
+Hashed n-gram TF-IDF vectors and cosine similarity matrices computed with
+NumPy, so agreement between responses can be measured without any extra
+model calls.
+"""
+
+import re
+import zlib
+import logging
+from typing import List, Dict, Any, Tuple
+
+import numpy as np
+
+logger = logging.getLogger("llm_council.similarity")
+
+# Number of hash buckets for n-gram features
+HASH_FEATURES = 2 ** 16
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase alphanumeric tokens.
+
+    Args:
+        text: The text to tokenize
+
+    Returns:
+        List of tokens
+    """
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def _hashed_ngram_counts(
+    text: str,
+    n_features: int,
+    ngram_range: Tuple[int, int]
+) -> np.ndarray:
+    """Count hashed word n-grams of a single text into a dense vector."""
+    tokens = tokenize(text)
+    indices = []
+    low, high = ngram_range
+    for n in range(low, high + 1):
+        for i in range(len(tokens) - n + 1):
+            gram = " ".join(tokens[i:i + n])
+            # crc32 is stable across processes, unlike the builtin hash()
+            indices.append(zlib.crc32(gram.encode("utf-8")) % n_features)
+
+    if not indices:
+        return np.zeros(n_features, dtype=np.float32)
+
+    return np.bincount(indices, minlength=n_features).astype(np.float32)
+
+
+def tfidf_vectors(
+    texts: List[str],
+    n_features: int = HASH_FEATURES,
+    ngram_range: Tuple[int, int] = (1, 2)
+) -> np.ndarray:
+    """
+    Build L2-normalised TF-IDF vectors over hashed word n-grams.
+
+    Args:
+        texts: Documents to vectorize
+        n_features: Number of hash buckets
+        ngram_range: Inclusive (min, max) n-gram sizes
+
+    Returns:
+        Array of shape (len(texts), n_features)
+    """
+    if not texts:
+        return np.zeros((0, n_features), dtype=np.float32)
+
+    counts = np.stack([_hashed_ngram_counts(t, n_features, ngram_range) for t in texts])
+
+    # Sublinear term frequency dampens long, repetitive answers
+    tf = np.zeros_like(counts)
+    nonzero = counts > 0
+    tf[nonzero] = 1.0 + np.log(counts[nonzero])
+
+    # Smoothed inverse document frequency
+    doc_freq = nonzero.sum(axis=0)
+    idf = np.log((1.0 + len(texts)) / (1.0 + doc_freq)) + 1.0
+
+    vectors = tf * idf.astype(np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def cosine_similarity_matrix(vectors: np.ndarray) -> np.ndarray:
+    """
+    Compute pairwise cosine similarities of L2-normalised vectors.
+
+    Args:
+        vectors: Array of shape (n, d) with unit-length rows
+
+    Returns:
+        Symmetric (n, n) similarity matrix
+    """
+    return np.clip(vectors @ vectors.T, 0.0, 1.0)
+
+
+def text_similarity_matrix(texts: List[str]) -> np.ndarray:
+    """
+    Compute the pairwise TF-IDF cosine similarity matrix for a list of texts.
+
+    Args:
+        texts: Documents to compare
+
+    Returns:
+        Symmetric (n, n) similarity matrix
+    """
+    return cosine_similarity_matrix(tfidf_vectors(texts))
+
+
+def summarize_similarity(matrix: np.ndarray) -> Dict[str, Any]:
+    """
+    Summarize the off-diagonal entries of a similarity matrix.
+
+    Args:
+        matrix: Symmetric (n, n) similarity matrix
+
+    Returns:
+        Dict with mean and min pairwise similarity and the index of the
+        most central document (highest mean similarity to the others)
+    """
+    n = matrix.shape[0]
+    if n < 2:
+        return {"mean": 1.0, "min": 1.0, "central_index": 0 if n else None}
+
+    off_diagonal = matrix[~np.eye(n, dtype=bool)].reshape(n, n - 1)
+    return {
+        "mean": float(off_diagonal.mean()),
+        "min": float(off_diagonal.min()),
+        "central_index": int(off_diagonal.mean(axis=1).argmax())
+    }
+
+
+# Question words that carry no topic; dropped before embedding questions
+QUESTION_STOPWORDS = frozenset(
+    "a an the and or of to in on for with about is are was were be been do does did can "
+    "could would should will what whats which who how why when where me my i you your we "
+    "our it its this that these those there please tell explain give some any".split()
+)
+
+
+def _stem(token: str) -> str:
+    """Strip common English suffixes so inflections share features."""
+    for suffix in ("ing", "ies", "es", "ed", "s"):
+        if len(token) > len(suffix) + 3 and token.endswith(suffix):
+            return token[:-len(suffix)] + ("y" if suffix == "ies" else "")
+    return token
+
+
+def embed_question(text: str, n_features: int = 2 ** 14) -> np.ndarray:
+    """
+    Embed a question as an L2-normalised hashed vector of stemmed words and
+    character 4-grams, so rewordings and inflections of a question land close
+    together. Unlike tfidf_vectors the result does not depend on a corpus, so
+    it can be stored in an incremental index.
+
+    Args:
+        text: The question
+        n_features: Number of hash buckets
+
+    Returns:
+        Vector of shape (n_features,)
+    """
+    tokens = [_stem(t) for t in tokenize(text) if t not in QUESTION_STOPWORDS]
+    indices = []
+    for token in tokens:
+        indices.append(zlib.crc32(f"w:{token}".encode("utf-8")) % n_features)
+        padded = f"<{token}>"
+        for i in range(len(padded) - 3):
+            indices.append(zlib.crc32(f"c:{padded[i:i + 4]}".encode("utf-8")) % n_features)
+    for first, second in zip(tokens, tokens[1:]):
+        indices.append(zlib.crc32(f"b:{first} {second}".encode("utf-8")) % n_features)
+
+    if not indices:
+        return np.zeros(n_features, dtype=np.float32)
+
+    counts = np.bincount(indices, minlength=n_features).astype(np.float32)
+    vector = np.log1p(counts)
+    return vector / np.linalg.norm(vector)
@@ -0,0 +1,77 @@
+"""Singleflight request coalescing for LLM Council.
+
+When several callers ask for the same work at once (a retrying RSS job and a
+user asking the same question), only the first caller - the leader - starts
+it; the others attach to the in-flight task and receive its result, or its
+exception if it fails. The work runs as its own task, so a caller that
+disconnects does not cancel it for everyone else.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+logger = logging.getLogger("llm_council.singleflight")
+
+
+class SingleFlight:
+    """Deduplicates concurrent calls that share a key."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls: Dict[str, asyncio.Task] = {}
+        self.leaders = 0
+        self.coalesced = 0
+        self.failures = 0
+
+    def _finished(self, key: str, task: asyncio.Task):
+        if self.calls.get(key) is task:
+            del self.calls[key]
+        if task.cancelled():
+            self.failures += 1
+        elif task.exception() is not None:
+            # Retrieving the exception here also keeps asyncio from warning about it
+            self.failures += 1
+            logger.warning(f"{self.name}: in-flight call {key[:12]} failed: {task.exception()}")
+
+    async def do(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Run factory() once per key at a time.
+
+        Args:
+            key: Identifies equivalent work
+            factory: Starts the work; only called by the leader
+
+        Returns:
+            Tuple of (result, True if this caller led the call). Every caller
+            receives the same result object.
+
+        Raises:
+            Whatever the leader's work raised, in every attached caller
+        """
+        task = self.calls.get(key)
+        leader = task is None
+        if leader:
+            task = asyncio.create_task(factory())
+            self.calls[key] = task
+            self.leaders += 1
+            task.add_done_callback(lambda done, key=key: self._finished(key, done))
+        else:
+            self.coalesced += 1
+            logger.info(f"{self.name}: attached to in-flight call {key[:12]}")
+
+        # Shield so one caller's cancellation does not cancel the shared task
+        return await asyncio.shield(task), leader
+
+    def stats(self) -> Dict[str, Any]:
+        """Leader, coalesced and failure counts since startup."""
+        return {
+            "in_flight": len(self.calls),
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+            "failures": self.failures
+        }
+
+
+# Coalesces identical council deliberations (run_full_council)
+council_flight = SingleFlight("council")
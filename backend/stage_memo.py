@@ -0,0 +1,103 @@
+"""Stage-level memoization for LLM Council.
+
+Each stage's output is stored under a hash of exactly the inputs it was
+computed from: Stage 2 under the question and the Stage 1 answers it ranked,
+Stage 3 under those plus the rankings and the chairman. Regenerating the
+synthesis (or the rankings and synthesis) of a stored assistant message then
+starts from the stored Stage 1 answers and recovers the Stage 2 details the
+conversation file does not keep (label mapping, aggregate rankings, judge
+weights) instead of re-running the council.
+"""
+
+import hashlib
+import json
+import logging
+from typing import List, Dict, Any, Optional
+
+from .config import STAGE_MEMO, STAGE_MEMO_DIR, STAGE_MEMO_MAX_ENTRIES, STAGE_MEMO_TTL_S
+from .result_cache import ResultCache, normalize_question
+
+logger = logging.getLogger("llm_council.stage_memo")
+
+
+def stage_input_hash(stage: str, user_query: str, stage1_results: List[Dict[str, Any]], **inputs: Any) -> str:
+    """
+    Content hash of a stage's inputs.
+
+    Only the model and answer text of each Stage 1 result count, so latency
+    and usage figures do not change the hash.
+
+    Args:
+        stage: "stage2" or "stage3"
+        user_query: The user's question
+        stage1_results: Stage 1 answers the stage consumes, in council order
+        **inputs: Any other inputs (rankings, chairman, ranking mode)
+
+    Returns:
+        Hex digest identifying the stage computation
+    """
+    parts = {
+        "stage": stage,
+        "question": normalize_question(user_query),
+        "stage1": [[result["model"], result.get("response", "")] for result in stage1_results],
+        **inputs
+    }
+    encoded = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def stage2_input_hash(user_query: str, stage1_results: List[Dict[str, Any]]) -> str:
+    """Hash of the inputs to Stage 2 (the question and the Stage 1 answers)."""
+    return stage_input_hash("stage2", user_query, stage1_results)
+
+
+def stage3_input_hash(
+    user_query: str,
+    stage1_results: List[Dict[str, Any]],
+    stage2_results: List[Dict[str, Any]],
+    chairman: str
+) -> str:
+    """Hash of the inputs to Stage 3 (Stage 2's inputs, the rankings and the chairman)."""
+    rankings = [[result["model"], result.get("ranking", "")] for result in stage2_results]
+    return stage_input_hash("stage3", user_query, stage1_results, stage2=rankings, chairman=chairman)
+
+
+_stage_memo: Optional[ResultCache] = None
+
+
+def get_stage_memo() -> ResultCache:
+    """Process-wide stage memo."""
+    global _stage_memo
+    if _stage_memo is None:
+        _stage_memo = ResultCache(directory=STAGE_MEMO_DIR, max_entries=STAGE_MEMO_MAX_ENTRIES)
+    return _stage_memo
+
+
+def recall_stage(input_hash: str) -> Optional[Dict[str, Any]]:
+    """
+    Return a memoized stage output.
+
+    Args:
+        input_hash: Hash from stage2_input_hash() or stage3_input_hash()
+
+    Returns:
+        The stored output, or None when absent, expired or memoization is off
+    """
+    if STAGE_MEMO != "on":
+        return None
+    entry = get_stage_memo().get(input_hash, STAGE_MEMO_TTL_S)
+    return entry["result"] if entry else None
+
+
+def memoize_stage(input_hash: str, output: Dict[str, Any]):
+    """
+    Store a stage output under its input hash (replacing any earlier output).
+
+    Args:
+        input_hash: Hash from stage2_input_hash() or stage3_input_hash()
+        output: JSON-serializable stage output
+    """
+    if STAGE_MEMO != "on":
+        return
+    get_stage_memo().put(input_hash, output, STAGE_MEMO_TTL_S)
+    logger.debug(f"Memoized stage output {input_hash[:12]}")
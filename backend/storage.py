@@ -156,6 +156,34 @@ def add_assistant_message(
     save_conversation(conversation)
 
 
+def replace_assistant_stages(
+    conversation_id: str,
+    message_position: int,
+    stage2: List[Dict[str, Any]],
+    stage3: Dict[str, Any]
+):
+    """
+    Replace the Stage 2 and Stage 3 results of a stored assistant message.
+
+    Args:
+        conversation_id: Conversation identifier
+        message_position: Index of the assistant message in the messages list
+        stage2: New model rankings
+        stage3: New synthesized response
+    """
+    conversation = get_conversation(conversation_id)
+    if conversation is None:
+        raise ValueError(f"Conversation {conversation_id} not found")
+
+    message = conversation["messages"][message_position]
+    if message.get("role") != "assistant":
+        raise ValueError(f"Message {message_position} is not an assistant message")
+
+    message["stage2"] = stage2
+    message["stage3"] = stage3
+    save_conversation(conversation)
+
+
 def update_conversation_title(conversation_id: str, title: str):
     """
     Update the title of a conversation.
@@ -170,3 +198,19 @@ def update_conversation_title(conversation_id: str, title: str):
 
     conversation["title"] = title
     save_conversation(conversation)
+
+
+def update_conversation_memory(conversation_id: str, memory: Dict[str, Any]):
+    """
+    Update the rolling memory (summary of older turns) of a conversation.
+
+    Args:
+        conversation_id: Conversation identifier
+        memory: Dict with 'summary' and 'summarized_turns'
+    """
+    conversation = get_conversation(conversation_id)
+    if conversation is None:
+        raise ValueError(f"Conversation {conversation_id} not found")
+
+    conversation["memory"] = memory
+    save_conversation(conversation)
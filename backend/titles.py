@@ -0,0 +1,200 @@
+"""Conversation titles for LLM Council.
+
+New conversations are titled locally from the first question: candidate
+phrases are the runs of words between stopwords and punctuation, scored by
+word degree over frequency (RAKE), and the best phrases up to TITLE_MAX_WORDS
+words become the title. That takes microseconds, so the conversation is named
+at once; in hybrid mode TITLE_MODEL then refines the title in the background.
+"""
+
+import re
+import asyncio
+import logging
+from functools import lru_cache
+from typing import List, Dict, Optional
+
+from . import storage
+from .config import TITLE_GENERATION, TITLE_MAX_WORDS, TITLE_CACHE_SIZE
+from .council import generate_conversation_title
+
+logger = logging.getLogger("llm_council.titles")
+
+DEFAULT_TITLE = "New Conversation"
+
+# Longest title kept, matching generate_conversation_title
+TITLE_MAX_CHARS = 50
+
+# Only the start of a long question is scanned; the topic is almost always there
+TITLE_SCAN_CHARS = 2000
+
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are aren't as at be because been
+before being below between both but by can can't cannot could couldn't did didn't do does
+doesn't doing don't down during each either else even ever every few for from further get
+gets getting give given go going got had hadn't has hasn't have haven't having he her here
+hers herself him himself his how however i i'd i'll i'm i've if in into is isn't it it's its
+itself just know let let's like make many may me might more most much must my myself need
+no nor not now of off on once one only or other our ours ourselves out over own please
+really same say shall she should shouldn't show so some such tell than thank thanks that
+that's the their theirs them themselves then there there's these they this those through
+to too under until up use used using very via want was wasn't way we well were weren't what
+what's when where which while who whom whose why will with won't would wouldn't yes yet you
+your yours yourself explain describe give help understand think question answer difference
+between best good better things thing something anything everything someone anyone
+""".split())
+
+WORD_PATTERN = re.compile(r"[A-Za-z0-9][A-Za-z0-9'+#]*(?:[.\-][A-Za-z0-9+#]+)*")
+BOUNDARY_PATTERN = re.compile(r"[,;:!?()\[\]{}\"“”<>|/\\\n]|[.](?=\s|$)|\s[-–—]\s")
+
+
+def _candidate_phrases(text: str) -> List[List[str]]:
+    """Split text into candidate phrases at punctuation and stopwords."""
+    phrases = []
+    for fragment in BOUNDARY_PATTERN.split(text[:TITLE_SCAN_CHARS]):
+        phrase: List[str] = []
+        for word in WORD_PATTERN.findall(fragment):
+            if word.lower() in STOPWORDS or word.isdigit() and len(word) < 3:
+                if phrase:
+                    phrases.append(phrase)
+                phrase = []
+            else:
+                phrase.append(word)
+        if phrase:
+            phrases.append(phrase)
+    return phrases
+
+
+def _format_word(word: str) -> str:
+    """Capitalize a title word, keeping acronyms and mixed case (GraphQL, iOS) as written."""
+    if word.lower() in ("vs", "vs."):
+        return word.lower()
+    if any(ch.isupper() for ch in word[1:]) or not word[0].isalpha() or word[0].isupper():
+        return word
+    return word[0].upper() + word[1:]
+
+
+def _extract_title(text: str, max_words: int) -> str:
+    """Build a title from the best-scoring candidate phrases (uncached)."""
+    phrases = _candidate_phrases(text)
+    if not phrases:
+        return DEFAULT_TITLE
+
+    # RAKE word scores: degree (co-occurring words, itself included) over frequency
+    frequency: Dict[str, int] = {}
+    degree: Dict[str, int] = {}
+    for phrase in phrases:
+        for word in phrase:
+            key = word.lower()
+            frequency[key] = frequency.get(key, 0) + 1
+            degree[key] = degree.get(key, 0) + len(phrase)
+    # Phrases longer than a title are scored on the part that fits
+    scores = [
+        sum(degree[w.lower()] / frequency[w.lower()] for w in phrase[:max_words]) for phrase in phrases
+    ]
+
+    # Best phrases first, earliest first on ties; keep each phrase once
+    chosen: List[int] = []
+    seen = set()
+    words_used = 0
+    for index in sorted(range(len(phrases)), key=lambda i: (-scores[i], i)):
+        key = " ".join(phrases[index]).lower()
+        if key in seen:
+            continue
+        if chosen and words_used + len(phrases[index]) > max_words:
+            continue
+        seen.add(key)
+        chosen.append(index)
+        words_used += min(len(phrases[index]), max_words)
+        if words_used >= max_words:
+            break
+
+    # Read the chosen phrases in question order
+    words = [word for index in sorted(chosen) for word in phrases[index]][:max_words]
+    title = " ".join(_format_word(word) for word in words)
+    if len(title) > TITLE_MAX_CHARS:
+        title = title[:TITLE_MAX_CHARS - 3] + "..."
+    return title
+
+
+_cached_extract_title = lru_cache(maxsize=TITLE_CACHE_SIZE)(_extract_title)
+
+
+def extract_title(text: str, max_words: int = TITLE_MAX_WORDS) -> str:
+    """
+    Title a conversation from its first question without a model call.
+
+    Args:
+        text: The first user message
+        max_words: Maximum words in the title
+
+    Returns:
+        A short title, or DEFAULT_TITLE when the text has no keyphrases
+    """
+    return _cached_extract_title(" ".join(text.split()), max_words)
+
+
+async def title_conversation(conversation_id: str, user_query: str) -> str:
+    """
+    Give a new conversation its first title.
+
+    The title is local unless TITLE_GENERATION is "llm", in which case this
+    waits for TITLE_MODEL as before.
+
+    Args:
+        conversation_id: Conversation identifier
+        user_query: The first user message
+
+    Returns:
+        The stored title
+    """
+    if TITLE_GENERATION == "llm":
+        title = await generate_conversation_title(user_query)
+    else:
+        title = extract_title(user_query)
+        logger.info(f"Local title: {title}")
+    storage.update_conversation_title(conversation_id, title)
+    return title
+
+
+async def upgrade_title(conversation_id: str, user_query: str) -> Optional[str]:
+    """
+    Replace the local title with a TITLE_MODEL title (hybrid mode only).
+
+    Args:
+        conversation_id: Conversation identifier
+        user_query: The first user message
+
+    Returns:
+        The new title, or None when not in hybrid mode or the model failed
+    """
+    if TITLE_GENERATION != "hybrid":
+        return None
+    try:
+        title = await generate_conversation_title(user_query)
+    except Exception as e:
+        logger.error(f"Title upgrade failed for {conversation_id}: {e}", exc_info=True)
+        return None
+    if title == DEFAULT_TITLE:
+        # The model failed; the local title stays
+        return None
+    storage.update_conversation_title(conversation_id, title)
+    return title
+
+
+# Keep references to background upgrade tasks so they are not garbage collected
+_background_tasks = set()
+
+
+def schedule_title_upgrade(conversation_id: str, user_query: str):
+    """
+    Upgrade the title in the background (no-op unless TITLE_GENERATION is "hybrid").
+
+    Args:
+        conversation_id: Conversation identifier
+        user_query: The first user message
+    """
+    if TITLE_GENERATION != "hybrid":
+        return
+    task = asyncio.create_task(upgrade_title(conversation_id, user_query))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
@@ -0,0 +1,275 @@
+"""Content-addressed audio cache for Stage 3 speech.
+
+Synthesizing a long answer is many sequential Polly calls. Finished audio is
+stored on disk under a hash of the text, voice, engine and format, so pressing
+play again (or seeking, served as byte ranges from the file) never
+re-synthesizes. The directory is kept under TTS_CACHE_MAX_MB by evicting the
+least recently played files.
+
+With TTS_PREFETCH on, answers likely to be played are synthesized in the
+background as soon as Stage 3 completes, on a small low-priority thread pool
+of their own, so pressing play finds the audio ready (or joins the synthesis
+already running).
+"""
+
+import os
+import time
+import asyncio
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from .config import (
+    TTS_CACHE, TTS_CACHE_DIR, TTS_CACHE_MAX_MB, POLLY_ENGINE,
+    TTS_PREFETCH, TTS_PREFETCH_VOICE, TTS_PREFETCH_MAX_CHARS, TTS_PREFETCH_WORKERS, TTS_PREFETCH_QUEUE
+)
+from .polly import synthesize_speech
+from .singleflight import SingleFlight
+
+logger = logging.getLogger("llm_council.tts_cache")
+
+# File extension and media type per Polly output format
+AUDIO_FORMATS = {
+    "mp3": ("mp3", "audio/mpeg"),
+    "ogg_vorbis": ("ogg", "audio/ogg"),
+    "pcm": ("pcm", "audio/pcm"),
+}
+
+
+def tts_cache_key(text: str, voice_id: str, engine: str, output_format: str) -> str:
+    """Hex digest addressing the audio for this text, voice, engine and format."""
+    return hashlib.sha256(f"{voice_id}\0{engine}\0{output_format}\0{text}".encode("utf-8")).hexdigest()
+
+
+class TTSCache:
+    """Audio files on disk, evicted least recently used beyond a size budget."""
+
+    def __init__(self, directory: str = TTS_CACHE_DIR, max_bytes: int = int(TTS_CACHE_MAX_MB * 1024 * 1024)):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def path(self, key: str, output_format: str) -> Path:
+        return self.directory / f"{key}.{AUDIO_FORMATS[output_format][0]}"
+
+    def get(self, key: str, output_format: str) -> Optional[Path]:
+        """
+        Look up cached audio.
+
+        Args:
+            key: Key from tts_cache_key()
+            output_format: Polly output format
+
+        Returns:
+            Path of the audio file, or None
+        """
+        path = self.path(key, output_format)
+        try:
+            # The modification time records the last use, for LRU eviction
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return path
+
+    def put(self, key: str, output_format: str, audio: bytes) -> Optional[Path]:
+        """
+        Store audio and evict the least recently used files over budget.
+
+        Args:
+            key: Key from tts_cache_key()
+            output_format: Polly output format
+            audio: Audio bytes
+
+        Returns:
+            Path of the stored file, or None if it could not be written
+        """
+        path = self.path(key, output_format)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, "wb") as f:
+                f.write(audio)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.error(f"Failed to write audio {key[:12]}: {e}")
+            return None
+        self.evict(keep=path)
+        return path
+
+    def evict(self, keep: Optional[Path] = None):
+        """Delete least recently used files until the directory fits max_bytes."""
+        files = []
+        for path in self.directory.glob("*"):
+            if path.suffix == ".tmp":
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files, key=lambda f: f[0]):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+            self.evictions += 1
+            logger.debug(f"Evicted cached audio {path.name}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit, miss and size figures."""
+        sizes = [path.stat().st_size for path in self.directory.glob("*") if path.suffix != ".tmp"]
+        lookups = self.hits + self.misses
+        return {
+            "enabled": TTS_CACHE == "on",
+            "files": len(sizes),
+            "bytes": sum(sizes),
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "prefetch": {"enabled": TTS_PREFETCH == "on", "pending": len(_prefetch_tasks), **prefetch_counts}
+        }
+
+
+_tts_cache: Optional[TTSCache] = None
+
+# Concurrent requests for the same audio share one synthesis
+tts_flight = SingleFlight("tts")
+
+
+def get_tts_cache() -> TTSCache:
+    """Process-wide audio cache."""
+    global _tts_cache
+    if _tts_cache is None:
+        _tts_cache = TTSCache()
+    return _tts_cache
+
+
+async def _synthesize_to_file(
+    key: str,
+    text: str,
+    voice_id: str,
+    output_format: str,
+    executor: Optional[ThreadPoolExecutor] = None
+) -> Optional[Path]:
+    start = time.perf_counter()
+    audio = await synthesize_speech(
+        text, voice_id=voice_id, output_format=output_format, engine=POLLY_ENGINE, executor=executor
+    )
+    if audio is None:
+        return None
+    path = get_tts_cache().put(key, output_format, audio)
+    logger.info(f"Synthesized {len(text)} chars to {len(audio)} bytes in {time.perf_counter() - start:.1f}s")
+    return path
+
+
+async def cached_speech(text: str, voice_id: str = "Matthew", output_format: str = "mp3") -> Optional[Path]:
+    """
+    Audio file for text, synthesizing it only when it is not cached.
+
+    Args:
+        text: Text to speak
+        voice_id: Polly voice ID
+        output_format: Polly output format ("mp3", "ogg_vorbis" or "pcm")
+
+    Returns:
+        Path of the audio file, or None if synthesis failed or the cache is off
+    """
+    if TTS_CACHE != "on":
+        return None
+    key = tts_cache_key(text, voice_id, POLLY_ENGINE, output_format)
+    path = get_tts_cache().get(key, output_format)
+    if path is not None:
+        logger.info(f"Audio cache hit {key[:12]}")
+        return path
+    path, _ = await tts_flight.do(key, lambda: _synthesize_to_file(key, text, voice_id, output_format))
+    return path
+
+
+def _lower_thread_priority():
+    """Run prefetch threads at a lower OS priority where the platform allows it (Linux)."""
+    try:
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 10)
+    except (AttributeError, OSError):
+        pass
+
+
+_prefetch_executor: Optional[ThreadPoolExecutor] = None
+_prefetch_tasks: Dict[str, asyncio.Task] = {}
+prefetch_counts = {"scheduled": 0, "skipped": 0, "dropped": 0, "completed": 0, "failed": 0}
+
+
+def _get_prefetch_executor() -> ThreadPoolExecutor:
+    global _prefetch_executor
+    if _prefetch_executor is None:
+        _prefetch_executor = ThreadPoolExecutor(
+            max_workers=max(1, TTS_PREFETCH_WORKERS),
+            thread_name_prefix="tts-prefetch",
+            initializer=_lower_thread_priority
+        )
+    return _prefetch_executor
+
+
+async def _prefetch(key: str, text: str, voice_id: str, output_format: str):
+    try:
+        path, _ = await tts_flight.do(
+            key, lambda: _synthesize_to_file(key, text, voice_id, output_format, executor=_get_prefetch_executor())
+        )
+    except Exception as e:
+        logger.error(f"Speech prefetch {key[:12]} failed: {e}", exc_info=True)
+        path = None
+    prefetch_counts["completed" if path else "failed"] += 1
+
+
+def schedule_speech_prefetch(text: str, voice_id: str = TTS_PREFETCH_VOICE, output_format: str = "mp3") -> bool:
+    """
+    Synthesize an answer's audio in the background if it is likely to be played.
+
+    Skipped when TTS_PREFETCH or the audio cache is off, for empty, failed or
+    very long answers, and when the audio is already cached; dropped when
+    TTS_PREFETCH_QUEUE jobs are already waiting.
+
+    Args:
+        text: Stage 3 answer
+        voice_id: Voice the player will request
+        output_format: Polly output format
+
+    Returns:
+        True if a background synthesis was scheduled
+    """
+    if TTS_PREFETCH != "on" or TTS_CACHE != "on":
+        return False
+    if not text.strip() or text.startswith("Error:") or len(text) > TTS_PREFETCH_MAX_CHARS:
+        prefetch_counts["skipped"] += 1
+        return False
+
+    key = tts_cache_key(text, voice_id, POLLY_ENGINE, output_format)
+    if get_tts_cache().path(key, output_format).exists() or key in _prefetch_tasks or key in tts_flight.calls:
+        prefetch_counts["skipped"] += 1
+        return False
+    if len(_prefetch_tasks) >= TTS_PREFETCH_QUEUE:
+        prefetch_counts["dropped"] += 1
+        logger.info("Speech prefetch queue full; not prefetching")
+        return False
+
+    task = asyncio.create_task(_prefetch(key, text, voice_id, output_format))
+    _prefetch_tasks[key] = task
+    task.add_done_callback(lambda done, key=key: _prefetch_tasks.pop(key, None))
+    prefetch_counts["scheduled"] += 1
+    logger.info(f"Prefetching speech for {len(text)} chars ({key[:12]})")
+    return True
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Microbenchmark for Stage 2 ranking parsing and aggregation.
+
+Simulates a large council (default 100 judges x 100 responses) with noisy
+rankings around a hidden true order, then times the parser and every
+aggregation method and reports how well each recovers the true order.
+
+Usage:
+    python benchmark_rankings.py [judges] [responses]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from backend.council import parse_ranking_from_text, calculate_aggregate_rankings
+from backend.ranking import (
+    AGGREGATION_METHODS, make_label, rankings_to_positions, aggregate_positions
+)
+
+
+def make_ranking_texts(n_judges: int, n_responses: int, noise: float, seed: int = 0):
+    """Generate FINAL RANKING texts where response i has true quality -i."""
+    rng = np.random.default_rng(seed)
+    labels = [f"Response {make_label(i)}" for i in range(n_responses)]
+    texts = []
+    for _ in range(n_judges):
+        perceived = -np.arange(n_responses) + rng.normal(0, noise * n_responses, n_responses)
+        order = np.argsort(-perceived)
+        critique = " ".join(f"{labels[i]} is solid." for i in order[:5])
+        ranking = "\n".join(f"{k}. {labels[i]}" for k, i in enumerate(order, start=1))
+        texts.append(f"{critique}\n\nFINAL RANKING:\n{ranking}")
+    return labels, texts
+
+
+def kendall_tau(order: np.ndarray) -> float:
+    """Kendall tau between an order of indices and the true order 0..n-1."""
+    n = len(order)
+    rank = np.empty(n)
+    rank[order] = np.arange(n)
+    truth = np.arange(n)
+    concordance = np.sign(rank[:, None] - rank[None, :]) * np.sign(truth[:, None] - truth[None, :])
+    return float(concordance.sum() / (n * (n - 1)))
+
+
+def timed(fn, repeat: int = 5):
+    """Return (best seconds, result) over a few repeats."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    n_judges = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    n_responses = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    print(f"Ranking benchmark: {n_judges} judges x {n_responses} responses")
+    print("=" * 60)
+
+    labels, texts = make_ranking_texts(n_judges, n_responses, noise=0.2)
+    label_to_model = {label: f"model-{i}" for i, label in enumerate(labels)}
+
+    seconds, parsed = timed(lambda: [parse_ranking_from_text(t) for t in texts])
+    assert all(len(p) == n_responses for p in parsed), "parser dropped labels"
+    print(f"parse_ranking_from_text      {seconds * 1000:8.2f} ms  ({seconds / n_judges * 1e6:.1f} us/ranking)")
+
+    seconds, positions = timed(lambda: rankings_to_positions(parsed, labels))
+    print(f"rankings_to_positions        {seconds * 1000:8.2f} ms")
+
+    for method in AGGREGATION_METHODS:
+        seconds, (order, _) = timed(lambda: aggregate_positions(positions, method))
+        print(f"aggregate {method:<18} {seconds * 1000:8.2f} ms  (kendall tau vs truth {kendall_tau(order):.3f})")
+
+    stage2_results = [
+        {"model": f"judge-{j}", "ranking": text, "parsed_ranking": ranking}
+        for j, (text, ranking) in enumerate(zip(texts, parsed))
+    ]
+    seconds, _ = timed(lambda: calculate_aggregate_rankings(stage2_results, label_to_model), repeat=3)
+    print(f"calculate_aggregate_rankings {seconds * 1000:8.2f} ms  (incl. judge reliability)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""Offline replay evaluation of bandit council selection.
+
+Replays the archived deliberations in order and compares the Thompson
+sampling and UCB policies against a random pick and the best fixed subset
+in hindsight, using the same quality-per-second reward as the live policy.
+
+Usage:
+    python evaluate_selection.py [council_size]
+"""
+
+import sys
+
+from backend.selection import SELECTION_STRATEGIES, load_archived_metadata, replay_evaluation
+
+
+def main():
+    council_size = int(sys.argv[1]) if len(sys.argv) > 1 else 2
+
+    archive = load_archived_metadata()
+    print(f"Selection replay: {len(archive)} archived deliberations, council size {council_size}")
+    print("=" * 60)
+
+    for strategy in SELECTION_STRATEGIES:
+        report = replay_evaluation(archive, strategy=strategy, council_size=council_size)
+        if not report["evaluated"]:
+            print(f"{strategy}: no deliberation had more than {council_size} ranked models")
+            continue
+
+        print(f"\n{strategy} ({report['evaluated']} deliberations evaluated)")
+        print(f"  policy mean reward      {report['policy_mean_reward']:.4f}")
+        print(f"  random mean reward      {report['random_mean_reward']:.4f}")
+        print(f"  best fixed mean reward  {report['best_fixed_mean_reward']:.4f}  {report['best_fixed_models']}")
+        print("  learned model rewards:")
+        for stats in report["models"]:
+            print(f"    {stats['mean_reward']:.3f}  ({stats['observations']:3d} obs)  {stats['model']}")
+
+
+if __name__ == "__main__":
+    main()
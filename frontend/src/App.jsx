@@ -112,6 +112,38 @@ function App() {
             });
             break;
 
+          case 'debate_round_start':
+            setCurrentConversation((prev) => {
+              const messages = [...prev.messages];
+              const lastMsg = messages[messages.length - 1];
+              lastMsg.loading.stage1 = true;
+              lastMsg.debate = { round: event.round, revising: event.revising };
+              return { ...prev, messages };
+            });
+            break;
+
+          case 'debate_round_complete':
+            setCurrentConversation((prev) => {
+              const messages = [...prev.messages];
+              const lastMsg = messages[messages.length - 1];
+              lastMsg.stage1 = event.data;
+              lastMsg.loading.stage1 = false;
+              lastMsg.debate = { round: event.round, meanSimilarity: event.mean_similarity };
+              return { ...prev, messages };
+            });
+            break;
+
+          case 'debate_complete':
+            setCurrentConversation((prev) => {
+              const messages = [...prev.messages];
+              const lastMsg = messages[messages.length - 1];
+              lastMsg.stage1 = event.data;
+              lastMsg.loading.stage1 = false;
+              lastMsg.debate = event.debate;
+              return { ...prev, messages };
+            });
+            break;
+
           case 'stage2_start':
             setCurrentConversation((prev) => {
               const messages = [...prev.messages];
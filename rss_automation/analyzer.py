@@ -1,5 +1,6 @@
 """Council-powered article analyzer."""
 
+import hashlib
 import logging
 import httpx
 import asyncio
@@ -22,6 +23,12 @@ async def read_api_key() -> str:
         return f.read().strip()
 
 
+def article_idempotency_key(article: Dict[str, Any], question: str) -> str:
+    """Stable Idempotency-Key for an article's analysis request (changes with the question)."""
+    identity = f"{article['id']}|{question}"
+    return "rss-" + hashlib.sha256(identity.encode("utf-8")).hexdigest()[:32]
+
+
 async def analyze_article(article: Dict[str, Any], api_key: str) -> Dict[str, Any]:
     """
     Analyze a single article using the council.
@@ -64,14 +71,19 @@ Please answer these questions:
 Please provide clear, structured answers for each question."""
 
     try:
-        async with httpx.AsyncClient(timeout=300.0) as client:
+        async with httpx.AsyncClient(timeout=120.0) as client:
             response = await client.post(
                 f"{API_URL}/council/ask",
-                headers={"X-API-Key": api_key},
+                headers={
+                    "X-API-Key": api_key,
+                    # A re-run after a timeout replays or joins the first council instead of starting another
+                    "Idempotency-Key": article_idempotency_key(article, question)
+                },
                 json={
                     "question": question,
                     "include_web_search": True,  # Use web search for current context
                     "include_stage1": True,  # Get individual model responses
+                    "profile": "fast",  # Small council, no peer ranking, bounded deadlines
                 }
             )
 